@@ -30,37 +30,41 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    """Get current authenticated user from JWT token."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    token = credentials.credentials
+async def get_user_from_token(token: str, db: AsyncSession) -> User | None:
+    """Resolve an access token to its user, or None if the token is invalid."""
     payload = decode_token(token)
 
     if payload is None:
-        raise credentials_exception
+        return None
 
     user_id_str: str | None = payload.get("sub")
     token_type: str | None = payload.get("type")
 
     if user_id_str is None or token_type != "access":
-        raise credentials_exception
+        return None
 
     # Convert string to UUID
     try:
         user_id = uuid.UUID(user_id_str)
     except (ValueError, TypeError):
-        raise credentials_exception
+        return None
 
     result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    return result.scalar_one_or_none()
+
+
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
+    """Get current authenticated user from JWT token."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    user = await get_user_from_token(credentials.credentials, db)
 
     if user is None:
         raise credentials_exception
@@ -1,18 +1,34 @@
 """Backtest endpoints."""
 
 import logging
-from typing import Annotated
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
+import numpy as np
+import pandas as pd
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload, undefer
 
 from app.api.deps import CurrentUser, DbSession
+from app.config import settings
+from app.core.celery_app import celery_app
 from app.models.backtest import Backtest
 from app.models.strategy import Strategy
-from app.schemas.backtest import BacktestCreate, BacktestResponse, BacktestResult
+from app.schemas.backtest import (
+    BacktestCreate,
+    BacktestResponse,
+    BacktestResult,
+    EquitySeries,
+    JobStatus,
+    RollingMetrics,
+)
+from app.services.backtest_service import BacktestService
+from app.services.job_control import ACTIVE_STATUSES, get_progress, request_cancel
+from app.services.optimization_service import apply_parameters, count_combinations
 from app.tasks.backtest import run_backtest_task
+from app.utils.equity_series import decode_series, downsample, lttb
+from app.utils.metrics import rolling_metrics, timeframe_seconds
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -43,7 +59,12 @@ async def run_backtest(
     db: DbSession,
     current_user: CurrentUser,
 ) -> Backtest:
-    """Run a new backtest."""
+    """Run a new backtest.
+
+    If an identical backtest (same rules, settings and market data) has
+    completed before, its results are copied instead of queueing a run,
+    unless ``use_cache`` is false.
+    """
     result = await db.execute(
         select(Strategy).where(
             Strategy.id == request.strategy_id,
@@ -58,6 +79,11 @@ async def run_backtest(
             detail="Strategy not found",
         )
 
+    walk_forward = None
+    if request.walk_forward:
+        walk_forward = request.walk_forward.model_dump(exclude_none=True)
+        _validate_walk_forward(request, strategy, walk_forward)
+
     backtest = Backtest(
         strategy_id=request.strategy_id,
         start_date=request.start_date,
@@ -65,18 +91,67 @@ async def run_backtest(
         initial_capital=request.initial_capital,
         symbols=request.symbols or strategy.symbols,
         timeframe=request.timeframe or strategy.timeframe,
+        walk_forward=walk_forward,
         status="pending",
     )
     db.add(backtest)
     await db.flush()
+
+    service = BacktestService(db)
+    backtest.fingerprint = await service.fingerprint(backtest, strategy)
+    if settings.BACKTEST_CACHE_ENABLED and request.use_cache:
+        cached = await service.find_cached(backtest.fingerprint)
+        if cached:
+            await service.copy_results(cached, backtest)
+            await db.refresh(backtest)
+            return backtest
+
+    await db.flush()
     await db.refresh(backtest)
 
-    run_backtest_task.delay(str(backtest.id))
+    # The backtest id doubles as the task id so the task can be revoked
+    run_backtest_task.apply_async(args=[str(backtest.id)], task_id=str(backtest.id))
 
     logger.info(f"Backtest queued: {backtest.id}")
     return backtest
 
 
+def _validate_walk_forward(
+    request: BacktestCreate,
+    strategy: Strategy,
+    walk_forward: dict[str, Any],
+) -> None:
+    """Reject walk-forward settings that cannot produce a test window."""
+    days = (request.end_date - request.start_date).days + 1
+    if walk_forward["train_days"] >= days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Training period must be shorter than the {days} day backtest range",
+        )
+
+    parameters = walk_forward["parameters"]
+    if not parameters:
+        return
+
+    total = count_combinations(parameters)
+    if total > settings.OPTIMIZATION_MAX_COMBINATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Search space has {total} combinations; "
+                f"the limit is {settings.OPTIMIZATION_MAX_COMBINATIONS}"
+            ),
+        )
+
+    try:
+        apply_parameters(strategy.rules, strategy.exit_rules, {p["path"]: None for p in parameters})
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.get("/{backtest_id}", response_model=BacktestResponse)
 async def get_backtest(
     backtest_id: UUID,
@@ -86,7 +161,6 @@ async def get_backtest(
     """Get a specific backtest."""
     result = await db.execute(
         select(Backtest)
-        .options(selectinload(Backtest.trades))
         .join(Strategy)
         .where(
             Backtest.id == backtest_id,
@@ -109,11 +183,22 @@ async def get_backtest_results(
     backtest_id: UUID,
     db: DbSession,
     current_user: CurrentUser,
+    points: Annotated[int, Query(ge=2, le=10000)] = 1000,
+    method: Literal["lttb", "minmax"] = "lttb",
 ) -> dict:
-    """Get backtest results and performance metrics."""
+    """Get backtest results and performance metrics.
+
+    The equity curve is downsampled to at most ``points`` points with
+    ``method`` (``lttb`` keeps the curve's shape, ``minmax`` keeps every
+    bucket's high and low). Use ``/equity`` for the full series.
+    """
     result = await db.execute(
         select(Backtest)
-        .options(selectinload(Backtest.trades))
+        .options(
+            selectinload(Backtest.trades),
+            undefer(Backtest.equity_data),
+            undefer(Backtest.equity_curve),
+        )
         .join(Strategy)
         .where(
             Backtest.id == backtest_id,
@@ -134,6 +219,8 @@ async def get_backtest_results(
             detail=f"Backtest is not completed. Current status: {backtest.status}",
         )
 
+    timestamps, equity = downsample(*_equity_series(backtest), points, method)
+
     return {
         "backtest_id": backtest.id,
         "status": backtest.status,
@@ -147,11 +234,189 @@ async def get_backtest_results(
         "max_drawdown": backtest.max_drawdown,
         "sharpe_ratio": backtest.sharpe_ratio,
         "profit_factor": backtest.profit_factor,
+        "sortino_ratio": backtest.sortino_ratio,
+        "calmar_ratio": backtest.calmar_ratio,
+        "exposure": backtest.exposure,
+        "turnover": backtest.turnover,
         "trades": backtest.trades,
-        "equity_curve": backtest.equity_curve or [],
+        "equity_curve": [
+            {"timestamp": ts.isoformat(), "equity": float(value)}
+            for ts, value in zip(pd.DatetimeIndex(timestamps), equity, strict=True)
+        ],
+        "windows": backtest.windows or [],
+    }
+
+
+@router.get("/{backtest_id}/equity", response_model=EquitySeries)
+async def get_backtest_equity(
+    backtest_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> dict[str, Any]:
+    """Get the full-resolution equity curve."""
+    result = await db.execute(
+        select(Backtest)
+        .options(undefer(Backtest.equity_data), undefer(Backtest.equity_curve))
+        .join(Strategy)
+        .where(
+            Backtest.id == backtest_id,
+            Strategy.user_id == current_user.id,
+        )
+    )
+    backtest = result.scalar_one_or_none()
+
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found",
+        )
+
+    timestamps, equity = _equity_series(backtest)
+    return {
+        "backtest_id": backtest.id,
+        "timestamps": (timestamps // 1_000_000).tolist(),
+        "equity": equity.tolist(),
     }
 
 
+@router.get("/{backtest_id}/rolling", response_model=RollingMetrics)
+async def get_backtest_rolling_metrics(
+    backtest_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+    window_days: Annotated[int, Query(ge=1, le=365)] = 30,
+    points: Annotated[int, Query(ge=2, le=10000)] = 1000,
+) -> dict[str, Any]:
+    """Get trailing-window return, volatility, Sharpe ratio and drawdown.
+
+    Series are sampled at the same bars as the default equity chart.
+    """
+    result = await db.execute(
+        select(Backtest)
+        .options(undefer(Backtest.equity_data), undefer(Backtest.equity_curve))
+        .join(Strategy)
+        .where(
+            Backtest.id == backtest_id,
+            Strategy.user_id == current_user.id,
+        )
+    )
+    backtest = result.scalar_one_or_none()
+
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found",
+        )
+
+    window = max(round(window_days * 86400 / timeframe_seconds(backtest.timeframe)), 2)
+    timestamps, equity = _equity_series(backtest)
+    rolling = rolling_metrics(equity, window, backtest.timeframe)
+    indices = lttb(timestamps, equity, points)
+
+    def column(values: np.ndarray) -> list[float | None]:
+        return [None if np.isnan(v) else v for v in values[indices].tolist()]
+
+    return {
+        "backtest_id": backtest.id,
+        "window": window,
+        "timestamps": (timestamps[indices] // 1_000_000).tolist(),
+        "rolling_return": column(rolling["return"]),
+        "volatility": column(rolling["volatility"]),
+        "sharpe_ratio": column(rolling["sharpe_ratio"]),
+        "drawdown": column(rolling["drawdown"]),
+    }
+
+
+def _equity_series(backtest: Backtest) -> tuple[np.ndarray, np.ndarray]:
+    """Stored equity curve as nanosecond timestamps and values."""
+    if backtest.equity_data:
+        return decode_series(backtest.equity_data)
+
+    # Backtests stored before the columnar format
+    curve = backtest.equity_curve or []
+    timestamps = pd.DatetimeIndex([p["timestamp"] for p in curve]).as_unit("ns").asi8
+    return timestamps, np.array([p["equity"] for p in curve], dtype=np.float64)
+
+
+@router.get("/{backtest_id}/progress", response_model=JobStatus)
+async def get_backtest_progress(
+    backtest_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> dict[str, Any]:
+    """Get the latest progress report of a pending or running backtest."""
+    result = await db.execute(
+        select(Backtest)
+        .join(Strategy)
+        .where(
+            Backtest.id == backtest_id,
+            Strategy.user_id == current_user.id,
+        )
+    )
+    backtest = result.scalar_one_or_none()
+
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found",
+        )
+
+    progress = None
+    if backtest.status in ACTIVE_STATUSES:
+        progress = await get_progress("backtest", str(backtest.id))
+
+    return {"id": backtest.id, "status": backtest.status, "progress": progress}
+
+
+@router.post("/{backtest_id}/cancel", response_model=BacktestResponse)
+async def cancel_backtest(
+    backtest_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> Backtest:
+    """Cancel a pending or running backtest.
+
+    A queued task is revoked; a running one stops after its current unit of
+    work and frees its worker.
+    """
+    result = await db.execute(
+        select(Backtest)
+        .join(Strategy)
+        .where(
+            Backtest.id == backtest_id,
+            Strategy.user_id == current_user.id,
+        )
+    )
+    backtest = result.scalar_one_or_none()
+
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found",
+        )
+
+    if backtest.status not in ACTIVE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Backtest is not running. Current status: {backtest.status}",
+        )
+
+    await request_cancel("backtest", str(backtest.id))
+    celery_app.control.revoke(str(backtest.id))
+
+    if backtest.status == "pending":
+        # Only while still queued; a worker that claimed it stops on the flag
+        await db.execute(
+            update(Backtest)
+            .where(Backtest.id == backtest.id, Backtest.status == "pending")
+            .values(status="cancelled")
+        )
+        await db.refresh(backtest)
+
+    logger.info(f"Backtest cancellation requested: {backtest_id}")
+    return backtest
+
+
 @router.delete("/{backtest_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_backtest(
     backtest_id: UUID,
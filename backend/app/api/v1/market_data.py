@@ -2,21 +2,32 @@
 
 import logging
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
 from app.api.deps import CurrentUser
+from app.config import settings
+from app.core.cache import response_cache
 from app.schemas.market_data import OHLCVResponse, SymbolResponse
+from app.services.candle_store import CandleStore
 from app.services.market_data_service import MarketDataService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+CACHE_HEADER = "X-Cache"
+
+
+def _set_cache_header(response: Response, hit: bool) -> None:
+    """Mark whether a response was served from the cache."""
+    response.headers[CACHE_HEADER] = "HIT" if hit else "MISS"
+
 
 @router.get("/symbols", response_model=list[SymbolResponse])
 async def list_symbols(
     current_user: CurrentUser,
+    response: Response,
     exchange: str = "binance",
     quote_currency: str | None = None,
     search: str | None = None,
@@ -25,13 +36,22 @@ async def list_symbols(
     """List available trading symbols."""
     service = MarketDataService()
 
-    try:
-        symbols = await service.get_symbols(
+    async def fetch() -> list[dict[str, Any]]:
+        return await service.get_symbols(
             exchange=exchange,
             quote_currency=quote_currency,
             search=search,
             limit=limit,
         )
+
+    symbols: list[dict[str, Any]]
+    try:
+        symbols, hit = await response_cache.get_or_fetch(
+            f"symbols:{exchange}:{quote_currency or ''}:{search or ''}:{limit}",
+            settings.SYMBOLS_CACHE_TTL_MS,
+            fetch,
+        )
+        _set_cache_header(response, hit)
         return symbols
     except Exception as e:
         logger.error(f"Error fetching symbols: {e}")
@@ -49,7 +69,7 @@ async def get_ohlcv(
     limit: Annotated[int, Query(ge=1, le=1000)] = 500,
 ) -> dict:
     """Get OHLCV candlestick data for a symbol."""
-    service = MarketDataService()
+    service = MarketDataService(candle_store=CandleStore())
 
     try:
         data = await service.get_ohlcv(
@@ -64,7 +84,7 @@ async def get_ohlcv(
             "symbol": symbol,
             "exchange": exchange,
             "timeframe": timeframe,
-            "data": data,
+            "data": data.records(),
         }
     except Exception as e:
         logger.error(f"Error fetching OHLCV data: {e}")
@@ -80,13 +100,20 @@ async def get_ohlcv(
 async def get_ticker(
     symbol: str,
     current_user: CurrentUser,
+    response: Response,
     exchange: str = "binance",
 ) -> dict:
     """Get current ticker data for a symbol."""
     service = MarketDataService()
 
+    ticker: dict[str, Any]
     try:
-        ticker = await service.get_ticker(symbol=symbol, exchange=exchange)
+        ticker, hit = await response_cache.get_or_fetch(
+            f"ticker:{exchange}:{symbol}",
+            settings.TICKER_CACHE_TTL_MS,
+            lambda: service.get_ticker(symbol=symbol, exchange=exchange),
+        )
+        _set_cache_header(response, hit)
         return ticker
     except Exception as e:
         logger.error(f"Error fetching ticker: {e}")
@@ -102,18 +129,21 @@ async def get_ticker(
 async def get_orderbook(
     symbol: str,
     current_user: CurrentUser,
+    response: Response,
     exchange: str = "binance",
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
 ) -> dict:
     """Get order book for a symbol."""
     service = MarketDataService()
 
+    orderbook: dict[str, Any]
     try:
-        orderbook = await service.get_orderbook(
-            symbol=symbol,
-            exchange=exchange,
-            limit=limit,
+        orderbook, hit = await response_cache.get_or_fetch(
+            f"orderbook:{exchange}:{symbol}:{limit}",
+            settings.ORDERBOOK_CACHE_TTL_MS,
+            lambda: service.get_orderbook(symbol=symbol, exchange=exchange, limit=limit),
         )
+        _set_cache_header(response, hit)
         return orderbook
     except Exception as e:
         logger.error(f"Error fetching orderbook: {e}")
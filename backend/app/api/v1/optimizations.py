@@ -0,0 +1,234 @@
+"""Optimization (parameter sweep) endpoints."""
+
+import logging
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy import select
+
+from app.api.deps import CurrentUser, DbSession
+from app.config import settings
+from app.core.celery_app import celery_app
+from app.models.optimization import Optimization
+from app.models.strategy import Strategy
+from app.schemas.backtest import JobStatus
+from app.schemas.optimization import (
+    OptimizationCreate,
+    OptimizationResponse,
+    OptimizationResults,
+)
+from app.services.job_control import ACTIVE_STATUSES, get_progress, request_cancel
+from app.services.optimization_service import apply_parameters, count_combinations
+from app.tasks.optimization import run_optimization_task
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+async def _get_optimization(
+    optimization_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> Optimization:
+    """Get an optimization owned by the current user or raise 404."""
+    result = await db.execute(
+        select(Optimization)
+        .join(Strategy, Strategy.id == Optimization.strategy_id)
+        .where(
+            Optimization.id == optimization_id,
+            Strategy.user_id == current_user.id,
+        )
+    )
+    optimization = result.scalar_one_or_none()
+
+    if not optimization:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Optimization not found",
+        )
+
+    return optimization
+
+
+@router.get("", response_model=list[OptimizationResponse])
+async def list_optimizations(
+    db: DbSession,
+    current_user: CurrentUser,
+    strategy_id: UUID | None = None,
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> list[Optimization]:
+    """List all optimizations for current user."""
+    query = (
+        select(Optimization)
+        .join(Strategy, Strategy.id == Optimization.strategy_id)
+        .where(Strategy.user_id == current_user.id)
+    )
+
+    if strategy_id:
+        query = query.where(Optimization.strategy_id == strategy_id)
+
+    query = query.offset(skip).limit(limit).order_by(Optimization.created_at.desc())
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+@router.post("", response_model=OptimizationResponse, status_code=status.HTTP_202_ACCEPTED)
+async def run_optimization(
+    request: OptimizationCreate,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> Optimization:
+    """Start a parameter sweep over a strategy's rules."""
+    result = await db.execute(
+        select(Strategy).where(
+            Strategy.id == request.strategy_id,
+            Strategy.user_id == current_user.id,
+        )
+    )
+    strategy = result.scalar_one_or_none()
+
+    if not strategy:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Strategy not found",
+        )
+
+    parameters = [p.model_dump(exclude_none=True) for p in request.parameters]
+    total = count_combinations(parameters, request.method, request.samples)
+
+    if total > settings.OPTIMIZATION_MAX_COMBINATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Search space has {total} combinations; "
+                f"the limit is {settings.OPTIMIZATION_MAX_COMBINATIONS}"
+            ),
+        )
+
+    try:
+        # Check every path exists before queueing
+        apply_parameters(strategy.rules, strategy.exit_rules, {p["path"]: None for p in parameters})
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    optimization = Optimization(
+        strategy_id=request.strategy_id,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        initial_capital=request.initial_capital,
+        symbols=request.symbols or strategy.symbols,
+        timeframe=request.timeframe or strategy.timeframe,
+        parameters=parameters,
+        method=request.method,
+        samples=request.samples,
+        seed=request.seed,
+        objective=request.objective,
+        total_combinations=total,
+        status="pending",
+    )
+    db.add(optimization)
+    await db.flush()
+    await db.refresh(optimization)
+
+    # The optimization id doubles as the task id so the task can be revoked
+    run_optimization_task.apply_async(args=[str(optimization.id)], task_id=str(optimization.id))
+
+    logger.info(f"Optimization queued: {optimization.id} ({total} combinations)")
+    return optimization
+
+
+@router.get("/{optimization_id}", response_model=OptimizationResponse)
+async def get_optimization(
+    optimization_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> Optimization:
+    """Get a specific optimization."""
+    return await _get_optimization(optimization_id, db, current_user)
+
+
+@router.get("/{optimization_id}/results", response_model=OptimizationResults)
+async def get_optimization_results(
+    optimization_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> dict[str, Any]:
+    """Get ranked optimization results, best first."""
+    optimization = await _get_optimization(optimization_id, db, current_user)
+
+    if optimization.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Optimization is not completed. Current status: {optimization.status}",
+        )
+
+    rows = optimization.results or []
+    return {
+        "optimization_id": optimization.id,
+        "status": optimization.status,
+        "objective": optimization.objective,
+        "total": len(rows),
+        "results": rows[skip : skip + limit],
+    }
+
+
+@router.get("/{optimization_id}/progress", response_model=JobStatus)
+async def get_optimization_progress(
+    optimization_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> dict[str, Any]:
+    """Get the latest progress report of a pending or running optimization."""
+    optimization = await _get_optimization(optimization_id, db, current_user)
+
+    progress = None
+    if optimization.status in ACTIVE_STATUSES:
+        progress = await get_progress("optimization", str(optimization.id))
+
+    return {"id": optimization.id, "status": optimization.status, "progress": progress}
+
+
+@router.post("/{optimization_id}/cancel", response_model=OptimizationResponse)
+async def cancel_optimization(
+    optimization_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> Optimization:
+    """Cancel a pending or running optimization."""
+    optimization = await _get_optimization(optimization_id, db, current_user)
+
+    if optimization.status not in ACTIVE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Optimization is not running. Current status: {optimization.status}",
+        )
+
+    await request_cancel("optimization", str(optimization.id))
+    celery_app.control.revoke(str(optimization.id))
+
+    if optimization.status == "pending":
+        optimization.status = "cancelled"
+        await db.flush()
+        await db.refresh(optimization)
+
+    logger.info(f"Optimization cancellation requested: {optimization_id}")
+    return optimization
+
+
+@router.delete("/{optimization_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_optimization(
+    optimization_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> None:
+    """Delete an optimization."""
+    optimization = await _get_optimization(optimization_id, db, current_user)
+    await db.delete(optimization)
+    logger.info(f"Optimization deleted: {optimization_id}")
@@ -0,0 +1,92 @@
+"""Server push over WebSocket."""
+
+import asyncio
+import contextlib
+import json
+import logging
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app.api.deps import get_user_from_token
+from app.core.database import async_session_factory
+from app.core.push import Subscriber, push_hub
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.websocket("/ws")
+async def stream_events(
+    websocket: WebSocket,
+    token: str,
+    topics: str = "",
+) -> None:
+    """Push events to the client as they are published.
+
+    Authenticate with an access token in the ``token`` query parameter.
+    ``topics`` is a comma-separated list of event type filters, where
+    ``*`` matches any text (e.g. ``backtest.*,strategy.signal``). Filters
+    can be changed at any time by sending
+    ``{"action": "subscribe" | "unsubscribe", "topics": [...]}``.
+
+    Users receive their own backtest, optimization, strategy and trade
+    events plus shared market data events. Each message is an event as
+    published on the bus: ``{"type": ..., "data": {...}}``.
+    """
+    async with async_session_factory() as db:
+        user = await get_user_from_token(token, db)
+
+    if user is None or not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber = push_hub.connect(str(user.id))
+    subscriber.topics.update(t.strip() for t in topics.split(",") if t.strip())
+
+    sender = asyncio.create_task(_send_events(websocket, subscriber))
+    try:
+        await _receive_commands(websocket, subscriber)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await sender
+        await push_hub.disconnect(subscriber)
+
+
+async def _receive_commands(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Apply subscription changes sent by the client until it disconnects."""
+    while True:
+        try:
+            command = json.loads(await websocket.receive_text())
+            action = command["action"]
+            requested = {str(t) for t in command.get("topics", [])}
+        except (json.JSONDecodeError, KeyError, TypeError):
+            await websocket.send_text(json.dumps({"type": "error", "detail": "Invalid command"}))
+            continue
+
+        if action == "subscribe":
+            subscriber.topics |= requested
+        elif action == "unsubscribe":
+            subscriber.topics -= requested
+        elif action != "ping":
+            await websocket.send_text(
+                json.dumps({"type": "error", "detail": f"Unknown action: {action}"})
+            )
+            continue
+
+        await websocket.send_text(
+            json.dumps({"type": "subscriptions", "topics": sorted(subscriber.topics)})
+        )
+
+
+async def _send_events(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Forward queued events to the socket, reporting dropped ones."""
+    while True:
+        message = await subscriber.queue.get()
+        if subscriber.dropped:
+            dropped, subscriber.dropped = subscriber.dropped, 0
+            await websocket.send_text(json.dumps({"type": "dropped", "count": dropped}))
+        await websocket.send_text(message)
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
+import numpy as np
 from fastapi import APIRouter, Query
 from sqlalchemy import select
 
@@ -12,6 +13,7 @@ from app.api.deps import CurrentUser, DbSession
 from app.models.portfolio import Portfolio
 from app.models.trade import Trade
 from app.schemas.trade import TradeResponse
+from app.utils.metrics import trade_statistics
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -60,7 +62,11 @@ async def get_trades_summary(
     end_date: datetime | None = None,
 ) -> dict:
     """Get trade summary statistics."""
-    query = select(Trade).join(Portfolio).where(Portfolio.user_id == current_user.id)
+    query = (
+        select(Trade.pnl, Trade.price, Trade.filled_quantity, Trade.filled_price)
+        .join(Portfolio)
+        .where(Portfolio.user_id == current_user.id)
+    )
 
     if portfolio_id:
         query = query.where(Trade.portfolio_id == portfolio_id)
@@ -70,35 +76,17 @@ async def get_trades_summary(
         query = query.where(Trade.executed_at <= end_date)
 
     result = await db.execute(query)
-    trades = list(result.scalars().all())
-
-    if not trades:
-        return {
-            "total_trades": 0,
-            "winning_trades": 0,
-            "losing_trades": 0,
-            "win_rate": 0.0,
-            "total_profit": 0.0,
-            "total_loss": 0.0,
-            "net_pnl": 0.0,
-        }
-
-    total_trades = len(trades)
-    winning_trades = sum(1 for t in trades if t.pnl and t.pnl > 0)
-    losing_trades = sum(1 for t in trades if t.pnl and t.pnl < 0)
-    total_profit = sum(float(t.pnl) for t in trades if t.pnl and t.pnl > 0)
-    total_loss = sum(float(t.pnl) for t in trades if t.pnl and t.pnl < 0)
-    net_pnl = total_profit + total_loss
-
-    return {
-        "total_trades": total_trades,
-        "winning_trades": winning_trades,
-        "losing_trades": losing_trades,
-        "win_rate": winning_trades / total_trades * 100 if total_trades > 0 else 0.0,
-        "total_profit": total_profit,
-        "total_loss": total_loss,
-        "net_pnl": net_pnl,
-    }
+    rows = result.all()
+
+    pnls = np.array([float(row.pnl) for row in rows if row.pnl is not None], dtype=np.float64)
+    stats = trade_statistics(pnls)
+    stats["total_trades"] = len(rows)
+    stats["win_rate"] = stats["winning_trades"] / len(rows) * 100 if rows else 0.0
+    # Only filled quantity has traded; open orders add nothing
+    stats["total_volume"] = sum(
+        float(row.filled_quantity or 0) * float(row.filled_price or row.price) for row in rows
+    )
+    return stats
 
 
 @router.get("/{trade_id}", response_model=TradeResponse)
@@ -1,7 +1,7 @@
 """Application configuration using Pydantic Settings."""
 
 from functools import lru_cache
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -63,6 +63,85 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
 
+    # Historical market data fetching
+    OHLCV_PAGE_LIMIT: int = 1000
+    OHLCV_FETCH_CONCURRENCY: int = 3
+
+    # Backtest worker processes per pool (0 = CPU cores divided between the
+    # Celery worker's child processes, each of which owns a pool)
+    BACKTEST_WORKERS: int = 0
+
+    # Reuse results of identical completed backtests
+    BACKTEST_CACHE_ENABLED: bool = True
+
+    # Progress reporting and cancellation of backtests and sweeps
+    JOB_PROGRESS_INTERVAL: float = 1.0
+    JOB_STATE_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Live strategy evaluation: market data series fetched at once
+    STRATEGY_EVALUATION_CONCURRENCY: int = 10
+
+    # Live candle streaming; when enabled, strategies are evaluated on each
+    # bar close by the streamer process instead of by a Celery beat timer
+    LIVE_STREAMING_ENABLED: bool = True
+    STREAM_BUFFER_BARS: int = 500
+    STREAM_RECONNECT_MAX_SECONDS: float = 60.0
+    STRATEGY_REFRESH_SECONDS: float = 30.0
+    # Tickers pushed as market_data.ticker events, besides the symbols of
+    # active strategies, at most once per interval per symbol
+    TICKER_STREAM_EXCHANGE: str = "binance"
+    TICKER_STREAM_SYMBOLS: list[str] = ["BTC/USDT", "ETH/USDT"]
+    TICKER_PUSH_INTERVAL_MS: int = 1000
+
+    # Indicator states of streamed series, kept in Redis across restarts
+    INDICATOR_STATE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Event bus: handlers running at once per process, listener backoff cap
+    EVENT_HANDLER_CONCURRENCY: int = 32
+    EVENT_RECONNECT_MAX_SECONDS: float = 30.0
+
+    # Event encoding ("orjson" needs the fast extra) and publish batching
+    EVENT_SERIALIZER: Literal["json", "orjson"] = "json"
+    EVENT_BATCH_SIZE: int = 100
+    EVENT_BATCH_DELAY_MS: int = 5
+
+    # Durable events: types also written to a Redis stream and consumed
+    # at-least-once. Handlers of each subscribed pattern read through the
+    # group "<EVENT_STREAM_GROUP>:<pattern>", shared by the processes that
+    # subscribe the same pattern.
+    EVENT_STREAMS_ENABLED: bool = False
+    EVENT_STREAM_TYPES: list[str] = ["strategy.signal", "trade.*"]
+    EVENT_STREAM_GROUP: str = "apextrade"
+    EVENT_STREAM_CONSUMER: str = ""
+    EVENT_STREAM_MAXLEN: int = 100_000
+    EVENT_STREAM_BATCH: int = 100
+    EVENT_STREAM_BLOCK_MS: int = 5000
+    EVENT_STREAM_CLAIM_IDLE_MS: int = 60_000
+    # Deliveries of an event before it is moved to the dead-letter stream
+    EVENT_STREAM_MAX_DELIVERIES: int = 5
+    # Attempts to resend a batch with durable events before giving up
+    EVENT_PUBLISH_RETRIES: int = 3
+
+    # WebSocket push: events queued per socket before the oldest are dropped
+    PUSH_QUEUE_SIZE: int = 256
+
+    # Parameter sweeps
+    OPTIMIZATION_MAX_COMBINATIONS: int = 10000
+    OPTIMIZATION_BATCH_SIZE: int = 50
+
+    # Indicator cache (shared per worker process)
+    INDICATOR_CACHE_MAX_ENTRIES: int = 4096
+    INDICATOR_CACHE_SIZE_MB: int = 256
+
+    # Market data response cache (milliseconds)
+    TICKER_CACHE_TTL_MS: int = 1000
+    ORDERBOOK_CACHE_TTL_MS: int = 500
+    SYMBOLS_CACHE_TTL_MS: int = 6 * 60 * 60 * 1000
+
+    # Exchange market lists (shared through Redis, refreshed by Celery beat)
+    MARKETS_REFRESH_SECONDS: int = 3600
+    MARKETS_REFRESH_EXCHANGES: list[str] = ["binance"]
+
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:8000"]
 
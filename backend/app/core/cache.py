@@ -0,0 +1,154 @@
+"""Short-lived read-through cache backed by Redis."""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+from app.core.redis import RedisClient, redis_client
+
+logger = logging.getLogger(__name__)
+
+# How long a fetch lock is held at most, and how often a request waiting on
+# another process's fetch re-checks Redis
+LOCK_TIMEOUT_MS = 5000
+LOCK_POLL_INTERVAL = 0.02
+
+
+def _encode(value: Any) -> str:
+    """Encode a value as JSON, writing datetimes in ISO format."""
+
+    def default(obj: Any) -> str:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    return json.dumps(value, default=default)
+
+
+class ReadThroughCache:
+    """Read-through cache with single-flight misses.
+
+    Values are stored in Redis as JSON with a millisecond TTL. On a miss only
+    one caller fetches: concurrent callers in the same process await the same
+    future. Other processes wait on a short Redis lock and then read the
+    fetched value. Without Redis, misses are still coalesced in-process.
+    """
+
+    def __init__(self, redis: RedisClient = redis_client, prefix: str = "cache") -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        ttl_ms: int,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, bool]:
+        """Get a cached value or fetch and store it.
+
+        Empty results are not cached, so a failed upstream call that returned
+        nothing is retried on the next request.
+
+        Args:
+            key: Cache key (without prefix)
+            ttl_ms: Time to live in milliseconds
+            fetch: Coroutine function producing the value on a miss
+
+        Returns:
+            Tuple of the value and whether it was served without fetching
+        """
+        key = f"{self.prefix}:{key}"
+
+        cached = await self._read(key)
+        if cached is not None:
+            return cached, True
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value, hit = await self._fetch_once(key, ttl_ms, fetch)
+            future.set_result(value)
+            return value, hit
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._inflight[key]
+
+    async def _fetch_once(
+        self,
+        key: str,
+        ttl_ms: int,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, bool]:
+        """Fetch under a cross-process lock, or wait for the lock holder."""
+        lock_key = f"{key}:lock"
+        locked = await self._lock(lock_key)
+
+        if not locked:
+            deadline = time.monotonic() + LOCK_TIMEOUT_MS / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                cached = await self._read(key)
+                if cached is not None:
+                    return cached, True
+                if not await self.redis.exists(lock_key):
+                    break
+
+        try:
+            value = await fetch()
+            if value:
+                await self._write(key, value, ttl_ms)
+            return value, False
+        finally:
+            if locked:
+                await self._unlock(lock_key)
+
+    async def _read(self, key: str) -> Any | None:
+        """Read and decode a cached value."""
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def _write(self, key: str, value: Any, ttl_ms: int) -> None:
+        """Encode and store a value."""
+        try:
+            await self.redis.set(key, _encode(value), px=ttl_ms)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def _lock(self, lock_key: str) -> bool:
+        """Try to take the fetch lock; True when no other process holds it."""
+        if not self.redis.connected:
+            return True
+        try:
+            return await self.redis.set(lock_key, "1", px=LOCK_TIMEOUT_MS, nx=True)
+        except Exception as e:
+            logger.warning(f"Cache lock failed for {lock_key}: {e}")
+            return True
+
+    async def _unlock(self, lock_key: str) -> None:
+        """Release the fetch lock."""
+        try:
+            await self.redis.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Cache unlock failed for {lock_key}: {e}")
+
+
+response_cache = ReadThroughCache()
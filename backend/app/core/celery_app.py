@@ -1,8 +1,17 @@
 """Celery application setup with Redis broker."""
 
+import asyncio
+import logging
+from typing import Any
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.config import settings
+from app.core.exchanges import exchange_pool
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
 
 celery_app = Celery(
     "apextrade",
@@ -13,6 +22,7 @@ celery_app = Celery(
         "app.tasks.strategy",
         "app.tasks.execution",
         "app.tasks.market_data",
+        "app.tasks.optimization",
     ],
 )
 
@@ -32,9 +42,47 @@ celery_app.conf.update(
     # Results expire after 24 hours
     result_expires=86400,
     beat_schedule={
-        "evaluate-active-strategies": {
-            "task": "app.tasks.strategy.evaluate_active_strategies_task",
-            "schedule": 60.0,
+        "refresh-markets": {
+            "task": "app.tasks.market_data.refresh_markets_task",
+            "schedule": float(settings.MARKETS_REFRESH_SECONDS),
         },
     },
 )
+
+if not settings.LIVE_STREAMING_ENABLED:
+    # Without the streamer, poll strategies on a timer instead
+    celery_app.conf.beat_schedule["evaluate-active-strategies"] = {
+        "task": "app.tasks.strategy.evaluate_active_strategies_task",
+        "schedule": 60.0,
+    }
+
+
+def init_worker_process(**kwargs: Any) -> None:
+    """Start each worker process with a fresh exchange pool and Redis client.
+
+    Clients inherited through fork share sockets with the parent and must
+    not be reused. Tasks run on the process's default event loop, so Redis
+    is connected on that loop.
+    """
+    exchange_pool.reset()
+    try:
+        asyncio.get_event_loop().run_until_complete(redis_client.connect())
+    except Exception as e:
+        logger.error(f"Failed to connect worker to Redis: {e}")
+
+
+worker_process_init.connect(init_worker_process)
+
+
+def shutdown_worker_process(**kwargs: Any) -> None:
+    """Close pooled exchange clients and Redis when a worker process exits."""
+    try:
+        loop = asyncio.get_event_loop()
+        if not loop.is_closed():
+            loop.run_until_complete(exchange_pool.close_all())
+            loop.run_until_complete(redis_client.disconnect())
+    except Exception as e:
+        logger.error(f"Failed to close worker connections: {e}")
+
+
+worker_process_shutdown.connect(shutdown_worker_process)
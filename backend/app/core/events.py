@@ -1,26 +1,118 @@
 """Event bus for pub/sub messaging."""
 
 import asyncio
+import contextlib
 import json
 import logging
-from collections.abc import Callable
+import os
+import socket
+import time
+from collections.abc import Callable, Sequence
+from fnmatch import fnmatchcase
 from typing import Any
 
-from app.core.redis import redis_client
+from app.config import settings
+from app.core.redis import RedisClient, redis_client
 
 logger = logging.getLogger(__name__)
 
+CHANNEL_PREFIX = "events:"
+# Log of durable events, read by consumer groups
+EVENT_STREAM = "stream:events"
+# Durable events whose handlers kept failing, kept for inspection
+DEAD_LETTER_STREAM = "stream:events:dead"
+
+# Called with (event_type, data, message) for every event the listener receives
+RawHandler = Callable[[str, dict[str, Any], str], None]
+# Called with the data of each subscribed event; may be a coroutine function
+Handler = Callable[[dict[str, Any]], Any]
+
+
+class EventPublishError(Exception):
+    """Durable events could not be appended to the stream."""
+
+    def __init__(self, events: Sequence[tuple[str, dict[str, Any]]], error: Exception) -> None:
+        super().__init__(f"Failed to publish {len(events)} durable events: {error}")
+        self.events = list(events)
+
+
+def stream_group(pattern: str) -> str:
+    """Consumer group through which handlers of ``pattern`` read the stream."""
+    return f"{settings.EVENT_STREAM_GROUP}:{pattern}"
+
+
+def load_serializer(name: str) -> tuple[Callable[[Any], str], Callable[[str | bytes], Any]]:
+    """Encoder and decoder of event messages, falling back to ``json``.
+
+    Messages stay JSON text whichever is chosen, since they are forwarded
+    verbatim to WebSocket clients.
+    """
+    if name == "orjson":
+        try:
+            import orjson
+
+            return (lambda obj: orjson.dumps(obj).decode()), orjson.loads
+        except ImportError:
+            logger.warning("orjson not installed, encoding events with json")
+    return json.dumps, json.loads
+
 
 class EventBus:
-    """Event bus for publishing and subscribing to events."""
+    """Event bus for publishing and subscribing to events.
+
+    Handlers subscribe to an event type or a glob such as ``backtest.*``.
+    Each process runs one listener that pattern-subscribes to all event
+    channels, decodes every message once and routes it through a dispatch
+    table to the matching handlers. Handlers run as tasks, at most
+    ``EVENT_HANDLER_CONCURRENCY`` at a time, so a slow handler does not
+    hold up the others.
+
+    With ``EVENT_STREAMS_ENABLED``, events matching ``EVENT_STREAM_TYPES``
+    are durable: they are also appended to a capped Redis stream, and their
+    handlers run from a consumer group instead of pub/sub. Each durable
+    event is then handled by one process of the group, acknowledged once
+    all its handlers succeed and redelivered otherwise, including events
+    published while no consumer was running. Handlers read durable events
+    through one consumer group per subscribed pattern (see
+    ``stream_group``), so every pattern handling an event type receives it,
+    while processes subscribing the same pattern share its events. A new
+    group starts from the oldest retained event, replaying the log. An event delivered more than
+    ``EVENT_STREAM_MAX_DELIVERIES`` times is moved to ``DEAD_LETTER_STREAM``
+    instead of being retried again.
+    """
 
-    def __init__(self) -> None:
-        self._handlers: dict[str, list[Callable]] = {}
+    def __init__(
+        self,
+        redis: RedisClient = redis_client,
+        streams: bool = settings.EVENT_STREAMS_ENABLED,
+        stream_types: Sequence[str] = tuple(settings.EVENT_STREAM_TYPES),
+        serializer: str = settings.EVENT_SERIALIZER,
+    ) -> None:
+        self.redis = redis
+        self._dumps, self._loads = load_serializer(serializer)
+        self.streams = streams
+        self.stream_types = tuple(stream_types)
+        self._durable: dict[str, bool] = {}
+        self._handlers: dict[str, list[Handler]] = {}
+        self._raw_handlers: list[RawHandler] = []
+        self._routes: dict[str, list[Handler]] = {}
         self._local_mode = False
+        self._listener: asyncio.Task[None] | None = None
+        self._consumers: dict[str, asyncio.Task[None]] = {}
+        self._tasks: set[asyncio.Task[bool]] = set()
+        self._slots = asyncio.Semaphore(settings.EVENT_HANDLER_CONCURRENCY)
 
     async def publish(self, event_type: str, data: dict[str, Any]) -> None:
-        """Publish an event to all subscribers."""
-        message = json.dumps(
+        """Publish an event to all subscribers.
+
+        Raises:
+            EventPublishError: If a durable event could not be sent
+        """
+        if self.is_durable(event_type) and not self._local_mode:
+            await self.publish_many([(event_type, data)])
+            return
+
+        message = self._dumps(
             {
                 "type": event_type,
                 "data": data,
@@ -31,53 +123,384 @@ class EventBus:
             await self._dispatch_local(event_type, data)
         else:
             try:
-                await redis_client.publish(f"events:{event_type}", message)
+                await self.redis.publish(f"{CHANNEL_PREFIX}{event_type}", message)
                 logger.debug(f"Published event: {event_type}")
             except Exception as e:
                 logger.error(f"Failed to publish event: {e}")
                 await self._dispatch_local(event_type, data)
 
-    async def _dispatch_local(self, event_type: str, data: dict[str, Any]) -> None:
-        """Dispatch event to local handlers."""
-        handlers = self._handlers.get(event_type, [])
-        for handler in handlers:
+    async def publish_many(self, events: Sequence[tuple[str, dict[str, Any]]]) -> None:
+        """Publish ``(event_type, data)`` pairs in one Redis round trip.
+
+        Batches with durable events are retried ``EVENT_PUBLISH_RETRIES``
+        times. If Redis stays unreachable, the other events are dispatched to
+        local handlers only, while durable ones are not, since other
+        consumers would never see them.
+
+        Raises:
+            EventPublishError: With the durable events that were not sent
+        """
+        if not events:
+            return
+        if self._local_mode:
+            for event_type, data in events:
+                await self._dispatch_local(event_type, data)
+            return
+
+        messages = [
+            (event_type, self._dumps({"type": event_type, "data": data}))
+            for event_type, data in events
+        ]
+        durable = [(event_type, data) for event_type, data in events if self.is_durable(event_type)]
+        retries = settings.EVENT_PUBLISH_RETRIES if durable else 0
+        for attempt in range(retries + 1):
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(data)
-                else:
-                    handler(data)
+                await self._send(messages)
+                logger.debug(f"Published {len(messages)} events")
+                return
             except Exception as e:
-                logger.error(f"Error in event handler for {event_type}: {e}")
+                error = e
+                if attempt < retries:
+                    await asyncio.sleep(0.1 * 2**attempt)
+
+        logger.error(f"Failed to publish events: {error}")
+        for event_type, data in events:
+            if not self.is_durable(event_type):
+                await self._dispatch_local(event_type, data)
+        if durable:
+            raise EventPublishError(durable, error)
+
+    async def _send(self, messages: Sequence[tuple[str, str]]) -> None:
+        """Pipeline the stream appends and publishes of encoded events."""
+        pipe = self.redis.pipeline()
+        for event_type, message in messages:
+            if self.is_durable(event_type):
+                pipe.xadd(
+                    EVENT_STREAM,
+                    {"message": message},
+                    maxlen=settings.EVENT_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            pipe.publish(f"{CHANNEL_PREFIX}{event_type}", message)
+        await pipe.execute()
+
+    def is_durable(self, event_type: str) -> bool:
+        """Whether an event type goes through the stream."""
+        durable = self._durable.get(event_type)
+        if durable is None:
+            durable = self.streams and any(
+                fnmatchcase(event_type, pattern) for pattern in self.stream_types
+            )
+            self._durable[event_type] = durable
+        return durable
 
-    def subscribe(self, event_type: str, handler: Callable) -> None:
-        """Subscribe to an event type with a handler."""
+    async def _dispatch_local(self, event_type: str, data: dict[str, Any]) -> None:
+        """Dispatch event to local handlers."""
+        for handler in self._handlers_for(event_type):
+            await self._call(handler, event_type, data)
+
+    def _handlers_for(self, event_type: str) -> list[Handler]:
+        """Handlers subscribed to an event type, cached per type."""
+        handlers = self._routes.get(event_type)
+        if handlers is None:
+            handlers = [
+                handler
+                for pattern, pattern_handlers in self._handlers.items()
+                if pattern == event_type or fnmatchcase(event_type, pattern)
+                for handler in pattern_handlers
+            ]
+            self._routes[event_type] = handlers
+        return handlers
+
+    async def _call(self, handler: Handler, event_type: str, data: dict[str, Any]) -> bool:
+        """Run a handler, returning whether it succeeded."""
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                await handler(data)
+            else:
+                handler(data)
+        except Exception as e:
+            logger.error(f"Error in event handler for {event_type}: {e}")
+            return False
+        return True
+
+    def subscribe(self, event_type: str, handler: Handler) -> None:
+        """Subscribe to an event type, or a glob of types, with a handler."""
         if event_type not in self._handlers:
             self._handlers[event_type] = []
         self._handlers[event_type].append(handler)
+        self._routes.clear()
+        if self.streams and self._listener is not None:
+            self._start_consumers()
         logger.debug(f"Subscribed to event: {event_type}")
 
-    def unsubscribe(self, event_type: str, handler: Callable) -> None:
+    def unsubscribe(self, event_type: str, handler: Handler) -> None:
         """Unsubscribe a handler from an event type."""
         if event_type in self._handlers:
             self._handlers[event_type].remove(handler)
+            if not self._handlers[event_type]:
+                del self._handlers[event_type]
+            self._routes.clear()
             logger.debug(f"Unsubscribed from event: {event_type}")
 
+    def add_raw_handler(self, handler: RawHandler) -> None:
+        """Receive every event with its published message, inline.
+
+        For consumers that forward messages as published. The handler runs
+        on the listener itself, so it must not block.
+        """
+        self._raw_handlers.append(handler)
+
+    def remove_raw_handler(self, handler: RawHandler) -> None:
+        """Stop passing events to a raw handler."""
+        with contextlib.suppress(ValueError):
+            self._raw_handlers.remove(handler)
+
+    def start(self) -> None:
+        """Start the shared listener, and the stream consumers if enabled."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        if self.streams:
+            self._start_consumers()
+
+    def _start_consumers(self) -> None:
+        """Run a stream consumer for each subscribed durable pattern."""
+        for pattern in self._handlers:
+            if not self._is_durable_pattern(pattern):
+                continue
+            consumer = self._consumers.get(pattern)
+            if consumer is None or consumer.done():
+                self._consumers[pattern] = asyncio.create_task(self._consume(pattern))
+
+    async def stop(self) -> None:
+        """Stop the listener and consumers and cancel running handlers."""
+        tasks: list[asyncio.Task[Any]] = [*self._tasks, *self._consumers.values()]
+        if self._listener is not None:
+            tasks.append(self._listener)
+        self._listener = None
+        self._consumers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     async def start_listening(self, *event_types: str) -> None:
-        """Start listening for events from Redis."""
+        """Start the shared listener and wait until it is stopped.
+
+        Events are routed by the subscribed handlers, so ``event_types`` is
+        not needed and only kept for compatibility.
+        """
+        self.start()
+        if self._listener is None:
+            return
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._listener
+
+    async def _listen(self) -> None:
+        """Receive all events from Redis, reconnecting with backoff."""
+        failures = 0
+        while True:
+            # redis-py leaves PubSub.aclose unannotated
+            pubsub: Any = None
+            try:
+                pubsub = await self.redis.psubscribe(f"{CHANNEL_PREFIX}*")
+                failures = 0
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        await self._route(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                delay = min(2**failures, settings.EVENT_RECONNECT_MAX_SECONDS)
+                logger.warning(f"Event listener failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+            finally:
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await pubsub.aclose()
+
+    async def _route(self, message: str) -> None:
+        """Decode a message once and hand it to every matching handler.
+
+        Waits for a free handler slot when ``EVENT_HANDLER_CONCURRENCY``
+        handlers are already running.
+        """
         try:
-            pubsub = await redis_client.subscribe(*[f"events:{et}" for et in event_types])
-
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    try:
-                        data = json.loads(message["data"])
-                        event_type = data.get("type")
-                        event_data = data.get("data", {})
-                        await self._dispatch_local(event_type, event_data)
-                    except json.JSONDecodeError:
-                        logger.error(f"Invalid JSON in event: {message['data']}")
-        except Exception as e:
-            logger.error(f"Error listening for events: {e}")
+            event = self._loads(message)
+            event_type = event["type"]
+            data = event.get("data") or {}
+        except (ValueError, KeyError, TypeError):
+            logger.error(f"Invalid event: {message[:200]}")
+            return
+
+        for raw_handler in self._raw_handlers:
+            try:
+                raw_handler(event_type, data, message)
+            except Exception as e:
+                logger.error(f"Error in raw event handler for {event_type}: {e}")
+
+        if self.is_durable(event_type):
+            # Handled from the stream
+            return
+        for handler in self._handlers_for(event_type):
+            await self._slots.acquire()
+            task = asyncio.create_task(self._call(handler, event_type, data))
+            self._tasks.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task[bool]) -> None:
+        self._tasks.discard(task)
+        self._slots.release()
+
+    async def _consume(self, pattern: str) -> None:
+        """Handle durable events for ``pattern``, reconnecting with backoff.
+
+        Reads only while the pattern has handlers, so events are not taken
+        from its group after they were all unsubscribed.
+        """
+        group = stream_group(pattern)
+        consumer = settings.EVENT_STREAM_CONSUMER or f"{socket.gethostname()}-{os.getpid()}"
+        block = settings.EVENT_STREAM_BLOCK_MS
+        ready = False
+        last_claim = float("-inf")
+        failures = 0
+        while True:
+            try:
+                if pattern not in self._handlers:
+                    await asyncio.sleep(block / 1000)
+                    continue
+                if not ready:
+                    await self.redis.xgroup_create(EVENT_STREAM, group)
+                    ready = True
+                if time.monotonic() - last_claim >= settings.EVENT_STREAM_CLAIM_IDLE_MS / 1000:
+                    await self._claim_stale(pattern, consumer)
+                    last_claim = time.monotonic()
+
+                response = await self.redis.xreadgroup(
+                    group,
+                    consumer,
+                    {EVENT_STREAM: ">"},
+                    count=settings.EVENT_STREAM_BATCH,
+                    block=block,
+                )
+                failures = 0
+                for _stream, entries in response or []:
+                    await self._handle_entries(pattern, entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                ready = False
+                failures += 1
+                delay = min(2**failures, settings.EVENT_RECONNECT_MAX_SECONDS)
+                logger.warning(f"Event stream consumer failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def _claim_stale(self, pattern: str, consumer: str) -> None:
+        """Retry events left unacknowledged for ``EVENT_STREAM_CLAIM_IDLE_MS``.
+
+        These were delivered to a consumer of the pattern's group that
+        failed or died before acknowledging them.
+        """
+        group = stream_group(pattern)
+        while True:
+            cursor, entries, *_ = await self.redis.xautoclaim(
+                EVENT_STREAM,
+                group,
+                consumer,
+                settings.EVENT_STREAM_CLAIM_IDLE_MS,
+                count=settings.EVENT_STREAM_BATCH,
+            )
+            if entries:
+                entries = await self._dead_letter(group, entries)
+            if entries:
+                logger.info(f"Retrying {len(entries)} unacknowledged events")
+                await self._handle_entries(pattern, entries)
+            if cursor in ("0-0", b"0-0"):
+                return
+
+    async def _dead_letter(self, group: str, entries: list[Any]) -> list[Any]:
+        """Move claimed entries delivered too often to ``DEAD_LETTER_STREAM``.
+
+        Their handlers keep failing, so they are logged, copied to the
+        dead-letter stream and acknowledged rather than retried forever.
+
+        Returns:
+            The entries still to be retried
+        """
+        pipe = self.redis.pipeline()
+        for entry_id, _fields in entries:
+            pipe.xpending_range(EVENT_STREAM, group, min=entry_id, max=entry_id, count=1)
+        deliveries = {
+            info["message_id"]: info["times_delivered"]
+            for pending in await pipe.execute()
+            for info in pending
+        }
+
+        limit = settings.EVENT_STREAM_MAX_DELIVERIES
+        exhausted = [entry for entry in entries if deliveries.get(entry[0], 0) > limit]
+        if not exhausted:
+            return entries
+
+        pipe = self.redis.pipeline()
+        for entry_id, fields in exhausted:
+            logger.error(
+                f"Event {entry_id} failed {limit} deliveries, moving it to {DEAD_LETTER_STREAM}"
+            )
+            pipe.xadd(
+                DEAD_LETTER_STREAM,
+                {**(fields or {}), "id": entry_id, "group": group},
+                maxlen=settings.EVENT_STREAM_MAXLEN,
+                approximate=True,
+            )
+        pipe.xack(EVENT_STREAM, group, *(entry_id for entry_id, _ in exhausted))
+        await pipe.execute()
+        return [entry for entry in entries if entry not in exhausted]
+
+    async def _handle_entries(self, pattern: str, entries: list[Any]) -> None:
+        """Run the pattern's handlers on a batch of entries and acknowledge successes.
+
+        Entries of types the pattern does not match are acknowledged
+        unhandled, since they concern other groups only. Matching entries
+        stay pending while the pattern has no handlers.
+        """
+
+        async def handle(entry_id: str, fields: dict[str, Any] | None) -> str | None:
+            if not fields:
+                # Trimmed from the stream before it was handled
+                return entry_id
+            try:
+                event = self._loads(fields["message"])
+                event_type = event["type"]
+                data = event.get("data") or {}
+            except (ValueError, KeyError, TypeError):
+                logger.error(f"Invalid event in stream: {entry_id}")
+                return entry_id
+
+            if pattern != event_type and not fnmatchcase(event_type, pattern):
+                return entry_id
+            handlers = list(self._handlers.get(pattern, ()))
+            if not handlers:
+                return None
+            results = await asyncio.gather(
+                *(self._run(handler, event_type, data) for handler in handlers)
+            )
+            return entry_id if all(results) else None
+
+        handled = await asyncio.gather(*(handle(entry_id, fields) for entry_id, fields in entries))
+        await self.redis.xack(
+            EVENT_STREAM, stream_group(pattern), *[i for i in handled if i is not None]
+        )
+
+    async def _run(self, handler: Handler, event_type: str, data: dict[str, Any]) -> bool:
+        async with self._slots:
+            return await self._call(handler, event_type, data)
+
+    def _is_durable_pattern(self, pattern: str) -> bool:
+        """Whether a subscription pattern can match durable event types."""
+        return any(
+            fnmatchcase(pattern, durable) or fnmatchcase(durable, pattern)
+            for durable in self.stream_types
+        )
 
     def set_local_mode(self, enabled: bool = True) -> None:
         """Enable or disable local mode (no Redis)."""
@@ -87,6 +510,62 @@ class EventBus:
 event_bus = EventBus()
 
 
+class BatchPublisher:
+    """Buffer events briefly and publish them in pipelined batches.
+
+    A batch is sent once ``max_events`` are buffered or ``max_delay``
+    seconds after its first event, whichever comes first, so a burst of
+    events costs one Redis round trip. Batches are sent in publish order.
+    Durable events that could not be sent are kept and sent again with the
+    next batch. Call ``close`` on shutdown to send what is still buffered.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus = event_bus,
+        max_events: int = settings.EVENT_BATCH_SIZE,
+        max_delay: float = settings.EVENT_BATCH_DELAY_MS / 1000,
+    ) -> None:
+        self.bus = bus
+        self.max_events = max_events
+        self.max_delay = max_delay
+        self._buffer: list[tuple[str, dict[str, Any]]] = []
+        self._timer: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    async def publish(self, event_type: str, data: dict[str, Any]) -> None:
+        """Queue an event for the next batch."""
+        self._buffer.append((event_type, data))
+        if len(self._buffer) >= self.max_events:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Send the buffered events now."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        batch, self._buffer = self._buffer, []
+        if batch:
+            async with self._lock:
+                try:
+                    await self.bus.publish_many(batch)
+                except EventPublishError as e:
+                    logger.warning(f"Keeping {len(e.events)} durable events to send again")
+                    self._buffer[:0] = e.events
+                    if self._timer is None:
+                        self._timer = asyncio.create_task(self._flush_later())
+
+    async def close(self) -> None:
+        """Send the buffered events; call on shutdown."""
+        await self.flush()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        await self.flush()
+
+
 class EventTypes:
     """Event type constants."""
 
@@ -101,8 +580,15 @@ class EventTypes:
     BACKTEST_STARTED = "backtest.started"
     BACKTEST_COMPLETED = "backtest.completed"
     BACKTEST_FAILED = "backtest.failed"
+    BACKTEST_PROGRESS = "backtest.progress"
+    BACKTEST_CANCELLED = "backtest.cancelled"
+
+    OPTIMIZATION_PROGRESS = "optimization.progress"
+    OPTIMIZATION_CANCELLED = "optimization.cancelled"
 
     MARKET_DATA_UPDATED = "market_data.updated"
+    CANDLE_CLOSED = "market_data.candle_closed"
+    TICKER_UPDATED = "market_data.ticker"
 
     POSITION_OPENED = "position.opened"
     POSITION_CLOSED = "position.closed"
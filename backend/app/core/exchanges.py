@@ -0,0 +1,117 @@
+"""Process-wide pool of ccxt exchange clients."""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+import ccxt.async_support as ccxt
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangePool:
+    """Shared public-data exchange clients, one per exchange name.
+
+    Clients keep their HTTP session and loaded markets between calls, so
+    requests skip the TLS handshake and ``load_markets``. ccxt clients are
+    tied to the event loop that opened their session; if the pool is used
+    from a different loop the old clients are closed and recreated.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[str, ccxt.Exchange] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def get(self, exchange_name: str) -> ccxt.Exchange:
+        """Get or create the client for an exchange."""
+        self._check_loop()
+
+        if exchange_name not in self._clients:
+            exchange_class = getattr(ccxt, exchange_name, None)
+            if not exchange_class:
+                raise ValueError(f"Unknown exchange: {exchange_name}")
+
+            config: dict[str, Any] = {
+                "enableRateLimit": True,
+            }
+
+            if exchange_name == "binance" and settings.BINANCE_API_KEY:
+                config["apiKey"] = settings.BINANCE_API_KEY
+                config["secret"] = settings.BINANCE_API_SECRET
+
+            self._clients[exchange_name] = exchange_class(config)
+            logger.debug(f"Created exchange client: {exchange_name}")
+
+        return self._clients[exchange_name]
+
+    async def get_markets(self, exchange_name: str, reload: bool = False) -> dict[str, Any]:
+        """Get the exchange's markets, loading them on first use."""
+        ex = self.get(exchange_name)
+        # ccxt caches loaded markets and coalesces concurrent loads
+        markets: dict[str, Any] = await ex.load_markets(reload=reload)
+        return markets
+
+    def _check_loop(self) -> None:
+        """Replace clients created on another event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if loop is not self._loop:
+            if self._loop is not None and self._clients:
+                logger.info("Event loop changed, recreating exchange clients")
+                self._close_stale(list(self._clients.values()), loop)
+                self._clients.clear()
+            self._loop = loop
+
+    def _close_stale(self, clients: list[ccxt.Exchange], loop: asyncio.AbstractEventLoop) -> None:
+        """Close clients left behind on the previous event loop.
+
+        If that loop still runs in another thread the close is handed to it;
+        otherwise it is scheduled on the current loop.
+        """
+        old = self._loop
+        if old is not None and old.is_running() and not old.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_clients(clients), old)
+            return
+
+        task = loop.create_task(_close_clients(clients))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def reset(self) -> None:
+        """Forget all clients without closing them (e.g. after a fork)."""
+        self._clients.clear()
+        self._loop = None
+
+    async def close(self, exchange_name: str) -> None:
+        """Close and remove one client."""
+        client = self._clients.pop(exchange_name, None)
+        if client is not None:
+            # Silently ignore errors when closing exchange connections
+            with contextlib.suppress(Exception):
+                await client.close()
+
+    async def close_all(self) -> None:
+        """Close all clients."""
+        for name in list(self._clients.keys()):
+            await self.close(name)
+        logger.info("Closed exchange clients")
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+async def _close_clients(clients: list[ccxt.Exchange]) -> None:
+    """Close clients, ignoring errors from sessions already torn down."""
+    for client in clients:
+        with contextlib.suppress(Exception):
+            await client.close()
+
+
+exchange_pool = ExchangePool()
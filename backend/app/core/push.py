@@ -0,0 +1,105 @@
+"""Fan-out of bus events to WebSocket clients."""
+
+import asyncio
+import logging
+from fnmatch import fnmatchcase
+from typing import Any
+
+from app.config import settings
+from app.core.events import EventBus, EventTypes, event_bus
+
+logger = logging.getLogger(__name__)
+
+# Events about shared market data, delivered to every subscriber. All other
+# events are delivered only to the user named by their ``user_id`` field.
+PUBLIC_EVENT_TYPES = frozenset(
+    {EventTypes.MARKET_DATA_UPDATED, EventTypes.CANDLE_CLOSED, EventTypes.TICKER_UPDATED}
+)
+
+
+class Subscriber:
+    """One connected socket: its topic filters and a bounded outbox.
+
+    When the client reads slower than events arrive, the oldest queued
+    messages are dropped so a stalled socket never holds up the others.
+    """
+
+    def __init__(self, user_id: str, queue_size: int) -> None:
+        self.user_id = user_id
+        self.topics: set[str] = set()
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def matches(self, event_type: str) -> bool:
+        """Whether any topic filter (a glob such as ``backtest.*``) matches."""
+        return any(fnmatchcase(event_type, topic) for topic in self.topics)
+
+    def offer(self, message: str) -> None:
+        """Queue a message, dropping the oldest one if the queue is full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+class PushHub:
+    """Route bus events to connected sockets.
+
+    The hub registers with the event bus's shared listener while any socket
+    is connected, so sockets add no Redis connections and every message is
+    decoded once per process. Messages are forwarded as published, without
+    re-serializing them per socket.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus = event_bus,
+        queue_size: int = settings.PUSH_QUEUE_SIZE,
+    ) -> None:
+        self.bus = bus
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscriber]] = {}
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def connect(self, user_id: str) -> Subscriber:
+        """Register a socket of ``user_id``, listening to the bus if needed."""
+        if not self._subscribers:
+            self.bus.add_raw_handler(self.dispatch)
+            self.bus.start()
+        subscriber = Subscriber(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    async def disconnect(self, subscriber: Subscriber) -> None:
+        """Unregister a socket and leave the bus after the last one."""
+        subscribers = self._subscribers.get(subscriber.user_id, set())
+        subscribers.discard(subscriber)
+        if not subscribers:
+            self._subscribers.pop(subscriber.user_id, None)
+        if not self._subscribers:
+            await self.close()
+
+    async def close(self) -> None:
+        """Drop all sockets and stop receiving events."""
+        self._subscribers.clear()
+        self.bus.remove_raw_handler(self.dispatch)
+
+    def dispatch(self, event_type: str, data: dict[str, Any], message: str) -> None:
+        """Deliver a published event to the sockets it is meant for."""
+        user_id = data.get("user_id") if isinstance(data, dict) else None
+        if user_id is not None:
+            subscribers = self._subscribers.get(str(user_id), set())
+        elif event_type in PUBLIC_EVENT_TYPES:
+            subscribers = {s for group in self._subscribers.values() for s in group}
+        else:
+            return
+
+        for subscriber in subscribers:
+            if subscriber.matches(event_type):
+                subscriber.offer(message)
+
+
+push_hub = PushHub()
@@ -4,6 +4,7 @@ import logging
 from typing import Any
 
 import redis.asyncio as redis
+from redis.typing import KeyT, StreamIdT
 
 from app.config import settings
 
@@ -36,6 +37,11 @@ class RedisClient:
             await self._client.close()
             logger.info("Disconnected from Redis")
 
+    @property
+    def connected(self) -> bool:
+        """Whether a Redis connection is available."""
+        return self._client is not None
+
     @property
     def client(self) -> redis.Redis:
         """Get Redis client."""
@@ -54,12 +60,16 @@ class RedisClient:
         key: str,
         value: str | bytes,
         ex: int | None = None,
+        px: int | None = None,
+        nx: bool = False,
     ) -> bool:
-        """Set key-value pair with optional expiration."""
+        """Set key-value pair with optional expiration.
+
+        Returns False when ``nx`` is set and the key already exists.
+        """
         if not self._client:
             return False
-        await self._client.set(key, value, ex=ex)
-        return True
+        return bool(await self._client.set(key, value, ex=ex, px=px, nx=nx))
 
     async def delete(self, key: str) -> int:
         """Delete key."""
@@ -87,6 +97,71 @@ class RedisClient:
         await pubsub.subscribe(*channels)
         return pubsub
 
+    async def psubscribe(self, *patterns: str) -> redis.client.PubSub:
+        """Subscribe to channel patterns."""
+        if not self._client:
+            raise RuntimeError("Redis client not connected")
+        pubsub = self._client.pubsub()
+        await pubsub.psubscribe(*patterns)
+        return pubsub
+
+    def pipeline(self) -> redis.client.Pipeline:
+        """Non-transactional pipeline for batching commands."""
+        if not self._client:
+            raise RuntimeError("Redis client not connected")
+        return self._client.pipeline(transaction=False)
+
+    async def xgroup_create(self, stream: str, group: str, id: str = "0") -> bool:
+        """Create a consumer group, with its stream if needed.
+
+        Returns False when the group already exists.
+        """
+        if not self._client:
+            raise RuntimeError("Redis client not connected")
+        try:
+            await self._client.xgroup_create(stream, group, id=id, mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+            return False
+        return True
+
+    async def xreadgroup(
+        self,
+        group: str,
+        consumer: str,
+        streams: dict[KeyT, StreamIdT],
+        count: int | None = None,
+        block: int | None = None,
+    ) -> list[Any]:
+        """Read stream entries as a member of a consumer group."""
+        if not self._client:
+            raise RuntimeError("Redis client not connected")
+        response = await self._client.xreadgroup(group, consumer, streams, count=count, block=block)
+        # RESP3 connections return a mapping of stream to entries
+        if isinstance(response, dict):
+            return list(response.items())
+        return response
+
+    async def xautoclaim(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        min_idle_time: int,
+        count: int | None = None,
+    ) -> list[Any]:
+        """Take over entries left pending by other consumers."""
+        if not self._client:
+            raise RuntimeError("Redis client not connected")
+        return await self._client.xautoclaim(stream, group, consumer, min_idle_time, count=count)
+
+    async def xack(self, stream: str, group: str, *ids: str) -> int:
+        """Acknowledge processed stream entries."""
+        if not self._client or not ids:
+            return 0
+        return await self._client.xack(stream, group, *ids)
+
     async def lpush(self, key: str, *values: Any) -> int:
         """Push values to list."""
         if not self._client:
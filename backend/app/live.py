@@ -0,0 +1,39 @@
+"""Live market data process: streams candles and evaluates strategies on bar close.
+
+Run with ``python -m app.live``.
+"""
+
+import asyncio
+import logging
+
+from app.config import settings
+from app.core.database import engine
+from app.core.exchanges import exchange_pool
+from app.core.redis import redis_client
+from app.services.candle_store import CandleStore
+from app.services.market_data_service import MarketDataService
+from app.services.strategy_evaluator import LiveStrategyRunner
+
+logging.basicConfig(
+    level=logging.DEBUG if settings.DEBUG else logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Run the live strategy loop until interrupted."""
+    logger.info("Starting live market data streamer...")
+    await redis_client.connect()
+    runner = LiveStrategyRunner(MarketDataService(candle_store=CandleStore()))
+    try:
+        await runner.run()
+    finally:
+        logger.info("Shutting down live market data streamer...")
+        await exchange_pool.close_all()
+        await redis_client.disconnect()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
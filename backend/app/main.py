@@ -11,6 +11,9 @@ from app import __version__
 from app.api.v1 import router as api_v1_router
 from app.config import settings
 from app.core.database import engine
+from app.core.events import event_bus
+from app.core.exchanges import exchange_pool
+from app.core.push import push_hub
 from app.core.redis import redis_client
 
 logging.basicConfig(
@@ -27,6 +30,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await redis_client.connect()
     yield
     logger.info("Shutting down ApexTrade API...")
+    await push_hub.close()
+    await event_bus.stop()
+    await exchange_pool.close_all()
     await redis_client.disconnect()
     await engine.dispose()
 
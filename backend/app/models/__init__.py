@@ -2,6 +2,8 @@
 
 from app.models.backtest import Backtest, BacktestTrade
 from app.models.base import Base
+from app.models.market_data import OHLCVCandle, OHLCVEmptyRange
+from app.models.optimization import Optimization
 from app.models.portfolio import Portfolio, Position
 from app.models.strategy import Strategy
 from app.models.trade import Trade
@@ -16,4 +18,7 @@ __all__ = [
     "Portfolio",
     "Position",
     "Trade",
+    "OHLCVCandle",
+    "OHLCVEmptyRange",
+    "Optimization",
 ]
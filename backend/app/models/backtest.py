@@ -5,7 +5,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import Date, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import Date, DateTime, ForeignKey, LargeBinary, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY, JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -86,15 +86,61 @@ class Backtest(BaseModel):
         Numeric(10, 4),
         nullable=True,
     )
+    sortino_ratio: Mapped[Decimal | None] = mapped_column(
+        Numeric(10, 4),
+        nullable=True,
+    )
+    calmar_ratio: Mapped[Decimal | None] = mapped_column(
+        Numeric(12, 4),
+        nullable=True,
+    )
+    exposure: Mapped[Decimal | None] = mapped_column(
+        Numeric(5, 2),
+        nullable=True,
+    )
+    turnover: Mapped[Decimal | None] = mapped_column(
+        Numeric(12, 4),
+        nullable=True,
+    )
+    # Legacy per-bar curve; new runs store the compressed ``equity_data``
     equity_curve: Mapped[list[dict[str, Any]] | None] = mapped_column(
         JSON,
         nullable=True,
+        deferred=True,
+    )
+    equity_data: Mapped[bytes | None] = mapped_column(
+        LargeBinary,
+        nullable=True,
+        deferred=True,
+    )
+
+    # Walk-forward settings and per-window metrics
+    walk_forward: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON,
+        nullable=True,
+    )
+    windows: Mapped[list[dict[str, Any]] | None] = mapped_column(
+        JSON,
+        nullable=True,
     )
     completed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
     )
 
+    # Hash of the rules, settings and market data version the results
+    # depend on, and the backtest the results were copied from, if any
+    fingerprint: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+    )
+    cached_from_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("backtests.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
     # Relationships
     strategy: Mapped["Strategy"] = relationship(
         "Strategy",
@@ -0,0 +1,78 @@
+"""Market data models."""
+
+from sqlalchemy import BigInteger, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class OHLCVCandle(Base):
+    """Stored OHLCV candle.
+
+    The composite primary key (symbol, exchange, timeframe, ts) doubles as
+    the range-scan index. Timestamps are candle open times in epoch
+    milliseconds, as returned by exchanges.
+    """
+
+    __tablename__ = "ohlcv"
+
+    symbol: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+    )
+    exchange: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+    )
+    timeframe: Mapped[str] = mapped_column(
+        String(10),
+        primary_key=True,
+    )
+    ts: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+    )
+    open: Mapped[float] = mapped_column(Float, nullable=False)
+    high: Mapped[float] = mapped_column(Float, nullable=False)
+    low: Mapped[float] = mapped_column(Float, nullable=False)
+    close: Mapped[float] = mapped_column(Float, nullable=False)
+    volume: Mapped[float] = mapped_column(Float, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<OHLCVCandle {self.exchange}:{self.symbol} {self.timeframe} {self.ts}>"
+
+
+class OHLCVEmptyRange(Base):
+    """Closed range of candles the exchange has no data for.
+
+    Recorded when fetching a range returns fewer candles than it spans,
+    e.g. before a market was listed or during an exchange outage, so the
+    range is not requested again. Bounds are inclusive open times in epoch
+    milliseconds.
+    """
+
+    __tablename__ = "ohlcv_empty_ranges"
+
+    symbol: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+    )
+    exchange: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+    )
+    timeframe: Mapped[str] = mapped_column(
+        String(10),
+        primary_key=True,
+    )
+    start_ts: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+    )
+    end_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<OHLCVEmptyRange {self.exchange}:{self.symbol} {self.timeframe} "
+            f"{self.start_ts}-{self.end_ts}>"
+        )
@@ -0,0 +1,100 @@
+"""Optimization (parameter sweep) model."""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Date, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class Optimization(BaseModel):
+    """Parameter sweep over a strategy's rules."""
+
+    __tablename__ = "optimizations"
+
+    strategy_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("strategies.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    start_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+    )
+    end_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+    )
+    symbols: Mapped[list[str]] = mapped_column(
+        ARRAY(String),
+        default=list,
+        nullable=False,
+    )
+    timeframe: Mapped[str] = mapped_column(
+        String(10),
+        default="1h",
+        nullable=False,
+    )
+    initial_capital: Mapped[Decimal] = mapped_column(
+        Numeric(20, 8),
+        default=Decimal("10000"),
+        nullable=False,
+    )
+
+    # Search space
+    parameters: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSON,
+        nullable=False,
+    )
+    method: Mapped[str] = mapped_column(
+        String(20),
+        default="grid",
+        nullable=False,
+    )
+    samples: Mapped[int | None] = mapped_column(nullable=True)
+    seed: Mapped[int | None] = mapped_column(nullable=True)
+    objective: Mapped[str] = mapped_column(
+        String(30),
+        default="sharpe_ratio",
+        nullable=False,
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default="pending",
+        nullable=False,
+    )
+    error_message: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    total_combinations: Mapped[int] = mapped_column(
+        default=0,
+        nullable=False,
+    )
+    completed_combinations: Mapped[int] = mapped_column(
+        default=0,
+        nullable=False,
+    )
+
+    # Ranked results, best first
+    results: Mapped[list[dict[str, Any]] | None] = mapped_column(
+        JSON,
+        nullable=True,
+    )
+    best_parameters: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON,
+        nullable=True,
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<Optimization {self.id} ({self.status})>"
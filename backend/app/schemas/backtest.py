@@ -7,6 +7,22 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.schemas.optimization import Objective, ParameterSpec
+
+
+class WalkForwardConfig(BaseModel):
+    """Rolling train/test windows for a walk-forward backtest.
+
+    With ``parameters``, the best parameter set on each training period is
+    traded in the following test period.
+    """
+
+    train_days: int = Field(..., ge=1)
+    test_days: int = Field(..., ge=1)
+    anchored: bool = False
+    parameters: list[ParameterSpec] = []
+    objective: Objective = "sharpe_ratio"
+
 
 class BacktestCreate(BaseModel):
     """Backtest creation schema."""
@@ -17,6 +33,8 @@ class BacktestCreate(BaseModel):
     initial_capital: Decimal = Field(default=Decimal("10000"), ge=0)
     symbols: list[str] | None = None
     timeframe: str | None = None
+    walk_forward: WalkForwardConfig | None = None
+    use_cache: bool = True
 
 
 class BacktestTradeResponse(BaseModel):
@@ -57,6 +75,12 @@ class BacktestResponse(BaseModel):
     max_drawdown: Decimal | None = None
     sharpe_ratio: Decimal | None = None
     profit_factor: Decimal | None = None
+    sortino_ratio: Decimal | None = None
+    calmar_ratio: Decimal | None = None
+    exposure: Decimal | None = None
+    turnover: Decimal | None = None
+    walk_forward: dict[str, Any] | None = None
+    cached_from_id: UUID | None = None
     created_at: datetime
     completed_at: datetime | None = None
 
@@ -78,5 +102,38 @@ class BacktestResult(BaseModel):
     max_drawdown: Decimal | None = None
     sharpe_ratio: Decimal | None = None
     profit_factor: Decimal | None = None
+    sortino_ratio: Decimal | None = None
+    calmar_ratio: Decimal | None = None
+    exposure: Decimal | None = None
+    turnover: Decimal | None = None
     trades: list[BacktestTradeResponse] = []
     equity_curve: list[dict[str, Any]] = []
+    windows: list[dict[str, Any]] = []
+
+
+class EquitySeries(BaseModel):
+    """Full-resolution equity curve as columns, timestamps in epoch ms."""
+
+    backtest_id: UUID
+    timestamps: list[int] = []
+    equity: list[float] = []
+
+
+class RollingMetrics(BaseModel):
+    """Trailing-window metrics of a backtest, timestamps in epoch ms."""
+
+    backtest_id: UUID
+    window: int
+    timestamps: list[int] = []
+    rolling_return: list[float | None] = []
+    volatility: list[float | None] = []
+    sharpe_ratio: list[float | None] = []
+    drawdown: list[float | None] = []
+
+
+class JobStatus(BaseModel):
+    """Status and latest progress report of a backtest or optimization."""
+
+    id: UUID
+    status: str
+    progress: dict[str, Any] | None = None
@@ -0,0 +1,110 @@
+"""Optimization schemas."""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+Objective = Literal[
+    "total_return",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "calmar_ratio",
+    "profit_factor",
+    "win_rate",
+    "final_capital",
+    "max_drawdown",
+]
+
+
+class ParameterSpec(BaseModel):
+    """One swept parameter: explicit values or an inclusive range."""
+
+    path: str = Field(..., min_length=1, examples=["rules.conditions.0.value"])
+    values: list[Any] | None = Field(None, min_length=1)
+    min: float | None = None
+    max: float | None = None
+    step: float | None = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_values_or_range(self) -> "ParameterSpec":
+        has_range = None not in (self.min, self.max, self.step)
+        if (self.values is None) == (not has_range):
+            raise ValueError("Provide either values or min, max and step")
+        if self.min is not None and self.max is not None and self.max < self.min:
+            raise ValueError("max must not be less than min")
+        return self
+
+
+class OptimizationCreate(BaseModel):
+    """Optimization creation schema."""
+
+    strategy_id: UUID
+    start_date: date
+    end_date: date
+    initial_capital: Decimal = Field(default=Decimal("10000"), ge=0)
+    symbols: list[str] | None = None
+    timeframe: str | None = None
+    parameters: list[ParameterSpec] = Field(..., min_length=1)
+    method: Literal["grid", "random"] = "grid"
+    samples: int | None = Field(None, ge=1)
+    seed: int | None = None
+    objective: Objective = "sharpe_ratio"
+
+
+class OptimizationResponse(BaseModel):
+    """Optimization response schema."""
+
+    id: UUID
+    strategy_id: UUID
+    start_date: date
+    end_date: date
+    symbols: list[str]
+    timeframe: str
+    initial_capital: Decimal
+    parameters: list[dict[str, Any]]
+    method: str
+    samples: int | None = None
+    seed: int | None = None
+    objective: str
+    status: str
+    error_message: str | None = None
+    total_combinations: int
+    completed_combinations: int
+    best_parameters: dict[str, Any] | None = None
+    created_at: datetime
+    completed_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class OptimizationResultRow(BaseModel):
+    """One evaluated parameter set."""
+
+    rank: int
+    parameters: dict[str, Any]
+    final_capital: float
+    total_return: float
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    max_drawdown: float
+    sharpe_ratio: float
+    sortino_ratio: float = 0.0
+    calmar_ratio: float = 0.0
+    profit_factor: float
+    exposure: float = 0.0
+    turnover: float = 0.0
+
+
+class OptimizationResults(BaseModel):
+    """Page of ranked optimization results."""
+
+    optimization_id: UUID
+    status: str
+    objective: str
+    total: int
+    results: list[OptimizationResultRow] = []
@@ -0,0 +1,884 @@
+"""Per-symbol backtest simulation, run in worker processes."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from functools import partial
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.job_control import JobProgress
+from app.services.rule_engine import RuleEngine
+from app.utils.metrics import performance_metrics, trade_statistics
+from app.utils.ohlcv import OHLCV_COLUMNS, OHLCVFrame
+
+logger = logging.getLogger(__name__)
+
+# Bars skipped before trading so indicators have data to work with
+WARMUP_BARS = 20
+POSITION_SIZE = 0.95
+TAKE_PROFIT = 0.05
+STOP_LOSS = 0.02
+
+# Metrics a run can be ranked by, mapped to whether higher is better
+OBJECTIVES = {
+    "total_return": True,
+    "sharpe_ratio": True,
+    "sortino_ratio": True,
+    "calmar_ratio": True,
+    "profit_factor": True,
+    "win_rate": True,
+    "final_capital": True,
+    "max_drawdown": False,
+}
+
+
+@dataclass(slots=True)
+class SymbolData:
+    """OHLCV series for one symbol as compact arrays.
+
+    ``timestamps`` are int64 nanoseconds of the frame's index and ``ohlcv``
+    is a float64 ``(n, 5)`` array, so the data pickles cheaply to workers.
+    """
+
+    symbol: str
+    timestamps: np.ndarray
+    ohlcv: np.ndarray
+
+    @classmethod
+    def from_ohlcv(cls, symbol: str, frame: OHLCVFrame) -> "SymbolData":
+        """Wrap a candle frame without copying its values."""
+        return cls(symbol=symbol, timestamps=frame.timestamps * 1_000_000, ohlcv=frame.values)
+
+    @classmethod
+    def from_frame(cls, symbol: str, df: pd.DataFrame) -> "SymbolData":
+        return cls(
+            symbol=symbol,
+            timestamps=pd.DatetimeIndex(df.index).as_unit("ns").asi8,
+            ohlcv=df[OHLCV_COLUMNS].to_numpy(dtype=np.float64),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            self.ohlcv,
+            columns=OHLCV_COLUMNS,
+            index=pd.DatetimeIndex(self.timestamps, name="timestamp"),
+            copy=False,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+@dataclass(slots=True)
+class TradeLog:
+    """Closed long trades as parallel arrays.
+
+    Times are int64 nanoseconds; prices and quantities are float64. Keeping
+    trades columnar makes them cheap to pickle back from workers and to
+    write in bulk.
+    """
+
+    symbol: np.ndarray
+    entry_time: np.ndarray
+    exit_time: np.ndarray
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    quantity: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "TradeLog":
+        return cls.from_columns("", [], [], [], [], [])
+
+    @classmethod
+    def from_columns(
+        cls,
+        symbol: str,
+        entry_time: list[int],
+        exit_time: list[int],
+        entry_price: list[float],
+        exit_price: list[float],
+        quantity: list[float],
+    ) -> "TradeLog":
+        """Build a log for one symbol from per-column lists."""
+        return cls(
+            symbol=np.full(len(entry_time), symbol, dtype=object),
+            entry_time=np.array(entry_time, dtype=np.int64),
+            exit_time=np.array(exit_time, dtype=np.int64),
+            entry_price=np.array(entry_price, dtype=np.float64),
+            exit_price=np.array(exit_price, dtype=np.float64),
+            quantity=np.array(quantity, dtype=np.float64),
+        )
+
+    @classmethod
+    def concat(cls, logs: list["TradeLog"]) -> "TradeLog":
+        """Join logs, ordered by exit time."""
+        if not logs:
+            return cls.empty()
+        order = np.argsort(np.concatenate([log.exit_time for log in logs]), kind="stable")
+        return cls(
+            **{
+                f.name: np.concatenate([getattr(log, f.name) for log in logs])[order]
+                for f in fields(cls)
+            }
+        )
+
+    def scaled(self, factor: float) -> "TradeLog":
+        """The same trades with quantities multiplied by ``factor``."""
+        return TradeLog(
+            symbol=self.symbol,
+            entry_time=self.entry_time,
+            exit_time=self.exit_time,
+            entry_price=self.entry_price,
+            exit_price=self.exit_price,
+            quantity=self.quantity * factor,
+        )
+
+    @property
+    def notional(self) -> np.ndarray:
+        """Value bought plus value sold per trade."""
+        return np.asarray((self.entry_price + self.exit_price) * self.quantity)
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return np.asarray((self.exit_price - self.entry_price) * self.quantity)
+
+    @property
+    def pnl_percent(self) -> np.ndarray:
+        return np.asarray((self.exit_price - self.entry_price) / self.entry_price * 100)
+
+    def records(self) -> list[dict[str, Any]]:
+        """Trades as dicts, e.g. for inspection or serialization."""
+        columns = {f.name: getattr(self, f.name).tolist() for f in fields(self)}
+        columns["pnl"] = self.pnl.tolist()
+        columns["pnl_percent"] = self.pnl_percent.tolist()
+        return [
+            {"side": "long", **dict(zip(columns, values, strict=True))}
+            for values in zip(*columns.values(), strict=True)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.entry_time)
+
+
+@dataclass(slots=True)
+class SymbolResult:
+    """Outcome of simulating one symbol.
+
+    ``timestamps`` and ``equity`` cover the bars after the warm-up period;
+    ``invested`` is the part of the equity held in an open position.
+    """
+
+    symbol: str
+    timestamps: np.ndarray
+    equity: np.ndarray
+    final_capital: float
+    trades: TradeLog = field(default_factory=TradeLog.empty)
+    invested: np.ndarray | None = None
+
+
+@dataclass(slots=True)
+class SymbolSignals:
+    """Entry and exit signals of rule variants for one symbol.
+
+    ``entries`` and ``exits`` are boolean ``(variants, n)`` arrays aligned
+    with ``timestamps`` and ``closes``. Bars inside the warm-up period are
+    already dropped.
+    """
+
+    symbol: str
+    timestamps: np.ndarray
+    closes: np.ndarray
+    entries: np.ndarray
+    exits: np.ndarray
+
+    def between(self, start: int, end: int) -> "SymbolSignals":
+        """Bars with ``start <= timestamp < end``, as views."""
+        lo, hi = np.searchsorted(self.timestamps, [start, end])
+        return SymbolSignals(
+            symbol=self.symbol,
+            timestamps=self.timestamps[lo:hi],
+            closes=self.closes[lo:hi],
+            entries=self.entries[:, lo:hi],
+            exits=self.exits[:, lo:hi],
+        )
+
+    def simulate(self, variant: int, capital: float) -> SymbolResult:
+        """Trade one variant's signals with ``capital``."""
+        return simulate(
+            self.symbol,
+            self.timestamps,
+            self.closes,
+            self.entries[variant],
+            self.exits[variant],
+            capital,
+            warmup=0,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def _find_exit(
+    closes: np.ndarray,
+    exit_signals: np.ndarray,
+    entry: int,
+    entry_price: float,
+) -> int:
+    """First bar after ``entry`` that closes the position.
+
+    Bars are scanned in growing chunks so short trades stay cheap and long
+    ones are not quadratic.
+
+    Returns:
+        The exit bar, or ``len(closes)`` if the position stays open
+    """
+    start, size = entry + 1, 64
+    while start < len(closes):
+        end = min(start + size, len(closes))
+        pnl_percent = (closes[start:end] - entry_price) / entry_price
+        hits = exit_signals[start:end] | (pnl_percent >= TAKE_PROFIT) | (pnl_percent <= -STOP_LOSS)
+        if hits.any():
+            return start + int(hits.argmax())
+        start, size = end, size * 2
+    return len(closes)
+
+
+def simulate(
+    symbol: str,
+    timestamps: np.ndarray,
+    closes: np.ndarray,
+    entry_signals: np.ndarray,
+    exit_signals: np.ndarray,
+    capital: float,
+    warmup: int = WARMUP_BARS,
+) -> SymbolResult:
+    """Trade one symbol long-only from precomputed signals.
+
+    A position uses ``POSITION_SIZE`` of the capital and is closed on an
+    exit signal, on ``TAKE_PROFIT`` or on ``STOP_LOSS``. A position still open
+    at the end is valued at the last close. The first ``warmup`` bars are
+    skipped.
+
+    The simulation jumps from trade to trade instead of stepping through
+    every bar; flat and holding stretches of the equity curve are filled
+    with array operations.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    entry_signals = np.asarray(entry_signals, dtype=bool)
+    exit_signals = np.asarray(exit_signals, dtype=bool)
+    bars = len(closes)
+    start = min(warmup, bars)
+    equity = np.empty(bars - start, dtype=np.float64)
+    invested = np.zeros(bars - start, dtype=np.float64)
+    entry_times: list[int] = []
+    exit_times: list[int] = []
+    entry_prices: list[float] = []
+    exit_prices: list[float] = []
+    quantities: list[float] = []
+    entries = np.flatnonzero(entry_signals[start:]) + start
+
+    i = start
+    while i < bars:
+        k = int(np.searchsorted(entries, i))
+        if k == len(entries):
+            equity[i - start :] = capital
+            break
+
+        entry = int(entries[k])
+        equity[i - start : entry - start + 1] = capital
+        entry_price = float(closes[entry])
+        quantity = capital * POSITION_SIZE / entry_price
+        capital -= quantity * entry_price
+
+        exit_ = _find_exit(closes, exit_signals, entry, entry_price)
+        held = quantity * closes[entry + 1 : exit_ + 1]
+        invested[entry + 1 - start : exit_ + 1 - start] = held
+        equity[entry + 1 - start : exit_ + 1 - start] = capital + held
+
+        if exit_ == bars:
+            capital += quantity * float(closes[-1])
+            break
+
+        exit_price = float(closes[exit_])
+        capital += quantity * exit_price
+        entry_times.append(int(timestamps[entry]))
+        exit_times.append(int(timestamps[exit_]))
+        entry_prices.append(entry_price)
+        exit_prices.append(exit_price)
+        quantities.append(quantity)
+        i = exit_ + 1
+
+    return SymbolResult(
+        symbol=symbol,
+        timestamps=np.asarray(timestamps[start:], dtype=np.int64),
+        equity=equity,
+        final_capital=capital,
+        trades=TradeLog.from_columns(
+            symbol, entry_times, exit_times, entry_prices, exit_prices, quantities
+        ),
+        invested=invested,
+    )
+
+
+def run_symbol(
+    data: SymbolData,
+    timeframe: str,
+    rules: dict[str, Any],
+    exit_rules: list[dict[str, Any]],
+    capital: float,
+) -> SymbolResult:
+    """Compute signals for one symbol and simulate it.
+
+    This is the unit of work sent to worker processes; each process keeps its
+    own indicator cache.
+    """
+    df = data.to_frame()
+    engine = RuleEngine()
+    engine.bind(df, symbol=data.symbol, timeframe=timeframe)
+
+    entry_signals = engine.evaluate_signals(engine.compile(rules), df)
+    exit_signals = engine.evaluate_any_signals(engine.compile_many(exit_rules), df)
+
+    return simulate(
+        data.symbol,
+        data.timestamps,
+        data.ohlcv[:, OHLCV_COLUMNS.index("close")],
+        entry_signals,
+        exit_signals,
+        capital,
+    )
+
+
+def merge_equity(
+    results: list[SymbolResult],
+    allocation: float,
+    idle_sleeves: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Combine per-symbol equity into one portfolio curve.
+
+    Each symbol's equity is carried forward onto the union of all
+    timestamps; before its first bar a symbol counts as its unspent
+    ``allocation``. ``idle_sleeves`` allocations (symbols without data) are
+    added as cash.
+
+    Returns:
+        Tuple of int64 nanosecond timestamps and float64 equity
+    """
+    active = [r for r in results if len(r.timestamps)]
+    idle_sleeves += len(results) - len(active)
+    if not active:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    timeline = np.unique(np.concatenate([r.timestamps for r in active]))
+    total = np.full(len(timeline), allocation * idle_sleeves, dtype=np.float64)
+    for result in active:
+        total += _carry_forward(result.timestamps, result.equity, timeline, allocation)
+    return timeline, total
+
+
+def merge_invested(results: list[SymbolResult], timeline: np.ndarray) -> np.ndarray:
+    """Value held in open positions across symbols on ``timeline``."""
+    total = np.zeros(len(timeline), dtype=np.float64)
+    for result in results:
+        if len(result.timestamps) and result.invested is not None:
+            total += _carry_forward(result.timestamps, result.invested, timeline, 0.0)
+    return total
+
+
+def _carry_forward(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    timeline: np.ndarray,
+    before: float,
+) -> np.ndarray:
+    """Values on ``timeline``, holding the last known one; ``before`` until the first."""
+    positions = np.searchsorted(timestamps, timeline, side="right") - 1
+    return np.where(positions >= 0, values[np.clip(positions, 0, None)], before)
+
+
+def summarize(
+    results: list[SymbolResult],
+    allocation: float,
+    idle_sleeves: int = 0,
+    *,
+    timeframe: str,
+) -> dict[str, Any]:
+    """Portfolio metrics for per-symbol results.
+
+    Ratios are annualized for ``timeframe`` bars.
+
+    Returns:
+        Capital, return, risk and trade statistics plus the merged
+        ``timestamps`` and ``equity`` arrays
+    """
+    initial_capital = allocation * (len(results) + idle_sleeves)
+    capital = sum(r.final_capital for r in results) + allocation * idle_sleeves
+    timestamps, equity = merge_equity(results, allocation, idle_sleeves)
+
+    trades = TradeLog.concat([r.trades for r in results])
+    stats = trade_statistics(trades.pnl)
+    metrics = performance_metrics(
+        equity,
+        timeframe,
+        invested=merge_invested(results, timestamps),
+        traded_notional=float(trades.notional.sum()) / 2,
+    )
+
+    return {
+        "final_capital": capital,
+        "total_return": (
+            (capital - initial_capital) / initial_capital * 100 if initial_capital else 0.0
+        ),
+        "total_trades": stats["total_trades"],
+        "winning_trades": stats["winning_trades"],
+        "losing_trades": stats["losing_trades"],
+        "win_rate": stats["win_rate"],
+        "max_drawdown": metrics["max_drawdown"],
+        "sharpe_ratio": metrics["sharpe_ratio"],
+        "sortino_ratio": metrics["sortino_ratio"],
+        "calmar_ratio": metrics["calmar_ratio"],
+        "profit_factor": stats["profit_factor"],
+        "exposure": metrics["exposure"],
+        "turnover": metrics["turnover"],
+        "timestamps": timestamps,
+        "equity": equity,
+    }
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_failed = False
+# Processes on this host that each own a pool, e.g. Celery prefork children
+_pool_owners = 1
+
+
+def set_pool_owners(count: int) -> None:
+    """Declare how many processes on the host each start a worker pool."""
+    global _pool_owners
+    _pool_owners = max(1, count)
+
+
+def pool_size() -> int:
+    """Number of processes in this process's worker pool.
+
+    ``BACKTEST_WORKERS`` if set. Otherwise the CPU cores are divided
+    between the processes owning a pool, so a Celery worker with
+    concurrency N starts about one process per core in total rather
+    than N per core.
+    """
+    if settings.BACKTEST_WORKERS:
+        return settings.BACKTEST_WORKERS
+    return max(1, (os.cpu_count() or 1) // _pool_owners)
+
+
+def get_executor() -> Executor | None:
+    """Get the process-wide worker pool, or None if processes are unavailable."""
+    global _executor, _executor_failed
+
+    if _executor is None and not _executor_failed:
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes are not allowed to have children
+            _executor_failed = True
+            return None
+        _executor = ProcessPoolExecutor(max_workers=pool_size())
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the worker pool."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# Data shared with the jobs of running maps by key. Pool workers get their
+# copy once, when they start.
+_shared: dict[str, Any] = {}
+
+
+def _share(key: str, data: Any) -> None:
+    _shared[key] = data
+
+
+def shared(key: str) -> Any:
+    """Data registered by ``share_with_workers`` under ``key``."""
+    return _shared[key]
+
+
+@contextmanager
+def share_with_workers(data: Any, jobs: int) -> Iterator[tuple[str, Executor | None]]:
+    """Make ``data`` readable by jobs through ``shared(key)``.
+
+    Yields the key and a dedicated pool, sized for ``jobs``, whose workers
+    each receive ``data`` once as they start, so the jobs only need to carry
+    the key. The pool is None where child processes cannot be started; jobs
+    then run in threads and read this process's copy.
+    """
+    key = uuid4().hex
+    _share(key, data)
+    executor = None
+    if not _executor_failed and not multiprocessing.current_process().daemon:
+        executor = ProcessPoolExecutor(
+            max_workers=max(1, min(pool_size(), jobs)), initializer=_share, initargs=(key, data)
+        )
+    try:
+        yield key, executor
+    finally:
+        _shared.pop(key, None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def map_in_workers(
+    job: Callable[[Any], Any],
+    items: list[Any],
+    on_done: Callable[[int, Any], Awaitable[None]] | None = None,
+    executor: Executor | None = None,
+) -> list[Any]:
+    """Run ``job`` over ``items`` in the process pool, keeping their order.
+
+    ``on_done(index, result)`` is awaited as each item finishes. If it
+    raises (e.g. the job was cancelled), items that have not started yet are
+    cancelled and the error propagates. Items already running cannot be
+    interrupted: they finish in their worker and their results are
+    discarded, so workers are only freed as those items complete.
+
+    ``executor`` replaces the process-wide pool, e.g. one from
+    ``share_with_workers``. Without it, a single item, or a process where
+    child processes cannot be started (e.g. a daemonic worker), runs in a
+    thread so the event loop is not blocked.
+    """
+    global _executor_failed
+
+    loop = asyncio.get_running_loop()
+    dedicated = executor is not None
+
+    if dedicated or len(items) > 1:
+        executor = executor or get_executor()
+        if executor is not None:
+            futures = [loop.run_in_executor(executor, job, item) for item in items]
+            try:
+                if on_done is not None:
+                    positions = {future: i for i, future in enumerate(futures)}
+                    pending = set(futures)
+                    while pending:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            await on_done(positions[future], future.result())
+                return list(await asyncio.gather(*futures))
+            except (BrokenProcessPool, AssertionError, OSError) as e:
+                logger.warning(f"Process pool unavailable, running in-process: {e}")
+                if not dedicated:
+                    _executor_failed = True
+                    shutdown_executor()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    results = []
+    for i, item in enumerate(items):
+        results.append(await asyncio.to_thread(job, item))
+        if on_done is not None:
+            await on_done(i, results[-1])
+    return results
+
+
+async def run_symbols(
+    datasets: list[SymbolData],
+    timeframe: str,
+    rules: dict[str, Any],
+    exit_rules: list[dict[str, Any]],
+    capital: float,
+    progress: JobProgress | None = None,
+) -> list[SymbolResult]:
+    """Simulate symbols in parallel, each with ``capital`` to trade.
+
+    ``progress`` is advanced by each symbol's bars as it finishes.
+    """
+    job = partial(
+        run_symbol, timeframe=timeframe, rules=rules, exit_rules=exit_rules, capital=capital
+    )
+    on_done = None
+    if progress is not None:
+        await progress.start_stage("simulating", sum(len(d) for d in datasets))
+
+        async def on_done(i: int, result: SymbolResult) -> None:
+            await progress.advance(len(datasets[i]), current=datasets[i].symbol)
+
+    return await map_in_workers(job, datasets, on_done)
+
+
+def compute_signals(
+    data: SymbolData,
+    timeframe: str,
+    variants: list[tuple[dict[str, Any], list[dict[str, Any]]]],
+) -> SymbolSignals:
+    """Evaluate several rule variants over one symbol's full series.
+
+    One rule engine is bound for all variants, so indicators shared between
+    them are computed once.
+    """
+    df = data.to_frame()
+    engine = RuleEngine()
+    engine.bind(df, symbol=data.symbol, timeframe=timeframe)
+
+    entries = np.zeros((len(variants), len(df)), dtype=bool)
+    exits = np.zeros((len(variants), len(df)), dtype=bool)
+    for i, (rules, exit_rules) in enumerate(variants):
+        entries[i] = engine.evaluate_signals(engine.compile(rules), df)
+        exits[i] = engine.evaluate_any_signals(engine.compile_many(exit_rules), df)
+
+    start = min(WARMUP_BARS, len(df))
+    return SymbolSignals(
+        symbol=data.symbol,
+        timestamps=data.timestamps[start:],
+        closes=data.ohlcv[start:, OHLCV_COLUMNS.index("close")],
+        entries=entries[:, start:],
+        exits=exits[:, start:],
+    )
+
+
+def evaluate_batch(
+    variants: list[tuple[dict[str, Any], list[dict[str, Any]]]],
+    datasets: list[SymbolData],
+    timeframe: str,
+    allocation: float,
+    idle_sleeves: int = 0,
+) -> list[dict[str, Any]]:
+    """Backtest several rule variants against the same data.
+
+    Returns:
+        Summary metrics per variant, without the equity series
+    """
+    signals = [compute_signals(data, timeframe, variants) for data in datasets]
+    return [
+        _metrics(
+            summarize(
+                [s.simulate(i, allocation) for s in signals],
+                allocation,
+                idle_sleeves,
+                timeframe=timeframe,
+            )
+        )
+        for i in range(len(variants))
+    ]
+
+
+def evaluate_shared_batch(
+    variants: list[tuple[dict[str, Any], list[dict[str, Any]]]],
+    key: str,
+) -> list[dict[str, Any]]:
+    """``evaluate_batch`` on the arguments shared under ``key``.
+
+    The datasets stay in the worker between batches, so only the variants
+    are sent per batch.
+    """
+    return evaluate_batch(variants, **shared(key))
+
+
+def _metrics(summary: dict[str, Any]) -> dict[str, Any]:
+    """A summary without its equity series."""
+    return {k: v for k, v in summary.items() if k not in ("timestamps", "equity")}
+
+
+def rolling_windows(
+    start: int,
+    end: int,
+    train: int,
+    test: int,
+    anchored: bool = False,
+) -> list[tuple[int, int, int]]:
+    """Split ``[start, end]`` into consecutive train/test windows.
+
+    Each test period follows its training period and the next window moves
+    forward by one test period. Anchored windows keep training from
+    ``start``. The last test period may be shorter.
+
+    Returns:
+        ``(train_start, test_start, test_end)`` tuples; periods are half-open
+    """
+    windows = []
+    test_start = start + train
+    while test_start <= end:
+        train_start = start if anchored else test_start - train
+        windows.append((train_start, test_start, min(test_start + test, end + 1)))
+        test_start += test
+    return windows
+
+
+def run_window(
+    window: tuple[int, int, int],
+    signals: list[SymbolSignals],
+    allocation: float,
+    idle_sleeves: int = 0,
+    objective: str = "sharpe_ratio",
+    *,
+    timeframe: str,
+) -> dict[str, Any]:
+    """Pick the best variant on a training period and trade it out of sample.
+
+    Returns:
+        Index of the chosen variant, ``train`` and ``test`` metrics, and the
+        test period's ``result`` as a portfolio ``SymbolResult``
+    """
+    train_start, test_start, test_end = window
+    train = [s.between(train_start, test_start) for s in signals]
+    test = [s.between(test_start, test_end) for s in signals]
+
+    variants = len(signals[0].entries) if signals else 1
+    scores = [
+        _metrics(
+            summarize(
+                [s.simulate(i, allocation) for s in train],
+                allocation,
+                idle_sleeves,
+                timeframe=timeframe,
+            )
+        )
+        for i in range(variants)
+    ]
+    ranked = sorted(
+        range(variants), key=lambda i: scores[i][objective], reverse=OBJECTIVES[objective]
+    )
+    best = ranked[0]
+
+    results = [s.simulate(best, allocation) for s in test]
+    summary = summarize(results, allocation, idle_sleeves, timeframe=timeframe)
+    return {
+        "window": window,
+        "variant": best,
+        "train": scores[best],
+        "test": _metrics(summary),
+        "result": SymbolResult(
+            symbol="portfolio",
+            timestamps=summary["timestamps"],
+            equity=summary["equity"],
+            final_capital=summary["final_capital"],
+            trades=TradeLog.concat([r.trades for r in results]),
+            invested=merge_invested(results, summary["timestamps"]),
+        ),
+    }
+
+
+def stitch_windows(windows: list[dict[str, Any]], initial_capital: float) -> SymbolResult:
+    """Chain test periods into one out-of-sample equity curve.
+
+    Every window is simulated from ``initial_capital``; since position sizes
+    are proportional to capital, each is rescaled to start from the capital
+    the previous window ended with.
+    """
+    capital = initial_capital
+    timestamps, equity, invested, trades = [], [], [], []
+    for window in windows:
+        result = window["result"]
+        scale = capital / initial_capital
+        timestamps.append(result.timestamps)
+        equity.append(result.equity * scale)
+        invested.append(
+            (result.invested if result.invested is not None else np.zeros(len(result.equity)))
+            * scale
+        )
+        trades.append(result.trades.scaled(scale))
+        capital = result.final_capital * scale
+
+    return SymbolResult(
+        symbol="portfolio",
+        timestamps=np.concatenate(timestamps) if timestamps else np.empty(0, dtype=np.int64),
+        equity=np.concatenate(equity) if equity else np.empty(0, dtype=np.float64),
+        final_capital=capital,
+        trades=TradeLog.concat(trades),
+        invested=np.concatenate(invested) if invested else np.empty(0, dtype=np.float64),
+    )
+
+
+async def run_walk_forward(
+    datasets: list[SymbolData],
+    timeframe: str,
+    variants: list[tuple[dict[str, Any], list[dict[str, Any]]]],
+    allocation: float,
+    train: int,
+    test: int,
+    anchored: bool = False,
+    idle_sleeves: int = 0,
+    objective: str = "sharpe_ratio",
+    progress: JobProgress | None = None,
+) -> dict[str, Any]:
+    """Walk-forward backtest over rolling train/test windows.
+
+    Signals are computed once per symbol over the full series, so each
+    window starts with indicators already warmed up and only slices the
+    arrays. Windows run concurrently. With several variants, the best one on
+    each training period (by ``objective``) is traded in the following test
+    period.
+
+    Args:
+        train: Training period length in nanoseconds
+        test: Test period length in nanoseconds
+
+    Returns:
+        Per-window results and the stitched out-of-sample ``SymbolResult``
+    """
+    on_signals = on_window = None
+    if progress is not None:
+        await progress.start_stage("signals", sum(len(d) for d in datasets) * len(variants))
+
+        async def on_signals(i: int, result: SymbolSignals) -> None:
+            await progress.advance(len(datasets[i]) * len(variants), current=datasets[i].symbol)
+
+    signals = await map_in_workers(
+        partial(compute_signals, timeframe=timeframe, variants=variants), datasets, on_signals
+    )
+    signals = [s for s in signals if len(s)]
+    if not signals:
+        return {"windows": [], "result": stitch_windows([], allocation)}
+
+    start = min(int(s.timestamps[0]) for s in signals)
+    end = max(int(s.timestamps[-1]) for s in signals)
+    windows = rolling_windows(start, end, train, test, anchored)
+    idle_sleeves += len(datasets) - len(signals)
+
+    # Send each window only its own slice of the signals
+    items = [(w, [s.between(w[0], w[2]) for s in signals]) for w in windows]
+    job = partial(
+        _run_window_item,
+        allocation=allocation,
+        idle_sleeves=idle_sleeves,
+        objective=objective,
+        timeframe=timeframe,
+    )
+    if progress is not None:
+        sizes = [sum(len(s) for s in item[1]) * len(variants) for item in items]
+        await progress.start_stage("windows", sum(sizes))
+
+        async def on_window(i: int, result: dict[str, Any]) -> None:
+            await progress.advance(sizes[i], current=f"window {i + 1}/{len(items)}")
+
+    results = await map_in_workers(job, items, on_window)
+
+    initial_capital = allocation * (len(signals) + idle_sleeves)
+    return {"windows": results, "result": stitch_windows(results, initial_capital)}
+
+
+def _run_window_item(
+    item: tuple[tuple[int, int, int], list[SymbolSignals]],
+    allocation: float,
+    idle_sleeves: int,
+    objective: str,
+    timeframe: str,
+) -> dict[str, Any]:
+    window, signals = item
+    return run_window(window, signals, allocation, idle_sleeves, objective, timeframe=timeframe)
@@ -1,32 +1,144 @@
 """Backtest service for running backtests."""
 
+import asyncio
+import hashlib
+import json
 import logging
-from datetime import UTC, datetime
+import uuid
+from datetime import UTC, date, datetime
 from decimal import Decimal
 from typing import Any
 
 import pandas as pd
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.models.backtest import Backtest, BacktestTrade
 from app.models.strategy import Strategy
+from app.services.backtest_engine import (
+    SymbolData,
+    TradeLog,
+    run_symbols,
+    run_walk_forward,
+    summarize,
+)
+from app.services.candle_store import CandleStore
+from app.services.job_control import JobCancelled, JobProgress
 from app.services.market_data_service import MarketDataService
-from app.services.rule_engine import RuleEngine
+from app.utils.equity_series import encode_series
+from app.utils.ohlcv import OHLCVFrame
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement; 13 bound parameters per row stays well under
+# the PostgreSQL and SQLite parameter limits.
+TRADE_INSERT_CHUNK_SIZE = 1000
+NUMERIC_TRADE_COLUMNS = ("entry_price", "exit_price", "quantity", "pnl", "pnl_percent")
+TRADE_COLUMNS = (
+    "symbol",
+    "side",
+    "entry_price",
+    "exit_price",
+    "quantity",
+    "entry_time",
+    "exit_time",
+    "pnl",
+    "pnl_percent",
+)
+# Backtest columns holding results, copied when results are reused
+RESULT_COLUMNS = (
+    "final_capital",
+    "total_return",
+    "total_trades",
+    "winning_trades",
+    "losing_trades",
+    "win_rate",
+    "max_drawdown",
+    "sharpe_ratio",
+    "profit_factor",
+    "sortino_ratio",
+    "calmar_ratio",
+    "exposure",
+    "turnover",
+    "equity_curve",
+    "equity_data",
+    "windows",
+)
+MARKET_DATA_EXCHANGE = "binance"
+
+# Bump whenever an engine change alters results so older runs are not reused
+RESULT_VERSION = 1
+
+
+def date_range(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    """First and last moment of a backtest's inclusive date range."""
+    return (
+        datetime.combine(start_date, datetime.min.time()),
+        datetime.combine(end_date, datetime.max.time()),
+    )
+
+
+def result_fingerprint(
+    backtest: Backtest,
+    strategy: Strategy,
+    data_versions: list[dict[str, Any]],
+) -> str:
+    """Hash everything a backtest's results depend on.
+
+    Covers the strategy rules, the run settings and the version of each
+    symbol's market data, so editing the rules or storing new candles for
+    the range yields a different fingerprint.
+    """
+    payload = {
+        "version": RESULT_VERSION,
+        "rules": strategy.rules,
+        "exit_rules": strategy.exit_rules or [],
+        "symbols": backtest.symbols,
+        "timeframe": backtest.timeframe,
+        "start_date": backtest.start_date.isoformat(),
+        "end_date": backtest.end_date.isoformat(),
+        "initial_capital": float(backtest.initial_capital),
+        "walk_forward": backtest.walk_forward,
+        "data": data_versions,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
 
 class BacktestService:
     """Service for running backtests on trading strategies."""
 
     def __init__(self, db: AsyncSession | None = None) -> None:
         self.db = db
-        self.rule_engine = RuleEngine()
-        self.market_data_service = MarketDataService()
+        self.market_data_service = MarketDataService(candle_store=CandleStore())
 
-    async def run_backtest(self, backtest_id: str) -> dict[str, Any]:
-        """Run a backtest and return results."""
+    async def get_owner_id(self, backtest_id: str) -> str | None:
+        """ID of the user owning a backtest's strategy."""
+        if not self.db:
+            raise RuntimeError("Database session required")
+
+        result = await self.db.execute(
+            select(Strategy.user_id)
+            .join(Backtest, Backtest.strategy_id == Strategy.id)
+            .where(Backtest.id == backtest_id)
+        )
+        user_id = result.scalar_one_or_none()
+        return str(user_id) if user_id else None
+
+    async def run_backtest(
+        self,
+        backtest_id: str,
+        progress: JobProgress | None = None,
+    ) -> dict[str, Any]:
+        """Run a backtest and return results.
+
+        With ``progress``, the run reports its progress and stops with
+        ``JobCancelled`` (status ``cancelled``) once the user cancels it.
+        Only a pending backtest is run, and the cancellation flag is checked
+        once more before the results are written, so a backtest cancelled
+        from the API never ends up ``completed``.
+        """
         if not self.db:
             raise RuntimeError("Database session required")
 
@@ -36,17 +148,34 @@ class BacktestService:
         if not backtest:
             raise ValueError(f"Backtest not found: {backtest_id}")
 
-        result = await self.db.execute(select(Strategy).where(Strategy.id == backtest.strategy_id))
-        strategy = result.scalar_one_or_none()
+        strategy = await self.db.scalar(select(Strategy).where(Strategy.id == backtest.strategy_id))
 
         if not strategy:
             raise ValueError(f"Strategy not found: {backtest.strategy_id}")
 
         try:
-            backtest.status = "running"
-            await self.db.flush()
+            if progress is not None:
+                await progress.check_cancelled()
+
+            claimed = await self.db.execute(
+                update(Backtest)
+                .where(Backtest.id == backtest.id, Backtest.status == "pending")
+                .values(status="running")
+                .returning(Backtest.id)
+            )
+            if claimed.scalar_one_or_none() is None:
+                raise JobCancelled(f"Backtest {backtest_id} was cancelled before it started")
+            # Committed so the API sees the run and does not wait on its row lock
+            await self.db.commit()
 
-            results = await self._execute_backtest(backtest, strategy)
+            if backtest.walk_forward:
+                results = await self._execute_walk_forward(backtest, strategy, progress)
+                backtest.windows = results["windows"]
+            else:
+                results = await self._execute_backtest(backtest, strategy, progress)
+
+            if progress is not None:
+                await progress.check_cancelled()
 
             backtest.status = "completed"
             backtest.completed_at = datetime.now(UTC)
@@ -58,14 +187,27 @@ class BacktestService:
             backtest.win_rate = Decimal(str(results["win_rate"]))
             backtest.max_drawdown = Decimal(str(results["max_drawdown"]))
             backtest.sharpe_ratio = Decimal(str(results["sharpe_ratio"]))
+            backtest.sortino_ratio = Decimal(str(results["sortino_ratio"]))
+            backtest.calmar_ratio = Decimal(str(results["calmar_ratio"]))
+            backtest.exposure = Decimal(str(results["exposure"]))
+            backtest.turnover = Decimal(str(results["turnover"]))
             backtest.profit_factor = Decimal(str(results["profit_factor"]))
-            backtest.equity_curve = results["equity_curve"]
+            backtest.equity_data = results["equity_data"]
+            # Data fetched during the run is part of the fingerprint
+            backtest.fingerprint = await self.fingerprint(backtest, strategy)
 
             await self.db.flush()
 
             logger.info(f"Backtest completed: {backtest_id}")
             return results
 
+        except JobCancelled as e:
+            backtest.status = "cancelled"
+            backtest.error_message = str(e)
+            await self.db.flush()
+            logger.info(f"Backtest cancelled: {backtest_id}")
+            raise
+
         except Exception as e:
             backtest.status = "failed"
             backtest.error_message = str(e)
@@ -77,130 +219,276 @@ class BacktestService:
         self,
         backtest: Backtest,
         strategy: Strategy,
+        progress: JobProgress | None = None,
     ) -> dict[str, Any]:
-        """Execute the backtest logic."""
-        trades: list[BacktestTrade] = []
-        equity_curve: list[dict[str, Any]] = []
-        capital = float(backtest.initial_capital)
-        position: dict[str, Any] | None = None
-
-        for symbol in backtest.symbols:
-            df = await self._get_market_data(
-                symbol=symbol,
-                start_date=backtest.start_date,
-                end_date=backtest.end_date,
-                timeframe=backtest.timeframe,
-            )
+        """Execute the backtest logic.
 
-            if df.empty:
-                logger.warning(f"No data for {symbol}")
-                continue
+        The initial capital is split equally across symbols. Each symbol is
+        simulated independently in the worker pool and the per-symbol equity
+        is merged into one portfolio curve.
+        """
+        initial_capital = float(backtest.initial_capital)
+        allocation = initial_capital / max(len(backtest.symbols), 1)
+
+        datasets = await self.load_datasets(
+            backtest.symbols, backtest.start_date, backtest.end_date, backtest.timeframe, progress
+        )
+
+        results = await run_symbols(
+            datasets,
+            timeframe=backtest.timeframe,
+            rules=strategy.rules,
+            exit_rules=strategy.exit_rules or [],
+            capital=allocation,
+            progress=progress,
+        )
+
+        idle_sleeves = max(len(backtest.symbols), 1) - len(results)
+        summary = summarize(results, allocation, idle_sleeves, timeframe=backtest.timeframe)
+
+        trades = TradeLog.concat([r.trades for r in results])
+        return await self._finish(backtest, summary, trades)
+
+    async def _execute_walk_forward(
+        self,
+        backtest: Backtest,
+        strategy: Strategy,
+        progress: JobProgress | None = None,
+    ) -> dict[str, Any]:
+        """Execute a walk-forward backtest.
+
+        Data is loaded once for the whole range. The reported metrics, trades
+        and equity curve cover the stitched test periods only; per-window
+        training and test metrics are returned under ``windows``.
+        """
+        # Imported here as the optimization service depends on this module
+        from app.services.optimization_service import apply_parameters, iter_combinations
+
+        config = backtest.walk_forward or {}
+        combinations = (
+            list(iter_combinations(config["parameters"])) if config.get("parameters") else [{}]
+        )
+        variants = [
+            apply_parameters(strategy.rules, strategy.exit_rules, combination)
+            for combination in combinations
+        ]
+
+        allocation = float(backtest.initial_capital) / max(len(backtest.symbols), 1)
+        datasets = await self.load_datasets(
+            backtest.symbols, backtest.start_date, backtest.end_date, backtest.timeframe, progress
+        )
+
+        day = pd.Timedelta(days=1).value
+        walk_forward = await run_walk_forward(
+            datasets,
+            timeframe=backtest.timeframe,
+            variants=variants,
+            allocation=allocation,
+            train=config["train_days"] * day,
+            test=config["test_days"] * day,
+            anchored=config.get("anchored", False),
+            idle_sleeves=max(len(backtest.symbols), 1) - len(datasets),
+            objective=config.get("objective", "sharpe_ratio"),
+            progress=progress,
+        )
+
+        stitched = walk_forward["result"]
+        summary = summarize(
+            [stitched], float(backtest.initial_capital), timeframe=backtest.timeframe
+        )
+        results = await self._finish(backtest, summary, stitched.trades)
+        results["windows"] = [
+            {
+                "train_start": pd.Timestamp(w["window"][0]).isoformat(),
+                "test_start": pd.Timestamp(w["window"][1]).isoformat(),
+                "test_end": pd.Timestamp(w["window"][2]).isoformat(),
+                "parameters": combinations[w["variant"]],
+                "train": w["train"],
+                "test": w["test"],
+            }
+            for w in walk_forward["windows"]
+        ]
+        return results
+
+    async def _finish(
+        self,
+        backtest: Backtest,
+        summary: dict[str, Any],
+        trades: TradeLog,
+    ) -> dict[str, Any]:
+        """Store trades and add the compressed equity curve to a summary."""
+        await self.save_trades(backtest.id, trades)
+        summary["equity_data"] = encode_series(summary.pop("timestamps"), summary.pop("equity"))
+        return summary
+
+    async def save_trades(self, backtest_id: uuid.UUID, trades: TradeLog) -> int:
+        """Replace a backtest's trades with one bulk write.
+
+        Rows bypass the ORM session. PostgreSQL loads them with COPY; other
+        databases get multi-row INSERT statements in chunks. Existing trades
+        are removed first so a retried backtest does not duplicate them.
+        """
+        if not self.db:
+            raise RuntimeError("Database session required")
+
+        await self.db.execute(delete(BacktestTrade).where(BacktestTrade.backtest_id == backtest_id))
+        count = len(trades)
+        if not count:
+            return 0
+
+        await self._write_trades(
+            {
+                "id": [uuid.uuid4() for _ in range(count)],
+                "backtest_id": [backtest_id] * count,
+                "symbol": trades.symbol.tolist(),
+                "side": ["long"] * count,
+                "entry_price": trades.entry_price.tolist(),
+                "exit_price": trades.exit_price.tolist(),
+                "quantity": trades.quantity.tolist(),
+                "entry_time": list(pd.to_datetime(trades.entry_time, utc=True).to_pydatetime()),
+                "exit_time": list(pd.to_datetime(trades.exit_time, utc=True).to_pydatetime()),
+                "pnl": trades.pnl.tolist(),
+                "pnl_percent": trades.pnl_percent.tolist(),
+            }
+        )
+
+        logger.debug(f"Stored {count} trades for backtest {backtest_id}")
+        return count
+
+    async def _write_trades(self, columns: dict[str, list[Any]]) -> None:
+        """Insert trade rows given as parallel column lists."""
+        if not self.db:
+            raise RuntimeError("Database session required")
 
-            self.rule_engine.clear_cache()
-
-            for i in range(20, len(df)):
-                timestamp = df.index[i]
-                close_price = float(df["close"].iloc[i])
-
-                equity_curve.append(
-                    {
-                        "timestamp": (
-                            timestamp.isoformat()
-                            if hasattr(timestamp, "isoformat")
-                            else str(timestamp)
-                        ),
-                        "equity": capital + (position["quantity"] * close_price if position else 0),
-                    }
+        count = len(columns["id"])
+        if self.db.get_bind().dialect.name == "postgresql":
+            for name in NUMERIC_TRADE_COLUMNS:
+                columns[name] = [None if v is None else Decimal(v) for v in columns[name]]
+            connection = await self.db.connection()
+            raw = await connection.get_raw_connection()
+            # The asyncpg connection, whose COPY is far faster than INSERTs
+            driver: Any = raw.driver_connection
+            await driver.copy_records_to_table(
+                BacktestTrade.__tablename__,
+                records=list(zip(*columns.values(), strict=True)),
+                columns=list(columns),
+            )
+        else:
+            rows = [
+                dict(zip(columns, values, strict=True))
+                for values in zip(*columns.values(), strict=True)
+            ]
+            for offset in range(0, count, TRADE_INSERT_CHUNK_SIZE):
+                await self.db.execute(
+                    insert(BacktestTrade).values(rows[offset : offset + TRADE_INSERT_CHUNK_SIZE])
                 )
 
-                if position is None:
-                    entry_signal = self.rule_engine.evaluate_rules(
-                        strategy.rules,
-                        df.iloc[: i + 1],
-                        -1,
-                    )
-
-                    if entry_signal.get("passed"):
-                        quantity = capital * 0.95 / close_price
-                        position = {
-                            "symbol": symbol,
-                            "entry_price": close_price,
-                            "quantity": quantity,
-                            "entry_time": timestamp,
-                        }
-                        capital -= quantity * close_price
-
-                else:
-                    exit_rules = strategy.exit_rules or []
-                    exit_signal = {"signal": None}
-
-                    if exit_rules:
-                        exit_signal = self.rule_engine.evaluate_exit_rules(
-                            exit_rules,
-                            df.iloc[: i + 1],
-                            -1,
-                        )
-
-                    pnl_percent = (close_price - position["entry_price"]) / position["entry_price"]
-                    should_exit = (
-                        exit_signal.get("signal") == "exit"
-                        or pnl_percent >= 0.05
-                        or pnl_percent <= -0.02
-                    )
-
-                    if should_exit:
-                        pnl = (close_price - position["entry_price"]) * position["quantity"]
-                        capital += position["quantity"] * close_price
-
-                        trade = BacktestTrade(
-                            backtest_id=backtest.id,
-                            symbol=symbol,
-                            side="long",
-                            entry_price=Decimal(str(position["entry_price"])),
-                            exit_price=Decimal(str(close_price)),
-                            quantity=Decimal(str(position["quantity"])),
-                            entry_time=position["entry_time"],
-                            exit_time=timestamp,
-                            pnl=Decimal(str(pnl)),
-                            pnl_percent=Decimal(str(pnl_percent * 100)),
-                        )
-                        trades.append(trade)
-                        self.db.add(trade)
-
-                        position = None
-
-        if position:
-            close_price = float(df["close"].iloc[-1])
-            # Calculate unrealized PnL for open position (value added to capital below)
-            # The PnL calculation is implicit in capital += quantity * close_price
-            capital += position["quantity"] * close_price
-
-        winning_trades = [t for t in trades if t.pnl and t.pnl > 0]
-        losing_trades = [t for t in trades if t.pnl and t.pnl < 0]
-
-        total_profit = sum(float(t.pnl) for t in winning_trades)
-        total_loss = abs(sum(float(t.pnl) for t in losing_trades))
+    async def fingerprint(self, backtest: Backtest, strategy: Strategy) -> str:
+        """Fingerprint a backtest against the market data stored right now."""
+        start, end = date_range(backtest.start_date, backtest.end_date)
+        store = self.market_data_service.candle_store
+        if store is None:
+            raise RuntimeError("Candle store required")
+
+        data_versions = await asyncio.gather(
+            *(
+                store.get_range_stats(
+                    symbol,
+                    MARKET_DATA_EXCHANGE,
+                    backtest.timeframe,
+                    int(start.timestamp() * 1000),
+                    int(end.timestamp() * 1000),
+                )
+                for symbol in backtest.symbols
+            )
+        )
+        return result_fingerprint(backtest, strategy, list(data_versions))
 
-        initial_capital = float(backtest.initial_capital)
-        total_return = ((capital - initial_capital) / initial_capital) * 100
-
-        equities = [e["equity"] for e in equity_curve]
-        max_drawdown = self._calculate_max_drawdown(equities)
-        sharpe_ratio = self._calculate_sharpe_ratio(equities)
-
-        return {
-            "final_capital": capital,
-            "total_return": total_return,
-            "total_trades": len(trades),
-            "winning_trades": len(winning_trades),
-            "losing_trades": len(losing_trades),
-            "win_rate": (len(winning_trades) / len(trades) * 100) if trades else 0,
-            "max_drawdown": max_drawdown,
-            "sharpe_ratio": sharpe_ratio,
-            "profit_factor": total_profit / total_loss if total_loss > 0 else 0,
-            "equity_curve": equity_curve,
-            "trades": trades,
-        }
+    async def find_cached(self, fingerprint: str) -> Backtest | None:
+        """Latest completed backtest with the given fingerprint, if any."""
+        if not self.db:
+            raise RuntimeError("Database session required")
+
+        result = await self.db.execute(
+            select(Backtest)
+            .options(undefer(Backtest.equity_curve), undefer(Backtest.equity_data))
+            .where(Backtest.fingerprint == fingerprint, Backtest.status == "completed")
+            .order_by(Backtest.completed_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def copy_results(self, source: Backtest, target: Backtest) -> None:
+        """Complete ``target`` with the metrics, curve and trades of ``source``.
+
+        Trades are copied in bulk like freshly simulated ones.
+        """
+        if not self.db:
+            raise RuntimeError("Database session required")
+
+        for name in RESULT_COLUMNS:
+            setattr(target, name, getattr(source, name))
+        target.status = "completed"
+        target.completed_at = datetime.now(UTC)
+        target.fingerprint = source.fingerprint
+        target.cached_from_id = source.id
+
+        result = await self.db.execute(
+            select(*(getattr(BacktestTrade, name) for name in TRADE_COLUMNS))
+            .where(BacktestTrade.backtest_id == source.id)
+            .order_by(BacktestTrade.exit_time)
+        )
+        rows = result.all()
+
+        await self.db.execute(delete(BacktestTrade).where(BacktestTrade.backtest_id == target.id))
+        if rows:
+            columns: dict[str, list[Any]] = {
+                "id": [uuid.uuid4() for _ in rows],
+                "backtest_id": [target.id] * len(rows),
+            }
+            for name, values in zip(TRADE_COLUMNS, zip(*rows, strict=True), strict=True):
+                columns[name] = list(values)
+            await self._write_trades(columns)
+
+        await self.db.flush()
+        logger.info(f"Backtest {target.id} reused results of {source.id}")
+
+    async def load_datasets(
+        self,
+        symbols: list[str],
+        start_date: date,
+        end_date: date,
+        timeframe: str,
+        progress: JobProgress | None = None,
+    ) -> list[SymbolData]:
+        """Fetch market data for all symbols concurrently as compact arrays.
+
+        Symbols without data are logged and left out. ``progress`` counts
+        loaded symbols.
+        """
+        if progress is not None:
+            await progress.start_stage("loading", len(symbols))
+
+        async def load(symbol: str) -> OHLCVFrame:
+            frame = await self._get_market_data(
+                symbol=symbol,
+                start_date=start_date,
+                end_date=end_date,
+                timeframe=timeframe,
+            )
+            if progress is not None:
+                await progress.advance(1, current=symbol)
+            return frame
+
+        frames = await asyncio.gather(*(load(symbol) for symbol in symbols))
+
+        datasets = []
+        for symbol, frame in zip(symbols, frames, strict=True):
+            if not len(frame):
+                logger.warning(f"No data for {symbol}")
+                continue
+            datasets.append(SymbolData.from_ohlcv(symbol, frame))
+        return datasets
 
     async def _get_market_data(
         self,
@@ -208,74 +496,19 @@ class BacktestService:
         start_date: Any,
         end_date: Any,
         timeframe: str,
-    ) -> pd.DataFrame:
+    ) -> OHLCVFrame:
         """Fetch historical market data."""
         try:
-            data = await self.market_data_service.get_ohlcv(
+            start, end = date_range(start_date, end_date)
+            return await self.market_data_service.get_ohlcv(
                 symbol=symbol,
-                exchange="binance",
+                exchange=MARKET_DATA_EXCHANGE,
                 timeframe=timeframe,
-                start_date=datetime.combine(start_date, datetime.min.time()),
-                end_date=datetime.combine(end_date, datetime.max.time()),
-                limit=10000,
+                start_date=start,
+                end_date=end,
+                limit=None,
             )
 
-            if not data:
-                return pd.DataFrame()
-
-            df = pd.DataFrame(data)
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df.set_index("timestamp", inplace=True)
-            return df
-
         except Exception as e:
             logger.error(f"Error fetching market data: {e}")
-            return pd.DataFrame()
-
-    def _calculate_max_drawdown(self, equities: list[float]) -> float:
-        """Calculate maximum drawdown."""
-        if not equities:
-            return 0.0
-
-        peak = equities[0]
-        max_dd = 0.0
-
-        for equity in equities:
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak * 100
-            if dd > max_dd:
-                max_dd = dd
-
-        return max_dd
-
-    def _calculate_sharpe_ratio(
-        self,
-        equities: list[float],
-        risk_free_rate: float = 0.02,
-    ) -> float:
-        """Calculate Sharpe ratio."""
-        if len(equities) < 2:
-            return 0.0
-
-        returns = []
-        for i in range(1, len(equities)):
-            if equities[i - 1] > 0:
-                ret = (equities[i] - equities[i - 1]) / equities[i - 1]
-                returns.append(ret)
-
-        if not returns:
-            return 0.0
-
-        import numpy as np
-
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-
-        if std_return == 0:
-            return 0.0
-
-        annualized_return = mean_return * 252
-        annualized_std = std_return * np.sqrt(252)
-
-        return (annualized_return - risk_free_rate) / annualized_std
+            return OHLCVFrame.empty()
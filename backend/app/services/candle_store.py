@@ -0,0 +1,291 @@
+"""Persistent OHLCV candle storage."""
+
+import logging
+from typing import Any
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import async_session_factory
+from app.models.market_data import OHLCVCandle, OHLCVEmptyRange
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement; 7 bound parameters per row stays well under
+# the PostgreSQL and SQLite parameter limits.
+INSERT_CHUNK_SIZE = 1000
+
+
+def find_gaps(
+    timestamps: list[int],
+    start_ms: int,
+    end_ms: int,
+    step_ms: int,
+) -> list[tuple[int, int]]:
+    """Find ranges of missing candles between two timestamps.
+
+    Args:
+        timestamps: Sorted candle open times already available
+        start_ms: Range start (inclusive)
+        end_ms: Range end (inclusive)
+        step_ms: Candle duration in milliseconds
+
+    Returns:
+        List of inclusive ``(first_missing, last_missing)`` open times
+    """
+    first = -(-start_ms // step_ms) * step_ms
+    last = end_ms // step_ms * step_ms
+    if first > last:
+        return []
+
+    gaps: list[tuple[int, int]] = []
+    cursor = first
+    for ts in timestamps:
+        if ts < cursor:
+            continue
+        if ts > last:
+            break
+        if ts > cursor:
+            gaps.append((cursor, ts - step_ms))
+        cursor = ts + step_ms
+
+    if cursor <= last:
+        gaps.append((cursor, last))
+
+    return gaps
+
+
+def subtract_ranges(
+    ranges: list[tuple[int, int]],
+    removed: list[tuple[int, int]],
+    step_ms: int,
+) -> list[tuple[int, int]]:
+    """Remove ranges of open times from others.
+
+    Args:
+        ranges: Sorted inclusive ``(first, last)`` open times
+        removed: Inclusive ``(first, last)`` open times to take out
+        step_ms: Candle duration in milliseconds
+
+    Returns:
+        What is left of ``ranges``, in order
+    """
+    result: list[tuple[int, int]] = []
+    for first, last in ranges:
+        cursor = first
+        for cut_first, cut_last in sorted(removed):
+            if cut_last < cursor or cut_first > last:
+                continue
+            if cut_first > cursor:
+                result.append((cursor, cut_first - step_ms))
+            cursor = max(cursor, cut_last + step_ms)
+        if cursor <= last:
+            result.append((cursor, last))
+    return result
+
+
+class CandleStore:
+    """Read and write candles in the ``ohlcv`` table.
+
+    Each operation runs in its own short session so cached candles are
+    committed independently of the caller's transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ) -> None:
+        self.session_factory = session_factory
+
+    async def get_candles(
+        self,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> list[list[float]]:
+        """Get stored candles as ``[ts, open, high, low, close, volume]`` rows."""
+        query = (
+            select(
+                OHLCVCandle.ts,
+                OHLCVCandle.open,
+                OHLCVCandle.high,
+                OHLCVCandle.low,
+                OHLCVCandle.close,
+                OHLCVCandle.volume,
+            )
+            .where(
+                OHLCVCandle.symbol == symbol,
+                OHLCVCandle.exchange == exchange,
+                OHLCVCandle.timeframe == timeframe,
+                OHLCVCandle.ts >= start_ms,
+                OHLCVCandle.ts <= end_ms,
+            )
+            .order_by(OHLCVCandle.ts)
+        )
+
+        async with self.session_factory() as db:
+            result = await db.execute(query)
+            return [list(row) for row in result.all()]
+
+    async def get_range_stats(
+        self,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> dict[str, Any]:
+        """Summarize the stored candles of a range without reading them.
+
+        The count, first and last open time, and sum of closes change
+        whenever candles in the range are added or revised, so they serve as
+        a version of the range's data.
+        """
+        query = select(
+            func.count(),
+            func.min(OHLCVCandle.ts),
+            func.max(OHLCVCandle.ts),
+            func.sum(OHLCVCandle.close),
+        ).where(
+            OHLCVCandle.symbol == symbol,
+            OHLCVCandle.exchange == exchange,
+            OHLCVCandle.timeframe == timeframe,
+            OHLCVCandle.ts >= start_ms,
+            OHLCVCandle.ts <= end_ms,
+        )
+
+        async with self.session_factory() as db:
+            count, first, last, close_sum = (await db.execute(query)).one()
+        return {
+            "count": count,
+            "first": first,
+            "last": last,
+            "close_sum": round(close_sum or 0.0, 6),
+        }
+
+    async def save_candles(
+        self,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        candles: list[list[Any]],
+    ) -> int:
+        """Insert or update candles given as exchange-style rows."""
+        if not candles:
+            return 0
+
+        async with self.session_factory() as db:
+            insert = self._insert_for(db)
+
+            for offset in range(0, len(candles), INSERT_CHUNK_SIZE):
+                rows = [
+                    {
+                        "symbol": symbol,
+                        "exchange": exchange,
+                        "timeframe": timeframe,
+                        "ts": int(c[0]),
+                        "open": float(c[1]),
+                        "high": float(c[2]),
+                        "low": float(c[3]),
+                        "close": float(c[4]),
+                        "volume": float(c[5] or 0),
+                    }
+                    for c in candles[offset : offset + INSERT_CHUNK_SIZE]
+                ]
+                stmt = insert(OHLCVCandle).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["symbol", "exchange", "timeframe", "ts"],
+                    set_={
+                        "open": stmt.excluded.open,
+                        "high": stmt.excluded.high,
+                        "low": stmt.excluded.low,
+                        "close": stmt.excluded.close,
+                        "volume": stmt.excluded.volume,
+                    },
+                )
+                await db.execute(stmt)
+
+            await db.commit()
+
+        logger.debug(f"Stored {len(candles)} candles for {exchange}:{symbol} {timeframe}")
+        return len(candles)
+
+    async def get_empty_ranges(
+        self,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> list[tuple[int, int]]:
+        """Get recorded empty ranges overlapping a range."""
+        query = (
+            select(OHLCVEmptyRange.start_ts, OHLCVEmptyRange.end_ts)
+            .where(
+                OHLCVEmptyRange.symbol == symbol,
+                OHLCVEmptyRange.exchange == exchange,
+                OHLCVEmptyRange.timeframe == timeframe,
+                OHLCVEmptyRange.start_ts <= end_ms,
+                OHLCVEmptyRange.end_ts >= start_ms,
+            )
+            .order_by(OHLCVEmptyRange.start_ts)
+        )
+
+        async with self.session_factory() as db:
+            result = await db.execute(query)
+            return [(int(first), int(last)) for first, last in result.all()]
+
+    async def save_empty_ranges(
+        self,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        ranges: list[tuple[int, int]],
+    ) -> int:
+        """Record closed ranges the exchange returned no candles for."""
+        if not ranges:
+            return 0
+
+        async with self.session_factory() as db:
+            insert = self._insert_for(db)
+            stmt = insert(OHLCVEmptyRange).values(
+                [
+                    {
+                        "symbol": symbol,
+                        "exchange": exchange,
+                        "timeframe": timeframe,
+                        "start_ts": first,
+                        "end_ts": last,
+                    }
+                    for first, last in ranges
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol", "exchange", "timeframe", "start_ts"],
+                set_={
+                    "end_ts": case(
+                        (stmt.excluded.end_ts > OHLCVEmptyRange.end_ts, stmt.excluded.end_ts),
+                        else_=OHLCVEmptyRange.end_ts,
+                    )
+                },
+            )
+            await db.execute(stmt)
+            await db.commit()
+
+        return len(ranges)
+
+    @staticmethod
+    def _insert_for(db: AsyncSession) -> Any:
+        """Get the dialect-specific INSERT construct supporting upserts."""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects import postgresql
+
+            return postgresql.insert
+        if dialect == "sqlite":
+            from sqlalchemy.dialects import sqlite
+
+            return sqlite.insert
+        raise RuntimeError(f"Unsupported database for candle storage: {dialect}")
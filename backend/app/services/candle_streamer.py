@@ -0,0 +1,311 @@
+"""Live candle and ticker streaming over exchange WebSockets."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol
+
+import ccxt.pro as ccxtpro
+import numpy as np
+
+from app.config import settings
+from app.core.events import BatchPublisher, EventBus, EventTypes, event_bus
+from app.utils.ohlcv import OHLCV_COLUMNS, OHLCVFrame, SeriesKey
+
+logger = logging.getLogger(__name__)
+
+HistoryLoader = Callable[[SeriesKey, int], Awaitable[OHLCVFrame]]
+
+
+class CandleTransport(Protocol):
+    """Source of live candle updates for one exchange."""
+
+    async def watch_ohlcv(self, symbol: str, timeframe: str) -> list[list[Any]]:
+        """Wait for the next update and return the latest candles."""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class TickerTransport(Protocol):
+    """Source of live ticker updates for one exchange."""
+
+    async def watch_ticker(self, symbol: str) -> dict[str, Any]:
+        """Wait for the next update and return the ticker."""
+        ...
+
+    async def close(self) -> None: ...
+
+
+class StreamTransport(CandleTransport, TickerTransport, Protocol):
+    """Source of both candle and ticker updates for one exchange."""
+
+
+class CcxtTransport:
+    """Candle and ticker updates from an exchange's WebSocket streams via ccxt."""
+
+    def __init__(self, exchange_name: str) -> None:
+        exchange_class = getattr(ccxtpro, exchange_name, None)
+        if not exchange_class:
+            raise ValueError(f"Exchange does not support streaming: {exchange_name}")
+        self.exchange = exchange_class({"enableRateLimit": True})
+
+    async def watch_ohlcv(self, symbol: str, timeframe: str) -> list[list[Any]]:
+        candles: list[list[Any]] = await self.exchange.watch_ohlcv(symbol, timeframe)
+        return candles
+
+    async def watch_ticker(self, symbol: str) -> dict[str, Any]:
+        ticker: dict[str, Any] = await self.exchange.watch_ticker(symbol)
+        return ticker
+
+    async def close(self) -> None:
+        await self.exchange.close()
+
+
+class CandleBuffer:
+    """Rolling window of closed candles plus the one still forming.
+
+    A candle counts as closed once a candle with a later open time arrives.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.closed: deque[list[float]] = deque(maxlen=size)
+        self.forming: list[float] | None = None
+
+    def update(self, candles: list[list[Any]]) -> list[list[float]]:
+        """Apply ``[ts, o, h, l, c, v]`` rows and return candles that closed."""
+        newly_closed = []
+        for candle in sorted(candles, key=lambda c: c[0]):
+            row = [float(v) if v is not None else 0.0 for v in candle[:6]]
+            if self.forming is None or row[0] == self.forming[0]:
+                self.forming = row
+            elif row[0] > self.forming[0]:
+                self.closed.append(self.forming)
+                newly_closed.append(self.forming)
+                self.forming = row
+        return newly_closed
+
+    def frame(self) -> OHLCVFrame:
+        """Closed candles as a frame."""
+        return OHLCVFrame.from_rows(list(self.closed))
+
+
+# Called with the series' buffer and the candle that closed, once per candle
+BarCloseHandler = Callable[[SeriesKey, CandleBuffer, list[float]], Awaitable[None]]
+
+
+class CandleStreamer:
+    """Keep per-series candle buffers current from WebSocket streams.
+
+    Each subscribed series runs its own watch loop, which reconnects with
+    exponential backoff on errors. Buffers are seeded from history so
+    consumers have a full window from the first close. Every closed candle
+    is published as ``market_data.candle_closed`` through ``publisher`` and
+    passed with the series' buffer to ``on_close``. When one update closes
+    several candles, the buffer already holds all of them, so handlers must
+    work from the candle they are given rather than the buffer's end.
+    """
+
+    def __init__(
+        self,
+        history: HistoryLoader,
+        on_close: BarCloseHandler | None = None,
+        transport_factory: Callable[[str], CandleTransport] = CcxtTransport,
+        buffer_size: int = settings.STREAM_BUFFER_BARS,
+        publisher: EventBus | BatchPublisher = event_bus,
+    ) -> None:
+        self.history = history
+        self.publisher = publisher
+        self.on_close = on_close
+        self.transport_factory = transport_factory
+        self.buffer_size = buffer_size
+        self.buffers: dict[SeriesKey, CandleBuffer] = {}
+        self._transports: dict[str, CandleTransport] = {}
+        self._tasks: dict[SeriesKey, asyncio.Task[None]] = {}
+
+    @property
+    def subscriptions(self) -> set[SeriesKey]:
+        return set(self._tasks)
+
+    def frame(self, key: SeriesKey) -> OHLCVFrame:
+        """Closed candles of a subscribed series."""
+        return self.buffers[key].frame()
+
+    async def sync(self, keys: set[SeriesKey]) -> None:
+        """Subscribe to exactly ``keys``."""
+        for key in self.subscriptions - keys:
+            await self.unsubscribe(key)
+        for key in keys - self.subscriptions:
+            await self.subscribe(key)
+
+    async def subscribe(self, key: SeriesKey) -> None:
+        """Seed a series' buffer from history and start streaming it."""
+        if key in self._tasks:
+            return
+
+        buffer = CandleBuffer(self.buffer_size)
+        try:
+            history = await self.history(key, self.buffer_size)
+            # The last historical candle may still be forming
+            buffer.update(np.column_stack((history.timestamps, history.values)).tolist())
+        except Exception as e:
+            logger.warning(f"No history for {key.exchange}:{key.symbol} {key.timeframe}: {e}")
+
+        self.buffers[key] = buffer
+        self._tasks[key] = asyncio.create_task(self._watch(key))
+        logger.info(f"Streaming {key.exchange}:{key.symbol} {key.timeframe}")
+
+    async def unsubscribe(self, key: SeriesKey) -> None:
+        """Stop streaming a series and drop its buffer."""
+        task = self._tasks.pop(key, None)
+        self.buffers.pop(key, None)
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            logger.info(f"Stopped streaming {key.exchange}:{key.symbol} {key.timeframe}")
+
+    async def close(self) -> None:
+        """Stop all streams and close the exchange connections."""
+        for key in list(self._tasks):
+            await self.unsubscribe(key)
+        for transport in self._transports.values():
+            with contextlib.suppress(Exception):
+                await transport.close()
+        self._transports.clear()
+
+    def _transport(self, exchange: str) -> CandleTransport:
+        if exchange not in self._transports:
+            self._transports[exchange] = self.transport_factory(exchange)
+        return self._transports[exchange]
+
+    async def _watch(self, key: SeriesKey) -> None:
+        """Stream one series until cancelled."""
+        failures = 0
+        while True:
+            try:
+                candles = await self._transport(key.exchange).watch_ohlcv(key.symbol, key.timeframe)
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                delay = min(2**failures, settings.STREAM_RECONNECT_MAX_SECONDS)
+                logger.warning(
+                    f"Stream {key.exchange}:{key.symbol} {key.timeframe} failed, "
+                    f"retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            buffer = self.buffers.get(key)
+            if buffer is None:
+                return
+            for candle in buffer.update(candles):
+                await self._closed(key, buffer, candle)
+
+    async def _closed(self, key: SeriesKey, buffer: CandleBuffer, candle: list[float]) -> None:
+        """Publish a closed candle and hand it with the buffer to ``on_close``."""
+        await self.publisher.publish(
+            EventTypes.CANDLE_CLOSED,
+            {
+                "exchange": key.exchange,
+                "symbol": key.symbol,
+                "timeframe": key.timeframe,
+                "timestamp": int(candle[0]),
+                **dict(zip(OHLCV_COLUMNS, candle[1:], strict=True)),
+            },
+        )
+        if self.on_close is not None:
+            try:
+                await self.on_close(key, buffer, candle)
+            except Exception as e:
+                logger.error(f"Bar close handler failed for {key.symbol} {key.timeframe}: {e}")
+
+
+class TickerStreamer:
+    """Publish live tickers as ``market_data.ticker`` events.
+
+    Each ``(exchange, symbol)`` pair runs its own watch loop, reconnecting
+    with exponential backoff on errors. Exchanges push ticker updates many
+    times a second, so at most one event per symbol is published every
+    ``interval`` seconds; updates in between are skipped.
+    """
+
+    def __init__(
+        self,
+        transport_factory: Callable[[str], TickerTransport] = CcxtTransport,
+        publisher: EventBus | BatchPublisher = event_bus,
+        interval: float = settings.TICKER_PUSH_INTERVAL_MS / 1000,
+    ) -> None:
+        self.transport_factory = transport_factory
+        self.publisher = publisher
+        self.interval = interval
+        self._transports: dict[str, TickerTransport] = {}
+        self._tasks: dict[tuple[str, str], asyncio.Task[None]] = {}
+
+    @property
+    def subscriptions(self) -> set[tuple[str, str]]:
+        return set(self._tasks)
+
+    async def sync(self, pairs: set[tuple[str, str]]) -> None:
+        """Stream exactly the tickers of ``pairs``."""
+        for pair in self.subscriptions - pairs:
+            task = self._tasks.pop(pair)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for pair in pairs - self.subscriptions:
+            self._tasks[pair] = asyncio.create_task(self._watch(*pair))
+
+    async def close(self) -> None:
+        """Stop all streams and close the transports."""
+        await self.sync(set())
+        for transport in self._transports.values():
+            with contextlib.suppress(Exception):
+                await transport.close()
+        self._transports.clear()
+
+    def _transport(self, exchange: str) -> TickerTransport:
+        if exchange not in self._transports:
+            self._transports[exchange] = self.transport_factory(exchange)
+        return self._transports[exchange]
+
+    async def _watch(self, exchange: str, symbol: str) -> None:
+        """Stream one ticker until cancelled."""
+        failures = 0
+        last_published = float("-inf")
+        while True:
+            try:
+                ticker = await self._transport(exchange).watch_ticker(symbol)
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                delay = min(2**failures, settings.STREAM_RECONNECT_MAX_SECONDS)
+                logger.warning(f"Ticker {exchange}:{symbol} failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                continue
+
+            now = time.monotonic()
+            if now - last_published < self.interval:
+                continue
+            last_published = now
+            await self.publisher.publish(
+                EventTypes.TICKER_UPDATED,
+                {
+                    "exchange": exchange,
+                    "symbol": symbol,
+                    "bid": ticker.get("bid"),
+                    "ask": ticker.get("ask"),
+                    "last": ticker.get("last"),
+                    "high": ticker.get("high"),
+                    "low": ticker.get("low"),
+                    "volume": ticker.get("baseVolume"),
+                    "timestamp": ticker.get("timestamp"),
+                },
+            )
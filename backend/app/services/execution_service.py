@@ -21,6 +21,14 @@ class ExecutionService:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
+    async def get_owner_id(self, portfolio_id: UUID | str) -> str | None:
+        """ID of the user owning a portfolio."""
+        result = await self.db.execute(
+            select(Portfolio.user_id).where(Portfolio.id == portfolio_id)
+        )
+        user_id = result.scalar_one_or_none()
+        return str(user_id) if user_id else None
+
     async def execute_market_order(
         self,
         portfolio_id: UUID,
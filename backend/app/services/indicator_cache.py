@@ -0,0 +1,106 @@
+"""Process-wide LRU cache for computed indicator arrays."""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Fingerprint the data an indicator is computed from.
+
+    Covers the row count, the timestamps and the close prices, so two frames
+    with the same fingerprint yield identical close-based indicators.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(len(df).to_bytes(8, "little"))
+    if len(df):
+        index = df.index
+        if isinstance(index, pd.DatetimeIndex):
+            digest.update(index.asi8.tobytes())
+        else:
+            digest.update(np.asarray(index, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(df["close"].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """LRU cache of indicator arrays bounded by entry count and memory.
+
+    Keys are ``(symbol, timeframe, fingerprint, indicator_key)`` tuples, so
+    strategies that evaluate the same market data share results.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> np.ndarray | None:
+        """Get a cached array and mark it as recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: np.ndarray) -> None:
+        """Store an array, evicting least recently used entries if needed."""
+        if value.nbytes > self.max_bytes:
+            return
+
+        value.setflags(write=False)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+
+            self._entries[key] = value
+            self._bytes += value.nbytes
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Cache usage statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+indicator_cache = IndicatorCache(
+    max_entries=settings.INDICATOR_CACHE_MAX_ENTRIES,
+    max_bytes=settings.INDICATOR_CACHE_SIZE_MB * 1024 * 1024,
+)
@@ -0,0 +1,155 @@
+"""Progress reporting and cancellation for long-running jobs."""
+
+import json
+import logging
+import time
+from typing import Any
+
+from app.config import settings
+from app.core.events import event_bus
+from app.core.redis import RedisClient, redis_client
+
+logger = logging.getLogger(__name__)
+
+# Statuses of jobs that can still report progress or be cancelled
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when a user has cancelled it."""
+
+
+def _key(kind: str, job_id: str, name: str) -> str:
+    return f"{kind}:{job_id}:{name}"
+
+
+async def request_cancel(kind: str, job_id: str, redis: RedisClient = redis_client) -> None:
+    """Flag a job for cancellation; it stops at its next check."""
+    await redis.set(_key(kind, job_id, "cancel"), "1", ex=settings.JOB_STATE_TTL_SECONDS)
+
+
+async def get_progress(
+    kind: str,
+    job_id: str,
+    redis: RedisClient = redis_client,
+) -> dict[str, Any] | None:
+    """Latest progress snapshot of a job, if any was reported."""
+    raw = await redis.get(_key(kind, job_id, "progress"))
+    return json.loads(raw) if raw else None
+
+
+class JobProgress:
+    """Throttled progress events and cancellation checks for one job.
+
+    Work is counted in bars (symbols while loading data). ``advance`` is
+    called as units of work (a symbol, a window, a batch of parameter sets)
+    finish; at most once per
+    ``JOB_PROGRESS_INTERVAL`` it publishes a progress event, stores a
+    snapshot in Redis for polling, and checks the job's cancellation flag.
+    Events carry the owner's ``user_id`` so they are pushed only to them.
+    Redis errors are logged and never fail the job.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        job_id: str,
+        event_type: str,
+        redis: RedisClient = redis_client,
+        interval: float = settings.JOB_PROGRESS_INTERVAL,
+        user_id: str | None = None,
+    ) -> None:
+        self.kind = kind
+        self.job_id = job_id
+        self.event_type = event_type
+        self.redis = redis
+        self.interval = interval
+        self.user_id = user_id
+        self.stage = "pending"
+        self.processed = 0
+        self.total = 0
+        self.current: str | None = None
+        self._started = time.monotonic()
+        self._last_report = float("-inf")
+
+    async def start_stage(self, stage: str, total: int = 0) -> None:
+        """Begin a new stage of ``total`` bars and report it right away."""
+        self.stage = stage
+        self.processed = 0
+        self.total = total
+        self.current = None
+        self._started = time.monotonic()
+        await self.report(force=True)
+
+    async def advance(self, bars: int, current: str | None = None) -> None:
+        """Count finished bars and report if the interval has passed.
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        self.processed += bars
+        self.current = current
+        await self.report()
+
+    async def report(self, force: bool = False) -> None:
+        """Publish progress and check for cancellation, subject to throttling.
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        now = time.monotonic()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+
+        await self.check_cancelled()
+
+        snapshot = self.snapshot(now)
+        try:
+            await self.redis.set(
+                _key(self.kind, self.job_id, "progress"),
+                json.dumps(snapshot),
+                ex=settings.JOB_STATE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store progress for {self.kind} {self.job_id}: {e}")
+        await event_bus.publish(self.event_type, {**snapshot, "user_id": self.user_id})
+
+    async def check_cancelled(self) -> None:
+        """Raise if the job's cancellation flag is set.
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        try:
+            cancelled = await self.redis.exists(_key(self.kind, self.job_id, "cancel"))
+        except Exception as e:
+            logger.warning(f"Failed to check cancellation for {self.kind} {self.job_id}: {e}")
+            return
+        if cancelled:
+            raise JobCancelled(f"{self.kind.capitalize()} {self.job_id} was cancelled")
+
+    def snapshot(self, now: float | None = None) -> dict[str, Any]:
+        """Current progress with an ETA extrapolated from the stage so far."""
+        elapsed = (now or time.monotonic()) - self._started
+        eta = None
+        if self.total and self.processed:
+            eta = round(elapsed / self.processed * (self.total - self.processed), 1)
+        return {
+            f"{self.kind}_id": self.job_id,
+            "stage": self.stage,
+            "processed": self.processed,
+            "total": self.total,
+            "percent": round(self.processed / self.total * 100, 1) if self.total else 0.0,
+            "current": self.current,
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": eta,
+        }
+
+    async def clear(self) -> None:
+        """Remove the job's progress snapshot and cancellation flag."""
+        try:
+            await self.redis.delete(_key(self.kind, self.job_id, "progress"))
+            await self.redis.delete(_key(self.kind, self.job_id, "cancel"))
+        except Exception as e:
+            logger.warning(f"Failed to clear job state for {self.kind} {self.job_id}: {e}")
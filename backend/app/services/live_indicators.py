@@ -0,0 +1,225 @@
+"""Incrementally maintained indicators for live strategy evaluation."""
+
+import json
+import logging
+from collections.abc import Iterable, Sequence
+
+from app.config import settings
+from app.core.redis import RedisClient, redis_client
+from app.services.rule_engine import BB_COMPONENTS, MACD_COMPONENTS, IndicatorSpec, parse_indicator
+from app.utils.ohlcv import OHLCV_COLUMNS, SeriesKey
+from app.utils.streaming_indicators import (
+    BollingerBandsState,
+    EMAState,
+    IndicatorState,
+    MACDState,
+    RSIState,
+    SMAState,
+    dumps_states,
+    loads_states,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def state_key(spec: IndicatorSpec) -> str | None:
+    """Name of the state backing a spec; price columns need none."""
+    if spec.kind == "column":
+        return None
+    if spec.kind in ("macd", "bb"):
+        # All components share one state
+        return spec.kind
+    return spec.key
+
+
+def create_state(spec: IndicatorSpec) -> IndicatorState:
+    """Incremental state computing the same values as the rule engine.
+
+    Raises:
+        ValueError: If the spec has no incremental state
+    """
+    if spec.kind == "sma":
+        return SMAState(spec.period or 20)
+    elif spec.kind == "ema":
+        return EMAState(spec.period or 20)
+    elif spec.kind == "rsi":
+        return RSIState(spec.period or 14)
+    elif spec.kind == "macd":
+        return MACDState()
+    elif spec.kind == "bb":
+        return BollingerBandsState(20, 2.0)
+    raise ValueError(f"No incremental state for {spec.key}")
+
+
+class LiveIndicators:
+    """Indicator states of one series, advanced one closed candle at a time.
+
+    Each state is updated in O(1) per candle. The values of every spec on
+    the latest and the previous candle are kept for rule evaluation, the
+    previous ones for the cross operators. With ``step``, the bar duration
+    in milliseconds, candles must follow each other without holes.
+    """
+
+    def __init__(self, specs: Iterable[IndicatorSpec], step: int | None = None) -> None:
+        self.specs = set(specs)
+        self.step = step
+        self.states: dict[str, IndicatorState] = {}
+        for spec in self.specs:
+            name = state_key(spec)
+            if name is not None and name not in self.states:
+                self.states[name] = create_state(spec)
+        self.timestamp: int | None = None
+        self.current: dict[str, float] = {}
+        self.previous: dict[str, float] = {}
+
+    def covers(self, specs: Iterable[IndicatorSpec]) -> bool:
+        """Whether every spec is already tracked."""
+        return self.specs.issuperset(specs)
+
+    def update(self, candle: Sequence[float]) -> None:
+        """Consume a closed ``[ts, o, h, l, c, v]`` candle."""
+        bar = dict(zip(OHLCV_COLUMNS, candle[1:6], strict=True))
+        for state in self.states.values():
+            state.update(bar)
+
+        self.previous = self.current
+        self.current = {spec.key: self._value(spec, bar) for spec in self.specs}
+        self.timestamp = int(candle[0])
+
+    def advance(self, candles: Sequence[Sequence[float]]) -> bool:
+        """Consume the candles newer than the last one seen.
+
+        Candles are in chronological order; only the new ones at the end
+        are read.
+
+        Returns:
+            False if candles after the last one seen are missing, or with
+            ``step`` if the new candles have holes, in which case nothing
+            was consumed and the states must be rebuilt
+        """
+        if self.timestamp is not None and (not candles or candles[0][0] > self.timestamp):
+            return False
+
+        new = []
+        for candle in reversed(candles):
+            if self.timestamp is not None and candle[0] <= self.timestamp:
+                break
+            new.append(candle)
+        new.reverse()
+
+        if self.step and new:
+            last = self.timestamp if self.timestamp is not None else new[0][0] - self.step
+            for candle in new:
+                if candle[0] - last != self.step:
+                    return False
+                last = candle[0]
+
+        for candle in new:
+            self.update(candle)
+        return True
+
+    def _value(self, spec: IndicatorSpec, bar: dict[str, float]) -> float:
+        if spec.kind == "column":
+            return float(bar[spec.component])  # type: ignore[index]
+
+        value = self.states[state_key(spec)].value  # type: ignore[index]
+        if spec.kind == "macd":
+            return float(value[MACD_COMPONENTS[spec.component]])  # type: ignore[index]
+        if spec.kind == "bb":
+            return float(value[BB_COMPONENTS[spec.component]])  # type: ignore[index]
+        return float(value)
+
+    def dumps(self) -> str:
+        """Serialize the states and latest values to JSON."""
+        return json.dumps(
+            {
+                "specs": sorted(spec.key for spec in self.specs),
+                "step": self.step,
+                "timestamp": self.timestamp,
+                "states": dumps_states(self.states),
+                "current": self.current,
+                "previous": self.previous,
+            }
+        )
+
+    @classmethod
+    def loads(cls, payload: str | bytes) -> "LiveIndicators":
+        """Rebuild indicators from ``dumps`` output."""
+        data = json.loads(payload)
+        indicators = cls((parse_indicator(key) for key in data["specs"]), data.get("step"))
+        indicators.states = loads_states(data["states"])
+        indicators.timestamp = data["timestamp"]
+        indicators.current = data["current"]
+        indicators.previous = data["previous"]
+        return indicators
+
+
+def contiguous_tail(
+    candles: Sequence[Sequence[float]], step: int | None
+) -> Sequence[Sequence[float]]:
+    """The candles after the last hole, all of them without ``step``."""
+    if not step or not candles:
+        return candles
+    start = len(candles) - 1
+    while start > 0 and candles[start][0] - candles[start - 1][0] == step:
+        start -= 1
+    return [candles[i] for i in range(start, len(candles))]
+
+
+def advance_indicators(
+    indicators: LiveIndicators | None,
+    specs: set[IndicatorSpec],
+    candles: Sequence[Sequence[float]],
+    step: int | None = None,
+) -> LiveIndicators:
+    """Bring indicators up to the last of ``candles``.
+
+    Existing indicators only consume the candles they have not seen. They
+    are rebuilt when missing, when they lack one of ``specs`` or when
+    candles are missing after their last one or between the new ones. A
+    rebuild starts after the last hole in ``candles``, since states fed
+    across a hole would be wrong.
+    """
+    if (
+        indicators is not None
+        and indicators.step == step
+        and indicators.covers(specs)
+        and indicators.advance(candles)
+    ):
+        return indicators
+
+    indicators = LiveIndicators(specs, step)
+    indicators.advance(contiguous_tail(candles, step))
+    return indicators
+
+
+class IndicatorStateStore:
+    """Indicator states of live series kept in Redis between restarts."""
+
+    def __init__(
+        self,
+        redis: RedisClient = redis_client,
+        ttl: int = settings.INDICATOR_STATE_TTL_SECONDS,
+    ) -> None:
+        self.redis = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(key: SeriesKey) -> str:
+        return f"indicators:{key.exchange}:{key.symbol}:{key.timeframe}"
+
+    async def load(self, key: SeriesKey) -> LiveIndicators | None:
+        """Saved indicators of a series, if any could be read."""
+        try:
+            payload = await self.redis.get(self._key(key))
+            return LiveIndicators.loads(payload) if payload else None
+        except Exception as e:
+            logger.warning(f"Failed to load indicator states for {key.symbol}: {e}")
+            return None
+
+    async def save(self, key: SeriesKey, indicators: LiveIndicators) -> None:
+        """Save the indicators of a series; errors are logged."""
+        try:
+            await self.redis.set(self._key(key), indicators.dumps(), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to save indicator states for {key.symbol}: {e}")
@@ -0,0 +1,202 @@
+"""Cached exchange market lists with a symbol search index."""
+
+import asyncio
+import json
+import logging
+import time
+from bisect import bisect_left
+from typing import Any
+
+from app.config import settings
+from app.core.exchanges import ExchangePool, exchange_pool
+from app.core.redis import RedisClient, redis_client
+
+logger = logging.getLogger(__name__)
+
+# Substrings up to this length are indexed directly; longer queries
+# intersect the postings of their n-grams.
+GRAM_SIZE = 3
+
+
+class SymbolIndex:
+    """Search index over one exchange's markets.
+
+    Symbols are kept sorted, so prefix matches are a binary search. Every
+    substring of up to ``GRAM_SIZE`` characters maps to the symbols containing
+    it, and a quote currency maps to its symbols.
+    """
+
+    def __init__(self, markets: list[dict[str, Any]], fetched_at: float | None = None) -> None:
+        self.markets = sorted(markets, key=lambda m: m["symbol"].upper())
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self._keys = [m["symbol"].upper() for m in self.markets]
+        self._by_quote: dict[str, list[int]] = {}
+        self._grams: dict[str, list[int]] = {}
+
+        for i, (key, market) in enumerate(zip(self._keys, self.markets, strict=True)):
+            self._by_quote.setdefault(market.get("quote") or "", []).append(i)
+
+            grams = {
+                key[start : start + size]
+                for size in range(1, GRAM_SIZE + 1)
+                for start in range(len(key) - size + 1)
+            }
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(i)
+
+    def search(
+        self,
+        quote_currency: str | None = None,
+        search: str | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """Find markets by quote currency and symbol substring.
+
+        Symbols starting with ``search`` come first, then other symbols
+        containing it, each in alphabetical order.
+        """
+        if search:
+            query = search.upper()
+            prefixed = self._prefix_ids(query)
+            contained = [i for i in self._substring_ids(query) if i not in prefixed]
+            ids: list[int] | range = [*prefixed, *contained]
+        elif quote_currency is not None:
+            ids = self._by_quote.get(quote_currency, [])
+        else:
+            ids = range(len(self.markets))
+
+        results = []
+        for i in ids:
+            market = self.markets[i]
+            if quote_currency and market.get("quote") != quote_currency:
+                continue
+            results.append(dict(market))
+            if len(results) >= limit:
+                break
+        return results
+
+    def _prefix_ids(self, query: str) -> range:
+        """Positions of symbols starting with ``query``."""
+        start = bisect_left(self._keys, query)
+        end = bisect_left(self._keys, query + "\U0010ffff", lo=start)
+        return range(start, end)
+
+    def _substring_ids(self, query: str) -> list[int]:
+        """Positions of symbols containing ``query``, in order."""
+        if len(query) <= GRAM_SIZE:
+            return self._grams.get(query, [])
+
+        postings = sorted(
+            (
+                self._grams.get(query[i : i + GRAM_SIZE], [])
+                for i in range(len(query) - GRAM_SIZE + 1)
+            ),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return sorted(i for i in candidates if query in self._keys[i])
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+
+class MarketCatalog:
+    """Market lists per exchange, cached in process and in Redis.
+
+    An index older than ``MARKETS_REFRESH_SECONDS`` is still served while a
+    background refresh runs. Refreshed lists are written to Redis so other
+    processes pick them up without calling the exchange.
+    """
+
+    def __init__(
+        self,
+        pool: ExchangePool = exchange_pool,
+        redis: RedisClient = redis_client,
+        refresh_seconds: int = settings.MARKETS_REFRESH_SECONDS,
+    ) -> None:
+        self.pool = pool
+        self.redis = redis
+        self.refresh_seconds = refresh_seconds
+        self._indexes: dict[str, SymbolIndex] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+
+    async def get_index(self, exchange: str) -> SymbolIndex:
+        """Get the search index for an exchange, loading it if needed."""
+        index = self._indexes.get(exchange)
+        if index is not None:
+            if self._is_stale(index) and exchange not in self._refreshing:
+                task = asyncio.create_task(self._background_refresh(exchange))
+                self._refreshing[exchange] = task
+                task.add_done_callback(lambda _: self._refreshing.pop(exchange, None))
+            return index
+
+        lock = self._locks.setdefault(exchange, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(exchange)
+            if index is None:
+                index = await self._load(exchange)
+            return index
+
+    async def refresh(self, exchange: str) -> SymbolIndex:
+        """Reload markets from the exchange and publish them to Redis."""
+        markets = await self.pool.get_markets(exchange, reload=True)
+        index = SymbolIndex(
+            [
+                {
+                    "symbol": symbol,
+                    "base": market.get("base"),
+                    "quote": market.get("quote"),
+                    "exchange": exchange,
+                    "active": market.get("active", True),
+                }
+                for symbol, market in markets.items()
+            ]
+        )
+        await self._write(exchange, index)
+        self._indexes[exchange] = index
+        logger.info(f"Refreshed {len(index)} markets for {exchange}")
+        return index
+
+    def _is_stale(self, index: SymbolIndex) -> bool:
+        return time.time() - index.fetched_at > self.refresh_seconds
+
+    async def _load(self, exchange: str) -> SymbolIndex:
+        """Load from Redis when fresh there, otherwise from the exchange."""
+        index = await self._read(exchange)
+        if index is None or self._is_stale(index):
+            return await self.refresh(exchange)
+        self._indexes[exchange] = index
+        return index
+
+    async def _background_refresh(self, exchange: str) -> None:
+        try:
+            await self._load(exchange)
+        except Exception as e:
+            logger.error(f"Failed to refresh markets for {exchange}: {e}")
+
+    async def _read(self, exchange: str) -> SymbolIndex | None:
+        try:
+            raw = await self.redis.get(f"markets:{exchange}")
+        except Exception as e:
+            logger.warning(f"Failed to read cached markets: {e}")
+            return None
+        if raw is None:
+            return None
+
+        payload = json.loads(raw)
+        return SymbolIndex(payload["markets"], fetched_at=payload["fetched_at"])
+
+    async def _write(self, exchange: str, index: SymbolIndex) -> None:
+        payload = json.dumps({"fetched_at": index.fetched_at, "markets": index.markets})
+        try:
+            await self.redis.set(f"markets:{exchange}", payload, ex=self.refresh_seconds * 24)
+        except Exception as e:
+            logger.warning(f"Failed to cache markets: {e}")
+
+
+market_catalog = MarketCatalog()
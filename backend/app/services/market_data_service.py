@@ -1,13 +1,20 @@
 """Market data service for fetching data from exchanges."""
 
-import contextlib
+import asyncio
 import logging
+from collections import deque
+from collections.abc import AsyncIterator
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
 import ccxt.async_support as ccxt
 
 from app.config import settings
+from app.core.exchanges import ExchangePool, exchange_pool
+from app.services.candle_store import CandleStore, find_gaps, subtract_ranges
+from app.services.market_catalog import MarketCatalog, market_catalog
+from app.utils.ohlcv import OHLCVFrame
 
 logger = logging.getLogger(__name__)
 
@@ -15,27 +22,19 @@ logger = logging.getLogger(__name__)
 class MarketDataService:
     """Service for fetching market data from exchanges."""
 
-    def __init__(self) -> None:
-        self._exchanges: dict[str, ccxt.Exchange] = {}
+    def __init__(
+        self,
+        candle_store: CandleStore | None = None,
+        pool: ExchangePool | None = None,
+        catalog: MarketCatalog | None = None,
+    ) -> None:
+        self.candle_store = candle_store
+        self.pool = pool or exchange_pool
+        self.catalog = catalog or market_catalog
 
     def _get_exchange(self, exchange_name: str) -> ccxt.Exchange:
-        """Get or create exchange instance."""
-        if exchange_name not in self._exchanges:
-            exchange_class = getattr(ccxt, exchange_name, None)
-            if not exchange_class:
-                raise ValueError(f"Unknown exchange: {exchange_name}")
-
-            config: dict[str, Any] = {
-                "enableRateLimit": True,
-            }
-
-            if exchange_name == "binance" and settings.BINANCE_API_KEY:
-                config["apiKey"] = settings.BINANCE_API_KEY
-                config["secret"] = settings.BINANCE_API_SECRET
-
-            self._exchanges[exchange_name] = exchange_class(config)
-
-        return self._exchanges[exchange_name]
+        """Get the pooled exchange client."""
+        return self.pool.get(exchange_name)
 
     async def get_symbols(
         self,
@@ -44,39 +43,14 @@ class MarketDataService:
         search: str | None = None,
         limit: int = 100,
     ) -> list[dict[str, Any]]:
-        """Get available trading symbols."""
+        """Get available trading symbols from the cached market index."""
         try:
-            ex = self._get_exchange(exchange)
-            await ex.load_markets()
-
-            symbols = []
-            for symbol, market in ex.markets.items():
-                if quote_currency and market.get("quote") != quote_currency:
-                    continue
-
-                if search and search.upper() not in symbol.upper():
-                    continue
-
-                symbols.append(
-                    {
-                        "symbol": symbol,
-                        "base": market.get("base"),
-                        "quote": market.get("quote"),
-                        "exchange": exchange,
-                        "active": market.get("active", True),
-                    }
-                )
-
-                if len(symbols) >= limit:
-                    break
-
-            return symbols
+            index = await self.catalog.get_index(exchange)
+            return index.search(quote_currency=quote_currency, search=search, limit=limit)
 
         except Exception as e:
             logger.error(f"Error fetching symbols: {e}")
             return []
-        finally:
-            await self._close_exchange(exchange)
 
     async def get_ohlcv(
         self,
@@ -85,46 +59,314 @@ class MarketDataService:
         timeframe: str = "1h",
         start_date: datetime | None = None,
         end_date: datetime | None = None,
-        limit: int = 500,
-    ) -> list[dict[str, Any]]:
-        """Get OHLCV candlestick data."""
+        limit: int | None = 500,
+    ) -> OHLCVFrame:
+        """Get OHLCV candlestick data as a columnar frame.
+
+        With a candle store configured, stored candles are read first and
+        only the missing ranges are fetched from the exchange. Ranges longer
+        than one exchange call are fetched page by page. ``limit=None``
+        returns the whole range from ``start_date``.
+        """
         try:
             ex = self._get_exchange(exchange)
 
-            since = int(start_date.timestamp() * 1000) if start_date else None
+            if self.candle_store is not None:
+                ohlcv = await self._get_ohlcv_with_store(
+                    self.candle_store, ex, symbol, exchange, timeframe, start_date, end_date, limit
+                )
+            elif start_date and (limit is None or limit > settings.OHLCV_PAGE_LIMIT):
+                start_ms = int(start_date.timestamp() * 1000)
+                end_ms = int(end_date.timestamp() * 1000) if end_date else ex.milliseconds()
+                if limit is not None:
+                    step_ms = ex.parse_timeframe(timeframe) * 1000
+                    end_ms = min(end_ms, start_ms + (limit - 1) * step_ms)
+
+                ohlcv = []
+                async for page in self._fetch_pages(ex, symbol, timeframe, start_ms, end_ms):
+                    ohlcv.extend(page)
+            else:
+                since = int(start_date.timestamp() * 1000) if start_date else None
+
+                ohlcv = await ex.fetch_ohlcv(
+                    symbol,
+                    timeframe=timeframe,
+                    since=since,
+                    limit=limit or settings.OHLCV_PAGE_LIMIT,
+                )
+
+            frame = OHLCVFrame.from_rows(ohlcv)
+            if end_date:
+                frame = frame.until(int(end_date.timestamp() * 1000))
+            return frame
 
-            ohlcv = await ex.fetch_ohlcv(
-                symbol,
-                timeframe=timeframe,
-                since=since,
-                limit=limit,
+        except Exception as e:
+            logger.error(f"Error fetching OHLCV: {e}")
+            raise
+
+    async def _get_ohlcv_with_store(
+        self,
+        store: CandleStore,
+        ex: ccxt.Exchange,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        start_date: datetime | None,
+        end_date: datetime | None,
+        limit: int | None,
+    ) -> list[list[Any]]:
+        """Serve candles from the store, filling gaps from the exchange."""
+        step_ms = ex.parse_timeframe(timeframe) * 1000
+        now_ms = ex.milliseconds()
+        limit = limit or 0
+
+        if start_date:
+            start_ms = int(start_date.timestamp() * 1000)
+            end_ms = int(end_date.timestamp() * 1000) if end_date else now_ms
+            if limit:
+                end_ms = min(end_ms, start_ms + (limit - 1) * step_ms)
+        else:
+            limit = limit or settings.OHLCV_PAGE_LIMIT
+            end_ms = int(end_date.timestamp() * 1000) if end_date else now_ms
+            end_ms = end_ms // step_ms * step_ms
+            start_ms = end_ms - (limit - 1) * step_ms
+        end_ms = min(end_ms, now_ms)
+
+        try:
+            stored = await store.get_candles(symbol, exchange, timeframe, start_ms, end_ms)
+        except Exception as e:
+            logger.warning(f"Candle store unavailable, fetching from exchange: {e}")
+            rows: list[list[Any]] = []
+            async for page in self._fetch_pages(ex, symbol, timeframe, start_ms, end_ms):
+                rows.extend(page)
+            return rows
+
+        rows, _ = await self._fill_gaps(
+            store, ex, symbol, exchange, timeframe, stored, start_ms, end_ms, now_ms
+        )
+        return rows[:limit] if limit else rows
+
+    async def _fill_gaps(
+        self,
+        store: CandleStore,
+        ex: ccxt.Exchange,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        stored: list[list[Any]],
+        start_ms: int,
+        end_ms: int,
+        now_ms: int,
+    ) -> tuple[list[list[Any]], int]:
+        """Complete the stored candles of a range from the exchange.
+
+        Closed ranges the exchange returns no candles for (before listing,
+        outages) are recorded as empty and not requested again.
+
+        Returns:
+            The range's candles in order and the number fetched
+        """
+        step_ms = ex.parse_timeframe(timeframe) * 1000
+        gaps = find_gaps([int(c[0]) for c in stored], start_ms, end_ms, step_ms)
+        if gaps:
+            try:
+                empty = await store.get_empty_ranges(symbol, exchange, timeframe, start_ms, end_ms)
+            except Exception as e:
+                logger.warning(f"Failed to read empty candle ranges: {e}")
+                empty = []
+            gaps = subtract_ranges(gaps, empty, step_ms)
+        if not gaps:
+            return stored, 0
+
+        candles = {int(c[0]): c for c in stored}
+        fetched = 0
+        missing: list[tuple[int, int]] = []
+        last_closed = now_ms - step_ms
+        for gap_start, gap_end in gaps:
+            received: list[int] = []
+            async for page in self._fetch_pages(ex, symbol, timeframe, gap_start, gap_end):
+                await self._store_closed(store, symbol, exchange, timeframe, page, now_ms, step_ms)
+                fetched += len(page)
+                for row in page:
+                    candles[int(row[0])] = row
+                    received.append(int(row[0]))
+            missing.extend(find_gaps(received, gap_start, min(gap_end, last_closed), step_ms))
+
+        if missing:
+            try:
+                await store.save_empty_ranges(symbol, exchange, timeframe, missing)
+            except Exception as e:
+                logger.warning(f"Failed to record empty candle ranges: {e}")
+
+        return [candles[ts] for ts in sorted(candles)], fetched
+
+    async def _filled_chunks(
+        self,
+        store: CandleStore,
+        ex: ccxt.Exchange,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> AsyncIterator[tuple[list[list[Any]], int]]:
+        """Walk a range in bounded chunks read from the store, gaps filled.
+
+        Chunks span ``OHLCV_PAGE_LIMIT * OHLCV_FETCH_CONCURRENCY * 10``
+        candles, so multi-year minute data never has to be held in memory
+        at once.
+
+        Yields:
+            Each chunk's candles in order and the number fetched for it
+        """
+        now_ms = ex.milliseconds()
+        step_ms = ex.parse_timeframe(timeframe) * 1000
+        end_ms = min(end_ms, now_ms)
+        chunk_ms = settings.OHLCV_PAGE_LIMIT * settings.OHLCV_FETCH_CONCURRENCY * 10 * step_ms
+
+        for chunk_start in range(start_ms, end_ms + 1, chunk_ms):
+            chunk_end = min(chunk_start + chunk_ms - 1, end_ms)
+            stored = await store.get_candles(symbol, exchange, timeframe, chunk_start, chunk_end)
+            yield await self._fill_gaps(
+                store, ex, symbol, exchange, timeframe, stored, chunk_start, chunk_end, now_ms
             )
 
-            data = []
-            for candle in ohlcv:
-                timestamp = datetime.fromtimestamp(candle[0] / 1000)
+    async def stream_ohlcv(
+        self,
+        symbol: str,
+        exchange: str = "binance",
+        timeframe: str = "1h",
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> AsyncIterator[list[list[Any]]]:
+        """Stream a historical range page by page.
+
+        Pages are ``[ts, open, high, low, close, volume]`` rows in
+        chronological order, at most ``OHLCV_PAGE_LIMIT`` each. With a candle
+        store, the range is read from the store in bounded chunks and only
+        the candles missing from it are fetched and stored, so repeated runs
+        do not download the range again. Without one, pages come from the
+        exchange with several in flight (bounded by
+        ``OHLCV_FETCH_CONCURRENCY``), spaced by ccxt's rate limiter. Memory
+        stays flat regardless of the range length.
+        """
+        ex = self._get_exchange(exchange)
+        now_ms = ex.milliseconds()
+        start_ms = int(start_date.timestamp() * 1000) if start_date else 0
+        end_ms = min(int(end_date.timestamp() * 1000), now_ms) if end_date else now_ms
+
+        if self.candle_store is None:
+            async for page in self._fetch_pages(ex, symbol, timeframe, start_ms, end_ms):
+                yield page
+            return
+
+        page_limit = settings.OHLCV_PAGE_LIMIT
+        async for rows, _ in self._filled_chunks(
+            self.candle_store, ex, symbol, exchange, timeframe, start_ms, end_ms
+        ):
+            for offset in range(0, len(rows), page_limit):
+                yield rows[offset : offset + page_limit]
+
+    async def load_history(
+        self,
+        symbol: str,
+        exchange: str = "binance",
+        timeframe: str = "1h",
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> int:
+        """Fill the candle store for a range, fetching only what is missing.
+
+        The range is processed in bounded chunks so multi-year minute data
+        never has to be held in memory at once.
+
+        Returns:
+            Number of candles fetched from the exchange
+        """
+        if self.candle_store is None:
+            raise RuntimeError("Candle store required")
+
+        ex = self._get_exchange(exchange)
+        start_ms = int(start_date.timestamp() * 1000) if start_date else 0
+        end_ms = int(end_date.timestamp() * 1000) if end_date else ex.milliseconds()
+
+        fetched = 0
+        async for _rows, count in self._filled_chunks(
+            self.candle_store, ex, symbol, exchange, timeframe, start_ms, end_ms
+        ):
+            fetched += count
+
+        logger.info(f"Loaded {fetched} candles for {exchange}:{symbol} {timeframe}")
+        return fetched
 
-                if end_date and timestamp > end_date:
+    async def _fetch_pages(
+        self,
+        ex: ccxt.Exchange,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> AsyncIterator[list[list[Any]]]:
+        """Fetch ``[start_ms, end_ms]`` in pages, yielding them in order.
+
+        The range is split into windows of ``OHLCV_PAGE_LIMIT`` candles and
+        up to ``OHLCV_FETCH_CONCURRENCY`` windows are requested at once. A
+        window keeps walking ``since`` forward when the exchange caps a call
+        below the page size.
+        """
+        step_ms = ex.parse_timeframe(timeframe) * 1000
+        page_limit = settings.OHLCV_PAGE_LIMIT
+        first = -(-start_ms // step_ms) * step_ms
+        window_ms = page_limit * step_ms
+
+        async def fetch_window(since: int) -> list[list[Any]]:
+            window_end = min(since + window_ms - step_ms, end_ms)
+            rows: list[list[Any]] = []
+            cursor = since
+            while cursor <= window_end:
+                count = min(page_limit, (window_end - cursor) // step_ms + 1)
+                page = await ex.fetch_ohlcv(symbol, timeframe=timeframe, since=cursor, limit=count)
+                page = [row for row in page if cursor <= row[0] <= window_end]
+                if not page:
                     break
+                rows.extend(page)
+                cursor = int(page[-1][0]) + step_ms
+            return rows
 
-                data.append(
-                    {
-                        "timestamp": timestamp,
-                        "open": candle[1],
-                        "high": candle[2],
-                        "low": candle[3],
-                        "close": candle[4],
-                        "volume": candle[5],
-                    }
-                )
+        windows = iter(range(first, end_ms + 1, window_ms))
+        pending: deque[asyncio.Task[list[list[Any]]]] = deque(
+            asyncio.create_task(fetch_window(since))
+            for since in islice(windows, settings.OHLCV_FETCH_CONCURRENCY)
+        )
 
-            return data
+        try:
+            while pending:
+                rows = await pending.popleft()
+                since = next(windows, None)
+                if since is not None:
+                    pending.append(asyncio.create_task(fetch_window(since)))
+                if rows:
+                    yield rows
+        finally:
+            for task in pending:
+                task.cancel()
 
+    async def _store_closed(
+        self,
+        store: CandleStore,
+        symbol: str,
+        exchange: str,
+        timeframe: str,
+        rows: list[list[Any]],
+        now_ms: int,
+        step_ms: int,
+    ) -> None:
+        """Persist closed candles; the still-forming candle is never stored."""
+        closed = [row for row in rows if row[0] + step_ms <= now_ms]
+        try:
+            await store.save_candles(symbol, exchange, timeframe, closed)
         except Exception as e:
-            logger.error(f"Error fetching OHLCV: {e}")
-            raise
-        finally:
-            await self._close_exchange(exchange)
+            logger.warning(f"Failed to store candles: {e}")
 
     async def get_ticker(
         self,
@@ -154,8 +396,6 @@ class MarketDataService:
         except Exception as e:
             logger.error(f"Error fetching ticker: {e}")
             raise
-        finally:
-            await self._close_exchange(exchange)
 
     async def get_orderbook(
         self,
@@ -182,8 +422,6 @@ class MarketDataService:
         except Exception as e:
             logger.error(f"Error fetching orderbook: {e}")
             raise
-        finally:
-            await self._close_exchange(exchange)
 
     async def get_trades(
         self,
@@ -214,18 +452,3 @@ class MarketDataService:
         except Exception as e:
             logger.error(f"Error fetching trades: {e}")
             raise
-        finally:
-            await self._close_exchange(exchange)
-
-    async def _close_exchange(self, exchange_name: str) -> None:
-        """Close exchange connection."""
-        if exchange_name in self._exchanges:
-            # Silently ignore errors when closing exchange connections
-            with contextlib.suppress(Exception):
-                await self._exchanges[exchange_name].close()
-
-    async def close_all(self) -> None:
-        """Close all exchange connections."""
-        for name in list(self._exchanges.keys()):
-            await self._close_exchange(name)
-        self._exchanges.clear()
@@ -0,0 +1,290 @@
+"""Parameter sweeps over strategy rules."""
+
+import copy
+import itertools
+import logging
+import math
+import random
+import re
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.optimization import Optimization
+from app.models.strategy import Strategy
+from app.services.backtest_engine import (
+    OBJECTIVES,
+    evaluate_shared_batch,
+    map_in_workers,
+    share_with_workers,
+)
+from app.services.backtest_service import BacktestService
+from app.services.job_control import JobCancelled, JobProgress
+
+logger = logging.getLogger(__name__)
+
+PARAMETER_ROOTS = ("rules", "exit_rules")
+
+_PERIOD_SUFFIX = re.compile(r"\d+$")
+
+
+def parameter_values(spec: dict[str, Any]) -> list[Any]:
+    """List the candidate values of one parameter.
+
+    A parameter gives either explicit ``values`` or an inclusive
+    ``min``/``max``/``step`` range.
+    """
+    if spec.get("values") is not None:
+        return list(spec["values"])
+
+    low, high, step = spec["min"], spec["max"], spec["step"]
+    count = math.floor((high - low) / step + 1e-9) + 1
+    values = [low + i * step for i in range(count)]
+    if all(isinstance(v, int) for v in (low, high, step)):
+        return values
+    return [round(v, 10) for v in values]
+
+
+def count_combinations(
+    parameters: list[dict[str, Any]],
+    method: str = "grid",
+    samples: int | None = None,
+) -> int:
+    """Number of parameter sets a sweep will evaluate."""
+    total = math.prod(len(parameter_values(p)) for p in parameters)
+    if method == "random":
+        return min(samples or total, total)
+    return total
+
+
+def iter_combinations(
+    parameters: list[dict[str, Any]],
+    method: str = "grid",
+    samples: int | None = None,
+    seed: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield parameter sets as ``{path: value}`` dicts.
+
+    ``grid`` yields the full cartesian product; ``random`` draws ``samples``
+    distinct sets from it.
+    """
+    paths = [p["path"] for p in parameters]
+    values = [parameter_values(p) for p in parameters]
+
+    if method != "random":
+        for combination in itertools.product(*values):
+            yield dict(zip(paths, combination, strict=True))
+        return
+
+    rng = random.Random(seed)
+    target = count_combinations(parameters, method, samples)
+    seen: set[tuple[int, ...]] = set()
+    while len(seen) < target:
+        picks = tuple(rng.randrange(len(options)) for options in values)
+        if picks in seen:
+            continue
+        seen.add(picks)
+        yield {
+            path: options[pick] for path, options, pick in zip(paths, values, picks, strict=True)
+        }
+
+
+def apply_parameters(
+    rules: dict[str, Any],
+    exit_rules: list[dict[str, Any]] | None,
+    parameters: dict[str, Any],
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Copy a strategy's rules with parameter values substituted.
+
+    Paths are dotted, starting at ``rules`` or ``exit_rules`` and using
+    integers for list positions, e.g. ``rules.conditions.0.value``. A number
+    assigned to an indicator name such as ``sma_20`` or ``$sma_20`` replaces
+    its period.
+
+    Raises:
+        ValueError: If a path does not exist in the rules
+    """
+    documents: dict[str, Any] = {
+        "rules": copy.deepcopy(rules),
+        "exit_rules": copy.deepcopy(exit_rules or []),
+    }
+
+    for path, value in parameters.items():
+        root, *parts = path.split(".")
+        if root not in documents or not parts:
+            raise ValueError(f"Invalid parameter path: {path}")
+
+        try:
+            container: Any = documents[root]
+            for part in parts[:-1]:
+                container = container[int(part) if isinstance(container, list) else part]
+            key: Any = int(parts[-1]) if isinstance(container, list) else parts[-1]
+            current = container[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Invalid parameter path: {path}") from None
+
+        if (
+            isinstance(current, str)
+            and isinstance(value, int | float)
+            and not isinstance(value, bool)
+            and _PERIOD_SUFFIX.search(current)
+        ):
+            value = _PERIOD_SUFFIX.sub(str(int(value)), current)
+        container[key] = value
+
+    return documents["rules"], documents["exit_rules"]
+
+
+def rank_results(
+    combinations: list[dict[str, Any]],
+    summaries: list[dict[str, Any]],
+    objective: str,
+) -> list[dict[str, Any]]:
+    """Order sweep results from best to worst by an objective."""
+    maximize = OBJECTIVES[objective]
+    rows = [
+        {"parameters": combination, **summary}
+        for combination, summary in zip(combinations, summaries, strict=True)
+    ]
+    rows.sort(key=lambda row: row[objective], reverse=maximize)
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+
+class OptimizationService:
+    """Service for running parameter sweeps."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_owner_id(self, optimization_id: str) -> str | None:
+        """ID of the user owning an optimization's strategy."""
+        result = await self.db.execute(
+            select(Strategy.user_id)
+            .join(Optimization, Optimization.strategy_id == Strategy.id)
+            .where(Optimization.id == optimization_id)
+        )
+        user_id = result.scalar_one_or_none()
+        return str(user_id) if user_id else None
+
+    async def run_optimization(
+        self,
+        optimization_id: str,
+        progress: JobProgress | None = None,
+    ) -> dict[str, Any]:
+        """Run a sweep and store its ranked results.
+
+        With ``progress``, the sweep reports its progress and stops with
+        ``JobCancelled`` (status ``cancelled``) once the user cancels it.
+        """
+        result = await self.db.execute(
+            select(Optimization).where(Optimization.id == optimization_id)
+        )
+        optimization = result.scalar_one_or_none()
+
+        if not optimization:
+            raise ValueError(f"Optimization not found: {optimization_id}")
+
+        strategy = await self.db.scalar(
+            select(Strategy).where(Strategy.id == optimization.strategy_id)
+        )
+
+        if not strategy:
+            raise ValueError(f"Strategy not found: {optimization.strategy_id}")
+
+        try:
+            if progress is not None:
+                await progress.check_cancelled()
+
+            optimization.status = "running"
+            await self.db.flush()
+
+            rows = await self._execute(optimization, strategy, progress)
+
+            optimization.status = "completed"
+            optimization.completed_at = datetime.now(UTC)
+            optimization.completed_combinations = len(rows)
+            optimization.results = rows
+            optimization.best_parameters = rows[0]["parameters"] if rows else None
+            await self.db.flush()
+
+            logger.info(f"Optimization completed: {optimization_id} ({len(rows)} combinations)")
+            return {"total_combinations": len(rows), "best": rows[0] if rows else None}
+
+        except JobCancelled as e:
+            optimization.status = "cancelled"
+            optimization.error_message = str(e)
+            await self.db.flush()
+            logger.info(f"Optimization cancelled: {optimization_id}")
+            raise
+
+        except Exception as e:
+            optimization.status = "failed"
+            optimization.error_message = str(e)
+            await self.db.flush()
+            logger.error(f"Optimization failed: {optimization_id} - {e}")
+            raise
+
+    async def _execute(
+        self,
+        optimization: Optimization,
+        strategy: Strategy,
+        progress: JobProgress | None = None,
+    ) -> list[dict[str, Any]]:
+        """Evaluate every parameter set on data loaded once."""
+        combinations = list(
+            iter_combinations(
+                optimization.parameters,
+                optimization.method,
+                optimization.samples,
+                optimization.seed,
+            )
+        )
+        variants = [
+            apply_parameters(strategy.rules, strategy.exit_rules, combination)
+            for combination in combinations
+        ]
+
+        datasets = await BacktestService(self.db).load_datasets(
+            optimization.symbols,
+            optimization.start_date,
+            optimization.end_date,
+            optimization.timeframe,
+            progress,
+        )
+
+        allocation = float(optimization.initial_capital) / max(len(optimization.symbols), 1)
+        idle_sleeves = max(len(optimization.symbols), 1) - len(datasets)
+
+        batch_size = settings.OPTIMIZATION_BATCH_SIZE
+        batches = [variants[i : i + batch_size] for i in range(0, len(variants), batch_size)]
+        arguments = {
+            "datasets": datasets,
+            "timeframe": optimization.timeframe,
+            "allocation": allocation,
+            "idle_sleeves": idle_sleeves,
+        }
+        on_done = None
+        if progress is not None:
+            bars = sum(len(data) for data in datasets)
+            await progress.start_stage("evaluating", bars * len(variants))
+
+            async def on_done(i: int, summaries: list[dict[str, Any]]) -> None:
+                await progress.advance(
+                    bars * len(batches[i]), current=f"batch {i + 1}/{len(batches)}"
+                )
+
+        # The data is sent to each worker once; batches only carry variants
+        with share_with_workers(arguments, len(batches)) as (key, executor):
+            results = await map_in_workers(
+                partial(evaluate_shared_batch, key=key), batches, on_done, executor
+            )
+        summaries = [summary for batch in results for summary in batch]
+
+        return rank_results(combinations, summaries, optimization.objective)
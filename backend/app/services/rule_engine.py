@@ -1,10 +1,14 @@
 """Rule engine for evaluating trading conditions."""
 
 import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from app.services.indicator_cache import IndicatorCache, frame_fingerprint, indicator_cache
 from app.utils.indicators import (
     calculate_bollinger_bands,
     calculate_ema,
@@ -15,18 +19,108 @@ from app.utils.indicators import (
 
 logger = logging.getLogger(__name__)
 
+PRICE_COLUMNS = ("close", "open", "high", "low", "volume")
+MACD_COMPONENTS = {"line": "macd", "signal": "signal", "histogram": "histogram"}
+BB_COMPONENTS = {"upper": "upper", "middle": "middle", "lower": "lower"}
+
+
+@dataclass(frozen=True, slots=True)
+class IndicatorSpec:
+    """Resolved reference to a price column or indicator output."""
+
+    key: str
+    kind: str
+    period: int | None = None
+    component: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledCondition:
+    """A condition with its indicator, operator and operand pre-resolved."""
+
+    condition: dict[str, Any]
+    operator: str = ""
+    left: IndicatorSpec | None = None
+    right: IndicatorSpec | None = None
+    threshold: float | None = None
+    error: str | None = None
+
+    @property
+    def is_cross(self) -> bool:
+        """Whether the operator compares against the previous bar."""
+        return self.operator in RuleEngine.CROSS_OPERATORS
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    """Executable plan for one rule definition."""
+
+    source: dict[str, Any]
+    conditions: tuple[CompiledCondition, ...]
+    logic: str = "and"
+
+    @property
+    def specs(self) -> set[IndicatorSpec]:
+        """All indicator specs referenced by the rule."""
+        specs: set[IndicatorSpec] = set()
+        for condition in self.conditions:
+            if condition.left is not None:
+                specs.add(condition.left)
+            if condition.right is not None:
+                specs.add(condition.right)
+        return specs
+
+
+def parse_indicator(indicator_name: str) -> IndicatorSpec:
+    """Parse an indicator name such as ``sma_20`` or ``macd_signal``.
+
+    Raises:
+        ValueError: If the indicator or its parameters are not recognised
+    """
+    name = indicator_name.lower()
+    parts = name.split("_")
+    base_indicator = parts[0]
+
+    if base_indicator in PRICE_COLUMNS:
+        return IndicatorSpec(key=base_indicator, kind="column", component=base_indicator)
+    elif base_indicator in ("sma", "ema", "rsi"):
+        default_period = 14 if base_indicator == "rsi" else 20
+        period = int(parts[1]) if len(parts) > 1 else default_period
+        if period < 1:
+            raise ValueError(f"Invalid period for {indicator_name}")
+        return IndicatorSpec(key=f"{base_indicator}_{period}", kind=base_indicator, period=period)
+    elif base_indicator == "macd":
+        component = parts[1] if len(parts) > 1 else "line"
+        if component not in MACD_COMPONENTS:
+            raise ValueError(f"Unknown MACD component: {component}")
+        return IndicatorSpec(key=f"macd_{component}", kind="macd", component=component)
+    elif base_indicator == "bb":
+        component = parts[1] if len(parts) > 1 else "middle"
+        if component not in BB_COMPONENTS:
+            raise ValueError(f"Unknown Bollinger Bands component: {component}")
+        return IndicatorSpec(key=f"bb_{component}", kind="bb", component=component)
+    else:
+        raise ValueError(f"Unknown indicator: {indicator_name}")
+
 
 class RuleEngine:
     """Engine for evaluating trading rules against market data."""
 
-    OPERATORS = {
+    OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
         "gt": lambda a, b: a > b,
         "lt": lambda a, b: a < b,
         "eq": lambda a, b: a == b,
         "gte": lambda a, b: a >= b,
         "lte": lambda a, b: a <= b,
-        "crosses_above": lambda current, prev, threshold: prev <= threshold < current,
-        "crosses_below": lambda current, prev, threshold: prev >= threshold > current,
+    }
+
+    CROSS_OPERATORS: dict[str, Callable[[Any, Any, Any, Any], Any]] = {
+        "crosses_above": lambda prev, prev_threshold, current, threshold: (
+            (prev <= prev_threshold) & (current > threshold)
+        ),
+        "crosses_below": lambda prev, prev_threshold, current, threshold: (
+            (prev >= prev_threshold) & (current < threshold)
+        ),
     }
 
     INDICATOR_FUNCTIONS = {
@@ -37,37 +131,138 @@ class RuleEngine:
         "bollinger_bands": calculate_bollinger_bands,
     }
 
-    def __init__(self) -> None:
-        self._indicators_cache: dict[str, pd.Series] = {}
+    def __init__(self, cache: IndicatorCache | None = None) -> None:
+        self._shared_cache = cache if cache is not None else indicator_cache
+        self._indicators_cache: dict[str, np.ndarray] = {}
+        self._bound_frame: pd.DataFrame | None = None
+        self._bound_length = 0
+        self._data_key: tuple[str | None, str | None, str] | None = None
+
+    def compile(self, rules: dict[str, Any] | CompiledRule) -> CompiledRule:
+        """Compile a rule definition into an executable plan.
+
+        Indicator names, operators and ``$`` references are resolved once so
+        evaluation only performs array lookups. Invalid conditions compile to
+        a plan that reports the error and never passes.
+
+        Args:
+            rules: Rule definition containing conditions and logic
+
+        Returns:
+            Compiled rule plan
+        """
+        if isinstance(rules, CompiledRule):
+            return rules
+
+        rules = rules or {}
+        conditions = tuple(
+            self._compile_condition(condition) for condition in rules.get("conditions", [])
+        )
+        return CompiledRule(source=rules, conditions=conditions, logic=rules.get("logic", "and"))
+
+    def compile_many(
+        self,
+        rules: list[dict[str, Any]] | list[CompiledRule] | None,
+    ) -> list[CompiledRule]:
+        """Compile a list of rule definitions (entry or exit rules)."""
+        return [self.compile(rule) for rule in rules or []]
+
+    def _compile_condition(self, condition: dict[str, Any]) -> CompiledCondition:
+        """Resolve a single condition."""
+        operator = condition.get("operator", "")
+        value = condition.get("value")
+
+        try:
+            if operator not in self.OPERATORS and operator not in self.CROSS_OPERATORS:
+                raise ValueError(f"Unknown operator: {operator}")
+
+            left = parse_indicator(condition.get("indicator", ""))
+
+            if isinstance(value, str) and value.startswith("$"):
+                return CompiledCondition(
+                    condition=condition,
+                    operator=operator,
+                    left=left,
+                    right=parse_indicator(value[1:]),
+                )
+
+            return CompiledCondition(
+                condition=condition,
+                operator=operator,
+                left=left,
+                threshold=float(value),  # type: ignore[arg-type]
+            )
+        except Exception as e:
+            return CompiledCondition(condition=condition, operator=operator, error=str(e))
 
     def evaluate_rules(
         self,
-        rules: dict[str, Any],
+        rules: dict[str, Any] | CompiledRule,
         df: pd.DataFrame,
         index: int = -1,
     ) -> dict[str, Any]:
         """Evaluate trading rules against market data.
 
         Args:
-            rules: Rule definition containing conditions and logic
+            rules: Rule definition or compiled plan
             df: DataFrame with OHLCV data
             index: Index to evaluate at (-1 for latest)
 
         Returns:
             Dictionary with signal type and details
         """
-        if not rules or "conditions" not in rules:
+        plan = self.compile(rules)
+        if "conditions" not in plan.source:
             return {"signal": None, "details": []}
 
-        conditions = rules.get("conditions", [])
-        logic = rules.get("logic", "and")
+        self._bind(df)
+        position = index if index >= 0 else len(df) + index
+
+        results = [
+            self._evaluate_condition(condition, df, position) for condition in plan.conditions
+        ]
+
+        if plan.logic == "and":
+            signal = all(r["passed"] for r in results)
+        else:  # or
+            signal = any(r["passed"] for r in results)
+
+        return {
+            "signal": "entry" if signal else None,
+            "passed": signal,
+            "details": results,
+        }
+
+    def evaluate_latest(
+        self,
+        rules: dict[str, Any] | CompiledRule,
+        current: Mapping[str, float],
+        previous: Mapping[str, float],
+    ) -> dict[str, Any]:
+        """Evaluate trading rules on precomputed values of the latest bar.
+
+        For incrementally maintained indicators, where only the values of
+        the latest and the previous bar are known. Results match
+        ``evaluate_rules`` at the last row.
+
+        Args:
+            rules: Rule definition or compiled plan
+            current: Values keyed by indicator spec key on the latest bar
+            previous: Same values on the bar before, for cross operators
+
+        Returns:
+            Dictionary with signal type and details
+        """
+        plan = self.compile(rules)
+        if "conditions" not in plan.source:
+            return {"signal": None, "details": []}
 
-        results = []
-        for condition in conditions:
-            result = self._evaluate_condition(condition, df, index)
-            results.append(result)
+        results = [
+            self._evaluate_latest_condition(condition, current, previous)
+            for condition in plan.conditions
+        ]
 
-        if logic == "and":
+        if plan.logic == "and":
             signal = all(r["passed"] for r in results)
         else:  # or
             signal = any(r["passed"] for r in results)
@@ -78,110 +273,273 @@ class RuleEngine:
             "details": results,
         }
 
+    def _evaluate_latest_condition(
+        self,
+        condition: CompiledCondition,
+        current: Mapping[str, float],
+        previous: Mapping[str, float],
+    ) -> dict[str, Any]:
+        """Evaluate a single compiled condition on precomputed values."""
+        if condition.error is not None:
+            logger.error(f"Error evaluating condition: {condition.error}")
+            return {
+                "condition": condition.condition,
+                "error": condition.error,
+                "passed": False,
+            }
+
+        try:
+            left = condition.left.key  # type: ignore[union-attr]
+            indicator_value = float(current[left])
+            if condition.right is not None:
+                compare_value = float(current[condition.right.key])
+            else:
+                compare_value = condition.threshold  # type: ignore[assignment]
+
+            if condition.is_cross:
+                if not previous:
+                    passed = False
+                else:
+                    prev_compare = (
+                        float(previous[condition.right.key])
+                        if condition.right is not None
+                        else compare_value
+                    )
+                    passed = bool(
+                        self.CROSS_OPERATORS[condition.operator](
+                            float(previous[left]),
+                            prev_compare,
+                            indicator_value,
+                            compare_value,
+                        )
+                    )
+            else:
+                passed = bool(self.OPERATORS[condition.operator](indicator_value, compare_value))
+
+            return {
+                "condition": condition.condition,
+                "indicator_value": indicator_value,
+                "passed": passed,
+            }
+        except Exception as e:
+            logger.error(f"Error evaluating condition: {e}")
+            return {
+                "condition": condition.condition,
+                "error": str(e),
+                "passed": False,
+            }
+
     def _evaluate_condition(
         self,
-        condition: dict[str, Any],
+        condition: CompiledCondition,
         df: pd.DataFrame,
-        index: int,
+        position: int,
     ) -> dict[str, Any]:
-        """Evaluate a single condition."""
-        indicator_name = condition.get("indicator", "").lower()
-        operator = condition.get("operator", "")
-        value = condition.get("value")
+        """Evaluate a single compiled condition at a row position."""
+        if condition.error is not None:
+            logger.error(f"Error evaluating condition: {condition.error}")
+            return {
+                "condition": condition.condition,
+                "error": condition.error,
+                "passed": False,
+            }
 
         try:
-            indicator_value = self._get_indicator_value(indicator_name, df, index)
+            values = self.get_indicator_values(condition.left, df)  # type: ignore[arg-type]
+            indicator_value = float(values[position])
 
-            if operator in ("crosses_above", "crosses_below"):
-                prev_value = self._get_indicator_value(indicator_name, df, index - 1)
-                threshold = float(value) if isinstance(value, (int, float, str)) else value
-                passed = self.OPERATORS[operator](indicator_value, prev_value, threshold)
+            if condition.right is not None:
+                compare_values = self.get_indicator_values(condition.right, df)
+                compare_value = float(compare_values[position])
             else:
-                if isinstance(value, str) and value.startswith("$"):
-                    compare_value = self._get_indicator_value(value[1:], df, index)
+                compare_value = condition.threshold  # type: ignore[assignment]
+
+            if condition.is_cross:
+                if position < 1:
+                    passed = False
                 else:
-                    compare_value = float(value)
-                passed = self.OPERATORS[operator](indicator_value, compare_value)
+                    prev_compare = (
+                        float(compare_values[position - 1])
+                        if condition.right is not None
+                        else compare_value
+                    )
+                    passed = bool(
+                        self.CROSS_OPERATORS[condition.operator](
+                            float(values[position - 1]),
+                            prev_compare,
+                            indicator_value,
+                            compare_value,
+                        )
+                    )
+            else:
+                passed = bool(self.OPERATORS[condition.operator](indicator_value, compare_value))
 
             return {
-                "condition": condition,
+                "condition": condition.condition,
                 "indicator_value": indicator_value,
                 "passed": passed,
             }
         except Exception as e:
             logger.error(f"Error evaluating condition: {e}")
             return {
-                "condition": condition,
+                "condition": condition.condition,
                 "error": str(e),
                 "passed": False,
             }
 
-    def _get_indicator_value(
+    def evaluate_signals(
+        self,
+        rules: dict[str, Any] | CompiledRule,
+        df: pd.DataFrame,
+    ) -> np.ndarray:
+        """Evaluate trading rules over every bar at once.
+
+        Element ``i`` equals ``evaluate_rules(rules, df, i)["passed"]``.
+
+        Args:
+            rules: Rule definition or compiled plan
+            df: DataFrame with OHLCV data
+
+        Returns:
+            Boolean array with one entry per row of ``df``
+        """
+        plan = self.compile(rules)
+        if "conditions" not in plan.source:
+            return np.zeros(len(df), dtype=bool)
+
+        self._bind(df)
+        masks = [self._condition_mask(condition, df) for condition in plan.conditions]
+
+        if not masks:
+            return np.ones(len(df), dtype=bool)
+        if plan.logic == "and":
+            return np.asarray(np.logical_and.reduce(masks))
+        return np.asarray(np.logical_or.reduce(masks))
+
+    def evaluate_any_signals(
+        self,
+        rules: list[dict[str, Any]] | list[CompiledRule],
+        df: pd.DataFrame,
+    ) -> np.ndarray:
+        """Vectorized entry/exit rule lists: true where any rule passes."""
+        signals = np.zeros(len(df), dtype=bool)
+        for rule in rules:
+            signals |= self.evaluate_signals(rule, df)
+        return signals
+
+    def _condition_mask(self, condition: CompiledCondition, df: pd.DataFrame) -> np.ndarray:
+        """Evaluate a single compiled condition over every bar."""
+        if condition.error is not None:
+            logger.error(f"Error evaluating condition: {condition.error}")
+            return np.zeros(len(df), dtype=bool)
+
+        try:
+            values = self.get_indicator_values(condition.left, df)  # type: ignore[arg-type]
+
+            if condition.right is not None:
+                compare: np.ndarray | float = self.get_indicator_values(condition.right, df)
+            else:
+                compare = condition.threshold  # type: ignore[assignment]
+
+            with np.errstate(invalid="ignore"):
+                if not condition.is_cross:
+                    return np.asarray(self.OPERATORS[condition.operator](values, compare))
+
+                mask = np.zeros(len(df), dtype=bool)
+                if len(df) > 1:
+                    current: np.ndarray | float
+                    prev: np.ndarray | float
+                    if isinstance(compare, np.ndarray):
+                        current, prev = compare[1:], compare[:-1]
+                    else:
+                        current = prev = compare
+                    mask[1:] = self.CROSS_OPERATORS[condition.operator](
+                        values[:-1], prev, values[1:], current
+                    )
+                return mask
+        except Exception as e:
+            logger.error(f"Error evaluating condition: {e}")
+            return np.zeros(len(df), dtype=bool)
+
+    def bind(
         self,
-        indicator_name: str,
         df: pd.DataFrame,
-        index: int,
-    ) -> float:
-        """Get indicator value at specified index."""
-        parts = indicator_name.split("_")
-        base_indicator = parts[0]
-
-        if base_indicator == "close":
-            return float(df["close"].iloc[index])
-        elif base_indicator == "open":
-            return float(df["open"].iloc[index])
-        elif base_indicator == "high":
-            return float(df["high"].iloc[index])
-        elif base_indicator == "low":
-            return float(df["low"].iloc[index])
-        elif base_indicator == "volume":
-            return float(df["volume"].iloc[index])
-        elif base_indicator == "sma":
-            period = int(parts[1]) if len(parts) > 1 else 20
-            cache_key = f"sma_{period}"
-            if cache_key not in self._indicators_cache:
-                self._indicators_cache[cache_key] = calculate_sma(df["close"], period)
-            return float(self._indicators_cache[cache_key].iloc[index])
-        elif base_indicator == "ema":
-            period = int(parts[1]) if len(parts) > 1 else 20
-            cache_key = f"ema_{period}"
-            if cache_key not in self._indicators_cache:
-                self._indicators_cache[cache_key] = calculate_ema(df["close"], period)
-            return float(self._indicators_cache[cache_key].iloc[index])
-        elif base_indicator == "rsi":
-            period = int(parts[1]) if len(parts) > 1 else 14
-            cache_key = f"rsi_{period}"
-            if cache_key not in self._indicators_cache:
-                self._indicators_cache[cache_key] = calculate_rsi(df["close"], period)
-            return float(self._indicators_cache[cache_key].iloc[index])
-        elif base_indicator == "macd":
-            component = parts[1] if len(parts) > 1 else "line"
-            cache_key = "macd"
-            if cache_key not in self._indicators_cache:
-                result = calculate_macd(df["close"])
-                self._indicators_cache["macd_line"] = result["macd"]
-                self._indicators_cache["macd_signal"] = result["signal"]
-                self._indicators_cache["macd_histogram"] = result["histogram"]
-            return float(self._indicators_cache[f"macd_{component}"].iloc[index])
-        elif base_indicator == "bb":
-            component = parts[1] if len(parts) > 1 else "middle"
-            cache_key = "bb"
-            if cache_key not in self._indicators_cache:
-                result = calculate_bollinger_bands(df["close"])
-                self._indicators_cache["bb_upper"] = result["upper"]
-                self._indicators_cache["bb_middle"] = result["middle"]
-                self._indicators_cache["bb_lower"] = result["lower"]
-            return float(self._indicators_cache[f"bb_{component}"].iloc[index])
+        symbol: str | None = None,
+        timeframe: str | None = None,
+    ) -> None:
+        """Bind the engine to a DataFrame before evaluating rules on it.
+
+        Indicators are then looked up in the shared cache under the symbol,
+        timeframe and a fingerprint of the data. Evaluating an unbound frame
+        binds it implicitly without symbol context.
+        """
+        self._indicators_cache.clear()
+        self._bound_frame = df
+        self._bound_length = len(df)
+        self._data_key = (symbol, timeframe, frame_fingerprint(df))
+
+    def _bind(self, df: pd.DataFrame) -> None:
+        """Rebind when evaluating a different DataFrame."""
+        if len(df) != self._bound_length or df is not self._bound_frame:
+            self.bind(df)
+
+    def get_indicator_values(self, spec: IndicatorSpec, df: pd.DataFrame) -> np.ndarray:
+        """Get the full value array for an indicator spec, computing it once."""
+        if spec.key in self._indicators_cache:
+            return self._indicators_cache[spec.key]
+
+        if spec.kind == "column":
+            self._indicators_cache.update(self._calculate(spec, df))
+            return self._indicators_cache[spec.key]
+
+        shared_key = (*self._data_key, spec.key)  # type: ignore[misc]
+        values = self._shared_cache.get(shared_key)
+        if values is None:
+            for key, computed in self._calculate(spec, df).items():
+                self._shared_cache.set((*self._data_key, key), computed)  # type: ignore[misc]
+                self._indicators_cache[key] = computed
+            values = self._indicators_cache[spec.key]
+
+        self._indicators_cache[spec.key] = values
+        return values
+
+    def _calculate(self, spec: IndicatorSpec, df: pd.DataFrame) -> dict[str, np.ndarray]:
+        """Calculate an indicator and return arrays keyed by spec key."""
+        close = df["close"]
+
+        if spec.kind == "column":
+            return {spec.key: df[spec.component].to_numpy(dtype=float)}
+        elif spec.kind == "sma":
+            return {spec.key: calculate_sma(close, spec.period).to_numpy(dtype=float)}  # type: ignore[arg-type]
+        elif spec.kind == "ema":
+            return {spec.key: calculate_ema(close, spec.period).to_numpy(dtype=float)}  # type: ignore[arg-type]
+        elif spec.kind == "rsi":
+            return {spec.key: calculate_rsi(close, spec.period).to_numpy(dtype=float)}  # type: ignore[arg-type]
+        elif spec.kind == "macd":
+            result = calculate_macd(close)
+            return {
+                f"macd_{name}": result[output].to_numpy(dtype=float)
+                for name, output in MACD_COMPONENTS.items()
+            }
+        elif spec.kind == "bb":
+            result = calculate_bollinger_bands(close)
+            return {
+                f"bb_{name}": result[output].to_numpy(dtype=float)
+                for name, output in BB_COMPONENTS.items()
+            }
         else:
-            raise ValueError(f"Unknown indicator: {indicator_name}")
+            raise ValueError(f"Unknown indicator: {spec.key}")
 
     def clear_cache(self) -> None:
         """Clear indicator cache."""
         self._indicators_cache.clear()
+        self._bound_frame = None
+        self._bound_length = 0
+        self._data_key = None
 
     def evaluate_entry_rules(
         self,
-        entry_rules: list[dict[str, Any]],
+        entry_rules: list[dict[str, Any]] | list[CompiledRule],
         df: pd.DataFrame,
         index: int = -1,
     ) -> dict[str, Any]:
@@ -191,14 +549,14 @@ class RuleEngine:
             if result.get("passed"):
                 return {
                     "signal": "entry",
-                    "rule": rule,
+                    "rule": rule.source if isinstance(rule, CompiledRule) else rule,
                     "details": result["details"],
                 }
         return {"signal": None}
 
     def evaluate_exit_rules(
         self,
-        exit_rules: list[dict[str, Any]],
+        exit_rules: list[dict[str, Any]] | list[CompiledRule],
         df: pd.DataFrame,
         index: int = -1,
     ) -> dict[str, Any]:
@@ -208,7 +566,7 @@ class RuleEngine:
             if result.get("passed"):
                 return {
                     "signal": "exit",
-                    "rule": rule,
+                    "rule": rule.source if isinstance(rule, CompiledRule) else rule,
                     "details": result["details"],
                 }
         return {"signal": None}
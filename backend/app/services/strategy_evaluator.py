@@ -0,0 +1,252 @@
+"""Batched and streaming live evaluation of active strategies."""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.database import async_session_factory
+from app.core.events import BatchPublisher, EventTypes, event_bus
+from app.models.strategy import Strategy
+from app.services.candle_streamer import (
+    CandleBuffer,
+    CandleStreamer,
+    CcxtTransport,
+    StreamTransport,
+    TickerStreamer,
+)
+from app.services.live_indicators import IndicatorStateStore, LiveIndicators, advance_indicators
+from app.services.market_data_service import MarketDataService
+from app.services.rule_engine import CompiledRule, IndicatorSpec, RuleEngine
+from app.services.strategy_service import StrategyService
+from app.utils.metrics import timeframe_seconds
+from app.utils.ohlcv import OHLCVFrame, SeriesKey
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGE = "binance"
+# Bars fetched per series, enough to warm up the supported indicators
+EVALUATION_BARS = 100
+
+
+def group_by_series(strategies: list[Strategy]) -> dict[SeriesKey, list[Strategy]]:
+    """Group strategies by every series they trade, keeping their order."""
+    groups: dict[SeriesKey, list[Strategy]] = defaultdict(list)
+    for strategy in strategies:
+        for symbol in dict.fromkeys(strategy.symbols or []):
+            groups[SeriesKey(DEFAULT_EXCHANGE, symbol, strategy.timeframe)].append(strategy)
+    return dict(groups)
+
+
+def evaluate_series(
+    key: SeriesKey,
+    frame: OHLCVFrame,
+    plans: list[tuple[Strategy, CompiledRule]],
+    engine: RuleEngine | None = None,
+) -> list[dict[str, Any]]:
+    """Evaluate every strategy's entry rules on the latest bar of one series.
+
+    The engine is bound to the series once, so an indicator used by several
+    strategies is computed a single time.
+
+    Returns:
+        Entry signals of the strategies whose rules passed
+    """
+    engine = engine or RuleEngine()
+    df = frame.to_frame()
+    engine.bind(df, symbol=key.symbol, timeframe=key.timeframe)
+
+    signals = []
+    for strategy, plan in plans:
+        result = engine.evaluate_rules(plan, df, -1)
+        if result.get("passed"):
+            signals.append(entry_signal(key, strategy, result))
+    return signals
+
+
+def entry_signal(key: SeriesKey, strategy: Strategy, result: dict[str, Any]) -> dict[str, Any]:
+    """Signal event payload for a passed rule evaluation."""
+    return {
+        "strategy_id": str(strategy.id),
+        "user_id": str(strategy.user_id),
+        "symbol": key.symbol,
+        "signal": "entry",
+        "details": result.get("details", []),
+    }
+
+
+class StrategyEvaluator:
+    """Evaluate many strategies against market data fetched once per series."""
+
+    def __init__(self, market_data_service: MarketDataService) -> None:
+        self.market_data_service = market_data_service
+
+    async def evaluate(self, strategies: list[Strategy]) -> dict[str, Any]:
+        """Evaluate strategies grouped by (exchange, symbol, timeframe).
+
+        Each series is fetched once, with up to
+        ``STRATEGY_EVALUATION_CONCURRENCY`` fetches in flight. A series that
+        cannot be fetched is logged and skipped without affecting the others.
+
+        Returns:
+            Entry ``signals`` and the number of ``series`` evaluated
+        """
+        groups = group_by_series(strategies)
+        engine = RuleEngine()
+        plans = {strategy.id: engine.compile(strategy.rules) for strategy in strategies}
+        semaphore = asyncio.Semaphore(settings.STRATEGY_EVALUATION_CONCURRENCY)
+
+        async def fetch(key: SeriesKey) -> OHLCVFrame | None:
+            async with semaphore:
+                try:
+                    return await self.market_data_service.get_ohlcv(
+                        symbol=key.symbol,
+                        exchange=key.exchange,
+                        timeframe=key.timeframe,
+                        limit=EVALUATION_BARS,
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to fetch {key.exchange}:{key.symbol} {key.timeframe}: {e}"
+                    )
+                    return None
+
+        frames = await asyncio.gather(*(fetch(key) for key in groups))
+
+        signals = []
+        evaluated = 0
+        for (key, group), frame in zip(groups.items(), frames, strict=True):
+            if frame is None or not len(frame):
+                continue
+            evaluated += 1
+            signals.extend(evaluate_series(key, frame, [(s, plans[s.id]) for s in group], engine))
+
+        logger.info(
+            f"Evaluated {len(strategies)} strategies on {evaluated}/{len(groups)} series, "
+            f"{len(signals)} signals"
+        )
+        return {"signals": signals, "series": evaluated}
+
+
+class LiveStrategyRunner:
+    """Evaluate active strategies as soon as a bar of their series closes.
+
+    Active strategies are reloaded every ``STRATEGY_REFRESH_SECONDS`` and
+    the streamer is kept subscribed to exactly the series they trade. Each
+    series keeps one incremental state per indicator its strategies use,
+    advanced by every closed candle and saved to Redis, so a bar close
+    costs O(1) per indicator instead of a recompute over the window. States
+    are rebuilt from the streamed buffer when a series is first seen, gains
+    an indicator or misses candles. Tickers of ``TICKER_STREAM_SYMBOLS``
+    and of the traded symbols are streamed too. Closed candles, tickers and
+    signals are published in batches.
+    """
+
+    def __init__(
+        self,
+        market_data_service: MarketDataService,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+        transport_factory: Callable[[str], StreamTransport] = CcxtTransport,
+        state_store: IndicatorStateStore | None = None,
+    ) -> None:
+        self.market_data_service = market_data_service
+        self.session_factory = session_factory
+        self.state_store = state_store or IndicatorStateStore()
+        self.publisher = BatchPublisher(event_bus)
+        self.streamer = CandleStreamer(
+            self._load_history,
+            self.on_bar_close,
+            transport_factory,
+            publisher=self.publisher,
+        )
+        self.tickers = TickerStreamer(transport_factory, publisher=self.publisher)
+        self.engine = RuleEngine()
+        self.plans: dict[SeriesKey, list[tuple[Strategy, CompiledRule]]] = {}
+        self.specs: dict[SeriesKey, set[IndicatorSpec]] = {}
+        self.indicators: dict[SeriesKey, LiveIndicators] = {}
+
+    async def run(self) -> None:
+        """Keep subscriptions in line with the active strategies until cancelled."""
+        try:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    logger.error(f"Failed to refresh active strategies: {e}")
+                await asyncio.sleep(settings.STRATEGY_REFRESH_SECONDS)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop streaming and send the buffered events."""
+        await self.streamer.close()
+        await self.tickers.close()
+        await self.publisher.close()
+
+    async def refresh(self) -> None:
+        """Reload active strategies and update the stream subscriptions."""
+        async with self.session_factory() as db:
+            strategies = await StrategyService(db).list_active_strategies()
+        await self.set_strategies(strategies)
+
+    async def set_strategies(self, strategies: list[Strategy]) -> None:
+        """Evaluate ``strategies`` from now on."""
+        compiled = {strategy.id: self.engine.compile(strategy.rules) for strategy in strategies}
+        self.plans = {
+            key: [(strategy, compiled[strategy.id]) for strategy in group]
+            for key, group in group_by_series(strategies).items()
+        }
+        self.specs = {
+            key: {spec for _, plan in plans for spec in plan.specs}
+            for key, plans in self.plans.items()
+        }
+        for key in set(self.indicators) - set(self.plans):
+            del self.indicators[key]
+        await self.streamer.sync(set(self.plans))
+        tickers = {(settings.TICKER_STREAM_EXCHANGE, s) for s in settings.TICKER_STREAM_SYMBOLS}
+        await self.tickers.sync(tickers | {(key.exchange, key.symbol) for key in self.plans})
+
+    async def on_bar_close(self, key: SeriesKey, buffer: CandleBuffer, candle: list[float]) -> None:
+        """Advance a series' indicators to ``candle`` and publish its strategies' signals.
+
+        Each closed candle is evaluated on its own, including when one
+        update closed several and the buffer already holds later ones.
+        """
+        plans = self.plans.get(key)
+        if not plans or not buffer.closed:
+            return
+
+        candles: Sequence[list[float]] = buffer.closed
+        if candles[-1][0] != candle[0]:
+            candles = [c for c in buffer.closed if c[0] <= candle[0]]
+            if not candles:
+                # Already rolled out of the window
+                return
+
+        indicators = self.indicators.get(key)
+        if indicators is None:
+            indicators = await self.state_store.load(key)
+        # Calendar months vary in length, so their bars cannot be checked for holes
+        step = None if key.timeframe.endswith("M") else timeframe_seconds(key.timeframe) * 1000
+        indicators = advance_indicators(indicators, self.specs[key], candles, step)
+        self.indicators[key] = indicators
+        await self.state_store.save(key, indicators)
+
+        for strategy, plan in plans:
+            result = self.engine.evaluate_latest(plan, indicators.current, indicators.previous)
+            if result.get("passed"):
+                await self.publisher.publish(
+                    EventTypes.STRATEGY_SIGNAL, entry_signal(key, strategy, result)
+                )
+
+    async def _load_history(self, key: SeriesKey, bars: int) -> OHLCVFrame:
+        return await self.market_data_service.get_ohlcv(
+            symbol=key.symbol,
+            exchange=key.exchange,
+            timeframe=key.timeframe,
+            limit=bars,
+        )
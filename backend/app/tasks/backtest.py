@@ -3,14 +3,34 @@
 import logging
 from typing import Any
 
+from celery.signals import worker_init, worker_process_shutdown
+
 from app.core.celery_app import celery_app
 from app.core.database import async_session_factory
 from app.core.events import EventTypes, event_bus
+from app.services.backtest_engine import set_pool_owners, shutdown_executor
 from app.services.backtest_service import BacktestService
+from app.services.job_control import JobCancelled, JobProgress
 
 logger = logging.getLogger(__name__)
 
 
+def size_backtest_workers(sender: Any, **kwargs: Any) -> None:
+    """Share the CPU cores between the pools of the worker's child processes."""
+    set_pool_owners(sender.concurrency or 1)
+
+
+worker_init.connect(size_backtest_workers)
+
+
+def shutdown_backtest_workers(**kwargs: Any) -> None:
+    """Stop the backtest process pool with the Celery worker process."""
+    shutdown_executor()
+
+
+worker_process_shutdown.connect(shutdown_backtest_workers)
+
+
 @celery_app.task(bind=True, max_retries=3)
 def run_backtest_task(self, backtest_id: str) -> dict[str, Any]:
     """Celery task to run a backtest asynchronously."""
@@ -19,19 +39,25 @@ def run_backtest_task(self, backtest_id: str) -> dict[str, Any]:
     async def _run():
         async with async_session_factory() as db:
             service = BacktestService(db)
+            user_id = await service.get_owner_id(backtest_id)
+            progress = JobProgress(
+                "backtest", backtest_id, EventTypes.BACKTEST_PROGRESS, user_id=user_id
+            )
 
             await event_bus.publish(
                 EventTypes.BACKTEST_STARTED,
-                {"backtest_id": backtest_id},
+                {"backtest_id": backtest_id, "user_id": user_id},
             )
 
             try:
-                result = await service.run_backtest(backtest_id)
+                result = await service.run_backtest(backtest_id, progress)
+                await db.commit()
 
                 await event_bus.publish(
                     EventTypes.BACKTEST_COMPLETED,
                     {
                         "backtest_id": backtest_id,
+                        "user_id": user_id,
                         "total_return": result["total_return"],
                         "total_trades": result["total_trades"],
                     },
@@ -44,13 +70,26 @@ def run_backtest_task(self, backtest_id: str) -> dict[str, Any]:
                     "total_trades": result["total_trades"],
                 }
 
+            except JobCancelled:
+                await db.commit()
+                await event_bus.publish(
+                    EventTypes.BACKTEST_CANCELLED,
+                    {"backtest_id": backtest_id, "user_id": user_id},
+                )
+                return {"status": "cancelled", "backtest_id": backtest_id}
+
             except Exception as e:
+                # Keep the failed status and error message
+                await db.commit()
                 await event_bus.publish(
                     EventTypes.BACKTEST_FAILED,
-                    {"backtest_id": backtest_id, "error": str(e)},
+                    {"backtest_id": backtest_id, "user_id": user_id, "error": str(e)},
                 )
                 raise
 
+            finally:
+                await progress.clear()
+
     try:
         loop = asyncio.get_event_loop()
     except RuntimeError:
@@ -6,7 +6,7 @@ from typing import Any
 
 from app.core.celery_app import celery_app
 from app.core.database import async_session_factory
-from app.core.events import EventTypes, event_bus
+from app.core.events import EventPublishError, EventTypes, event_bus
 from app.services.execution_service import ExecutionService
 
 logger = logging.getLogger(__name__)
@@ -37,17 +37,22 @@ def execute_trade_task(
                     strategy_id=strategy_id,
                 )
 
-                await event_bus.publish(
-                    EventTypes.TRADE_OPENED if side == "buy" else EventTypes.TRADE_CLOSED,
-                    {
-                        "trade_id": str(trade.id),
-                        "portfolio_id": portfolio_id,
-                        "symbol": symbol,
-                        "side": side,
-                        "quantity": quantity,
-                        "price": str(trade.filled_price),
-                    },
-                )
+                try:
+                    await event_bus.publish(
+                        EventTypes.TRADE_OPENED if side == "buy" else EventTypes.TRADE_CLOSED,
+                        {
+                            "trade_id": str(trade.id),
+                            "portfolio_id": portfolio_id,
+                            "user_id": await service.get_owner_id(portfolio_id),
+                            "symbol": symbol,
+                            "side": side,
+                            "quantity": quantity,
+                            "price": str(trade.filled_price),
+                        },
+                    )
+                except EventPublishError as e:
+                    # The order is filled; retrying the task would place it again
+                    logger.error(f"Trade {trade.id} executed but not published: {e}")
 
                 return {
                     "status": "executed",
@@ -4,8 +4,11 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from app.config import settings
 from app.core.celery_app import celery_app
 from app.core.events import EventTypes, event_bus
+from app.services.candle_store import CandleStore
+from app.services.market_catalog import market_catalog
 from app.services.market_data_service import MarketDataService
 
 logger = logging.getLogger(__name__)
@@ -25,41 +28,47 @@ def fetch_historical_data_task(
     import asyncio
 
     async def _fetch():
-        service = MarketDataService()
+        service = MarketDataService(candle_store=CandleStore())
 
-        try:
-            start = datetime.fromisoformat(start_date) if start_date else None
-            end = datetime.fromisoformat(end_date) if end_date else None
+        start = datetime.fromisoformat(start_date) if start_date else None
+        end = datetime.fromisoformat(end_date) if end_date else None
 
-            data = await service.get_ohlcv(
+        if start:
+            # Bulk range: page through the exchange straight into the store
+            count = await service.load_history(
                 symbol=symbol,
                 exchange=exchange,
                 timeframe=timeframe,
                 start_date=start,
                 end_date=end,
-                limit=limit,
             )
-
-            await event_bus.publish(
-                EventTypes.MARKET_DATA_UPDATED,
-                {
-                    "symbol": symbol,
-                    "exchange": exchange,
-                    "timeframe": timeframe,
-                    "count": len(data),
-                },
+        else:
+            data = await service.get_ohlcv(
+                symbol=symbol,
+                exchange=exchange,
+                timeframe=timeframe,
+                end_date=end,
+                limit=limit,
             )
+            count = len(data)
 
-            return {
-                "status": "completed",
+        await event_bus.publish(
+            EventTypes.MARKET_DATA_UPDATED,
+            {
                 "symbol": symbol,
                 "exchange": exchange,
                 "timeframe": timeframe,
-                "count": len(data),
-            }
-
-        finally:
-            await service.close_all()
+                "count": count,
+            },
+        )
+
+        return {
+            "status": "completed",
+            "symbol": symbol,
+            "exchange": exchange,
+            "timeframe": timeframe,
+            "count": count,
+        }
 
     try:
         loop = asyncio.get_event_loop()
@@ -86,27 +95,23 @@ def update_ticker_cache_task(
         service = MarketDataService()
         results = {}
 
-        try:
-            for symbol in symbols:
-                try:
-                    ticker = await service.get_ticker(symbol, exchange)
-                    results[symbol] = {
-                        "last": ticker.get("last"),
-                        "bid": ticker.get("bid"),
-                        "ask": ticker.get("ask"),
-                    }
-                except Exception as e:
-                    logger.error(f"Failed to fetch ticker for {symbol}: {e}")
-                    results[symbol] = {"error": str(e)}
-
-            return {
-                "status": "completed",
-                "exchange": exchange,
-                "results": results,
-            }
-
-        finally:
-            await service.close_all()
+        for symbol in symbols:
+            try:
+                ticker = await service.get_ticker(symbol, exchange)
+                results[symbol] = {
+                    "last": ticker.get("last"),
+                    "bid": ticker.get("bid"),
+                    "ask": ticker.get("ask"),
+                }
+            except Exception as e:
+                logger.error(f"Failed to fetch ticker for {symbol}: {e}")
+                results[symbol] = {"error": str(e)}
+
+        return {
+            "status": "completed",
+            "exchange": exchange,
+            "results": results,
+        }
 
     try:
         loop = asyncio.get_event_loop()
@@ -128,22 +133,18 @@ def fetch_symbols_task(
     async def _fetch():
         service = MarketDataService()
 
-        try:
-            symbols = await service.get_symbols(
-                exchange=exchange,
-                quote_currency=quote_currency,
-                limit=1000,
-            )
+        symbols = await service.get_symbols(
+            exchange=exchange,
+            quote_currency=quote_currency,
+            limit=1000,
+        )
 
-            return {
-                "status": "completed",
-                "exchange": exchange,
-                "count": len(symbols),
-                "symbols": [s["symbol"] for s in symbols],
-            }
-
-        finally:
-            await service.close_all()
+        return {
+            "status": "completed",
+            "exchange": exchange,
+            "count": len(symbols),
+            "symbols": [s["symbol"] for s in symbols],
+        }
 
     try:
         loop = asyncio.get_event_loop()
@@ -152,3 +153,32 @@ def fetch_symbols_task(
         asyncio.set_event_loop(loop)
 
     return loop.run_until_complete(_fetch())
+
+
+@celery_app.task
+def refresh_markets_task(exchanges: list[str] | None = None) -> dict[str, Any]:
+    """Reload exchange market lists and publish them to Redis."""
+    import asyncio
+
+    async def _refresh() -> dict[str, Any]:
+        results: dict[str, Any] = {}
+        for exchange in exchanges or settings.MARKETS_REFRESH_EXCHANGES:
+            try:
+                index = await market_catalog.refresh(exchange)
+                results[exchange] = len(index)
+            except Exception as e:
+                logger.error(f"Failed to refresh markets for {exchange}: {e}")
+                results[exchange] = {"error": str(e)}
+
+        return {
+            "status": "completed",
+            "markets": results,
+        }
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(_refresh())
@@ -0,0 +1,64 @@
+"""Optimization Celery tasks."""
+
+import logging
+from typing import Any
+
+from app.core.celery_app import celery_app
+from app.core.database import async_session_factory
+from app.core.events import EventTypes, event_bus
+from app.services.job_control import JobCancelled, JobProgress
+from app.services.optimization_service import OptimizationService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True)
+def run_optimization_task(self: Any, optimization_id: str) -> dict[str, Any]:
+    """Celery task to run a parameter sweep."""
+    import asyncio
+
+    async def _run() -> dict[str, Any]:
+        async with async_session_factory() as db:
+            service = OptimizationService(db)
+            user_id = await service.get_owner_id(optimization_id)
+            progress = JobProgress(
+                "optimization",
+                optimization_id,
+                EventTypes.OPTIMIZATION_PROGRESS,
+                user_id=user_id,
+            )
+
+            try:
+                result = await service.run_optimization(optimization_id, progress)
+                await db.commit()
+            except JobCancelled:
+                await db.commit()
+                await event_bus.publish(
+                    EventTypes.OPTIMIZATION_CANCELLED,
+                    {"optimization_id": optimization_id, "user_id": user_id},
+                )
+                return {"status": "cancelled", "optimization_id": optimization_id}
+            except Exception:
+                # Keep the failed status and error message
+                await db.commit()
+                raise
+            finally:
+                await progress.clear()
+
+            return {
+                "status": "completed",
+                "optimization_id": optimization_id,
+                "total_combinations": result["total_combinations"],
+            }
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    try:
+        return loop.run_until_complete(_run())
+    except Exception as e:
+        logger.error(f"Optimization task failed: {e}")
+        raise
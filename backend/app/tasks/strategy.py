@@ -6,8 +6,9 @@ from typing import Any
 from app.core.celery_app import celery_app
 from app.core.database import async_session_factory
 from app.core.events import EventTypes, event_bus
+from app.services.candle_store import CandleStore
 from app.services.market_data_service import MarketDataService
-from app.services.rule_engine import RuleEngine
+from app.services.strategy_evaluator import StrategyEvaluator
 from app.services.strategy_service import StrategyService
 
 logger = logging.getLogger(__name__)
@@ -18,8 +19,6 @@ def evaluate_strategy_task(self, strategy_id: str) -> dict[str, Any]:
     """Evaluate a single strategy against current market data."""
     import asyncio
 
-    import pandas as pd
-
     async def _evaluate():
         async with async_session_factory() as db:
             from sqlalchemy import select
@@ -32,46 +31,18 @@ def evaluate_strategy_task(self, strategy_id: str) -> dict[str, Any]:
             if not strategy or not strategy.is_active:
                 return {"status": "skipped", "reason": "Strategy inactive or not found"}
 
-            market_service = MarketDataService()
-            rule_engine = RuleEngine()
-            signals = []
-
-            try:
-                for symbol in strategy.symbols:
-                    data = await market_service.get_ohlcv(
-                        symbol=symbol,
-                        timeframe=strategy.timeframe,
-                        limit=100,
-                    )
-
-                    if not data:
-                        continue
-
-                    df = pd.DataFrame(data)
-                    df["timestamp"] = pd.to_datetime(df["timestamp"])
-                    df.set_index("timestamp", inplace=True)
-
-                    entry_result = rule_engine.evaluate_rules(strategy.rules, df, -1)
-
-                    if entry_result.get("passed"):
-                        signal = {
-                            "strategy_id": str(strategy.id),
-                            "symbol": symbol,
-                            "signal": "entry",
-                            "details": entry_result.get("details", []),
-                        }
-                        signals.append(signal)
+            evaluator = StrategyEvaluator(MarketDataService(candle_store=CandleStore()))
+            evaluation = await evaluator.evaluate([strategy])
 
-                        await event_bus.publish(EventTypes.STRATEGY_SIGNAL, signal)
+            await event_bus.publish_many(
+                [(EventTypes.STRATEGY_SIGNAL, signal) for signal in evaluation["signals"]]
+            )
 
-                return {
-                    "status": "completed",
-                    "strategy_id": strategy_id,
-                    "signals": signals,
-                }
-
-            finally:
-                await market_service.close_all()
+            return {
+                "status": "completed",
+                "strategy_id": strategy_id,
+                "signals": evaluation["signals"],
+            }
 
     try:
         loop = asyncio.get_event_loop()
@@ -84,7 +55,12 @@ def evaluate_strategy_task(self, strategy_id: str) -> dict[str, Any]:
 
 @celery_app.task
 def evaluate_active_strategies_task() -> dict[str, Any]:
-    """Periodic task to evaluate all active strategies."""
+    """Periodic task to evaluate all active strategies in one pass.
+
+    Strategies are grouped by the series they trade so each series is
+    fetched once and each indicator computed once, however many strategies
+    use it.
+    """
     import asyncio
 
     async def _evaluate_all():
@@ -92,29 +68,18 @@ def evaluate_active_strategies_task() -> dict[str, Any]:
             service = StrategyService(db)
             strategies = await service.list_active_strategies()
 
-            results = []
-            for strategy in strategies:
-                try:
-                    result = evaluate_strategy_task.delay(str(strategy.id))
-                    results.append(
-                        {
-                            "strategy_id": str(strategy.id),
-                            "task_id": result.id,
-                        }
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to queue strategy {strategy.id}: {e}")
-                    results.append(
-                        {
-                            "strategy_id": str(strategy.id),
-                            "error": str(e),
-                        }
-                    )
+            evaluator = StrategyEvaluator(MarketDataService(candle_store=CandleStore()))
+            evaluation = await evaluator.evaluate(strategies)
+
+            await event_bus.publish_many(
+                [(EventTypes.STRATEGY_SIGNAL, signal) for signal in evaluation["signals"]]
+            )
 
             return {
-                "status": "queued",
+                "status": "completed",
                 "strategies_count": len(strategies),
-                "results": results,
+                "series_count": evaluation["series"],
+                "signals_count": len(evaluation["signals"]),
             }
 
     try:
@@ -0,0 +1,148 @@
+"""Compact storage and downsampling for equity curves.
+
+A curve is a pair of arrays: int64 nanosecond timestamps and float64
+values. ``encode_series`` packs them column-wise into a compressed blob:
+timestamps are delta-encoded (regular bars become a run of equal values)
+and both columns are byte-shuffled before zlib so similar bytes sit
+together. ``downsample`` reduces a curve to a fixed number of points for
+charts.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<BI")
+COMPRESSION_LEVEL = 6
+
+
+def _shuffle(column: np.ndarray) -> bytes:
+    """Group the n-th byte of every 8-byte value together."""
+    return column.view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: str) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8).reshape(8, -1).T.copy().view(dtype).ravel()
+
+
+def encode_series(timestamps: np.ndarray, values: np.ndarray) -> bytes:
+    """Pack a curve into a compressed columnar blob."""
+    timestamps = np.ascontiguousarray(timestamps, dtype="<i8")
+    values = np.ascontiguousarray(values, dtype="<f8")
+    if len(timestamps) != len(values):
+        raise ValueError("timestamps and values must have the same length")
+
+    deltas = np.diff(timestamps, prepend=np.int64(0))
+    payload = _shuffle(deltas) + _shuffle(values)
+    return HEADER.pack(FORMAT_VERSION, len(timestamps)) + zlib.compress(payload, COMPRESSION_LEVEL)
+
+
+def decode_series(blob: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Unpack a blob written by ``encode_series``.
+
+    Returns:
+        Tuple of int64 nanosecond timestamps and float64 values
+    """
+    version, length = HEADER.unpack_from(blob)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported equity series format: {version}")
+
+    payload = zlib.decompress(blob[HEADER.size :])
+    split = length * 8
+    timestamps = np.cumsum(_unshuffle(payload[:split], "<i8"))
+    values = _unshuffle(payload[split:], "<f8")
+    return timestamps.astype(np.int64), values.astype(np.float64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Pick points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept. The rest of the series is split
+    into ``points - 2`` buckets, and from each the point forming the largest
+    triangle with the previously kept point and the next bucket's average is
+    chosen, which preserves the visual shape of the curve.
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+    if points < 3:
+        return np.array([0, n - 1][:points])
+
+    x = np.asarray(x, dtype=np.float64) - float(x[0])
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(points - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            next_x, next_y = x[end : edges[i + 2]], y[end : edges[i + 2]]
+        else:
+            next_x, next_y = x[n - 1 :], y[n - 1 :]
+        avg_x = next_x.mean() if len(next_x) else x[n - 1]
+        avg_y = next_y.mean() if len(next_y) else y[n - 1]
+
+        ax, ay = x[previous], y[previous]
+        area = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+
+    return selected
+
+
+def minmax(y: np.ndarray, points: int) -> np.ndarray:
+    """Pick the lowest and highest point of each bucket.
+
+    Keeps every peak and trough at the bucket resolution, which suits
+    drawdown views. The first and last points are always kept.
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(y)
+    if points >= n:
+        return np.arange(n)
+    if points < 4:
+        return np.array([0, n - 1][:points])
+
+    buckets = (points - 2) // 2
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    selected = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:], strict=True):
+        if end > start:
+            bucket = y[start:end]
+            selected.extend((start + int(bucket.argmin()), start + int(bucket.argmax())))
+    return np.unique(selected)
+
+
+def downsample(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    points: int,
+    method: str = "lttb",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce a curve to at most ``points`` points.
+
+    Args:
+        timestamps: Curve timestamps
+        values: Curve values
+        points: Maximum number of points to return
+        method: ``lttb`` or ``minmax``
+
+    Returns:
+        Tuple of the kept timestamps and values
+    """
+    if method == "lttb":
+        indices = lttb(timestamps, values, points)
+    elif method == "minmax":
+        indices = minmax(values, points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return timestamps[indices], values[indices]
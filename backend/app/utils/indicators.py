@@ -45,12 +45,8 @@ def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
     gain = delta.where(delta > 0, 0.0)
     loss = (-delta).where(delta < 0, 0.0)
 
-    avg_gain = gain.rolling(window=period, min_periods=1).mean()
-    avg_loss = loss.rolling(window=period, min_periods=1).mean()
-
-    for i in range(period, len(data)):
-        avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (period - 1) + gain.iloc[i]) / period
-        avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (period - 1) + loss.iloc[i]) / period
+    avg_gain = _wilder_smooth(gain, period)
+    avg_loss = _wilder_smooth(loss, period)
 
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
@@ -61,6 +57,31 @@ def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
     return rsi
 
 
+def _wilder_smooth(data: pd.Series, period: int) -> pd.Series:
+    """Apply Wilder's smoothing (RMA) seeded with a simple average.
+
+    The first ``period`` values are the expanding mean of the input; from
+    there on each value is ``(prev * (period - 1) + current) / period``,
+    which is an exponential average with ``alpha = 1 / period``.
+
+    Args:
+        data: Series to smooth
+        period: Smoothing period
+
+    Returns:
+        Series containing smoothed values
+    """
+    seed = data.iloc[:period].expanding(min_periods=1).mean()
+    if len(data) <= period:
+        return seed
+
+    tail = data.iloc[period - 1 :].copy()
+    tail.iloc[0] = seed.iloc[-1]
+    smoothed = tail.ewm(alpha=1.0 / period, adjust=False).mean()
+
+    return pd.concat([seed.iloc[:-1], smoothed])
+
+
 def calculate_macd(
     data: pd.Series,
     fast_period: int = 12,
@@ -0,0 +1,215 @@
+"""Performance metrics for equity curves and trades.
+
+All functions work on NumPy arrays. Annualization is derived from the bar
+timeframe, assuming markets trade around the clock (365 days a year).
+"""
+
+import re
+
+import numpy as np
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+TIMEFRAME_UNITS = {
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 7 * 86400,
+    "M": 30 * 86400,
+    "y": 365 * 86400,
+}
+_TIMEFRAME = re.compile(r"^(\d+)([smhdwMy])$")
+# Risk-adjusted ratios are clamped to what their Numeric(10, 4) result
+# columns hold; short runs annualize to meaningless extremes
+RATIO_LIMIT = 999_999.0
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """Duration of one bar, e.g. 3600 for ``1h``.
+
+    Raises:
+        ValueError: If the timeframe is not recognised
+    """
+    match = _TIMEFRAME.match(timeframe)
+    if not match:
+        raise ValueError(f"Unknown timeframe: {timeframe}")
+    return int(match.group(1)) * TIMEFRAME_UNITS[match.group(2)]
+
+
+def periods_per_year(timeframe: str) -> float:
+    """Number of bars of ``timeframe`` in a year."""
+    return SECONDS_PER_YEAR / timeframe_seconds(timeframe)
+
+
+def bar_returns(equity: np.ndarray) -> np.ndarray:
+    """Bar-to-bar simple returns, skipping bars that follow a non-positive value."""
+    equity = np.asarray(equity, dtype=np.float64)
+    previous = equity[:-1]
+    valid = previous > 0
+    return np.asarray((equity[1:][valid] - previous[valid]) / previous[valid])
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """Decline from the running peak at every bar, in percent."""
+    equity = np.asarray(equity, dtype=np.float64)
+    if not len(equity):
+        return equity
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+
+
+def _clamp_ratio(value: float) -> float:
+    return float(min(max(value, -RATIO_LIMIT), RATIO_LIMIT))
+
+
+def performance_metrics(
+    equity: np.ndarray,
+    timeframe: str,
+    invested: np.ndarray | None = None,
+    traded_notional: float = 0.0,
+    risk_free_rate: float = 0.02,
+) -> dict[str, float]:
+    """Risk and return metrics of an equity curve.
+
+    Args:
+        equity: Portfolio value per bar
+        timeframe: Bar timeframe used for annualization
+        invested: Value held in open positions per bar, for exposure
+        traded_notional: One-way value of all trades, for turnover
+        risk_free_rate: Annual risk-free rate
+
+    Returns:
+        ``max_drawdown`` (percent), ``sharpe_ratio``, ``sortino_ratio``,
+        ``calmar_ratio``, ``annualized_return`` and ``volatility`` (percent),
+        ``exposure`` (percent of equity held in positions on average) and
+        ``turnover`` (traded value over average equity)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    periods = periods_per_year(timeframe)
+    metrics = dict.fromkeys(
+        (
+            "max_drawdown",
+            "sharpe_ratio",
+            "sortino_ratio",
+            "calmar_ratio",
+            "annualized_return",
+            "volatility",
+            "exposure",
+            "turnover",
+        ),
+        0.0,
+    )
+    if not len(equity):
+        return metrics
+
+    max_dd = float(drawdown(equity).max())
+    metrics["max_drawdown"] = max_dd
+
+    mean_equity = float(equity.mean())
+    if mean_equity > 0:
+        metrics["turnover"] = traded_notional / mean_equity
+        if invested is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                held = np.where(equity > 0, np.asarray(invested) / equity, 0.0)
+            metrics["exposure"] = float(held.mean() * 100)
+
+    returns = bar_returns(equity)
+    if not len(returns):
+        return metrics
+
+    mean_return = float(returns.mean())
+    excess = mean_return * periods - risk_free_rate
+    std_return = float(returns.std())
+    downside = float(np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)))
+
+    metrics["volatility"] = std_return * np.sqrt(periods) * 100
+    if std_return > 0:
+        metrics["sharpe_ratio"] = _clamp_ratio(excess / (std_return * np.sqrt(periods)))
+    if downside > 0:
+        metrics["sortino_ratio"] = _clamp_ratio(excess / (downside * np.sqrt(periods)))
+
+    if equity[0] > 0 and equity[-1] > 0:
+        growth = np.log(equity[-1] / equity[0]) * periods / len(returns)
+        annualized = float(np.expm1(min(growth, 700.0)))
+        metrics["annualized_return"] = annualized * 100
+        if max_dd > 0:
+            metrics["calmar_ratio"] = _clamp_ratio(annualized / (max_dd / 100))
+
+    return metrics
+
+
+def rolling_metrics(
+    equity: np.ndarray,
+    window: int,
+    timeframe: str,
+    risk_free_rate: float = 0.02,
+) -> dict[str, np.ndarray]:
+    """Trailing-window return, volatility and Sharpe ratio at every bar.
+
+    Rolling sums of returns make each series a single pass regardless of the
+    window length. Bars before a full window are NaN.
+
+    Returns:
+        ``return`` and ``volatility`` in percent, ``sharpe_ratio`` and the
+        running ``drawdown`` in percent, each aligned with ``equity``
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    n = len(equity)
+    periods = periods_per_year(timeframe)
+    nan = np.full(n, np.nan)
+    result = {
+        "return": nan.copy(),
+        "volatility": nan.copy(),
+        "sharpe_ratio": nan.copy(),
+        "drawdown": drawdown(equity),
+    }
+    if window < 2 or n <= window:
+        return result
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(equity[:-1] > 0, np.diff(equity) / equity[:-1], 0.0)
+        sums = np.concatenate(([0.0], np.cumsum(returns)))
+        squares = np.concatenate(([0.0], np.cumsum(returns**2)))
+
+        window_sum = sums[window:] - sums[:-window]
+        window_squares = squares[window:] - squares[:-window]
+        mean = window_sum / window
+        std = np.sqrt(np.maximum(window_squares / window - mean**2, 0.0))
+
+        result["return"][window:] = (equity[window:] / equity[:-window] - 1) * 100
+        result["volatility"][window:] = std * np.sqrt(periods) * 100
+        result["sharpe_ratio"][window:] = np.where(
+            std > 1e-12, (mean * periods - risk_free_rate) / (std * np.sqrt(periods)), 0.0
+        )
+
+    return result
+
+
+def trade_statistics(pnls: np.ndarray) -> dict[str, float]:
+    """Win/loss statistics of closed trades.
+
+    Returns:
+        Trade counts, ``win_rate`` (percent), gross ``total_profit`` and
+        ``total_loss``, ``net_pnl``, ``profit_factor``, average win and loss,
+        and ``expectancy`` (average PnL per trade)
+    """
+    pnls = np.asarray(pnls, dtype=np.float64)
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls < 0]
+    total_profit = float(wins.sum())
+    total_loss = float(losses.sum())
+
+    return {
+        "total_trades": len(pnls),
+        "winning_trades": len(wins),
+        "losing_trades": len(losses),
+        "win_rate": len(wins) / len(pnls) * 100 if len(pnls) else 0.0,
+        "total_profit": total_profit,
+        "total_loss": total_loss,
+        "net_pnl": total_profit + total_loss,
+        "profit_factor": total_profit / -total_loss if total_loss < 0 else 0.0,
+        "average_win": float(wins.mean()) if len(wins) else 0.0,
+        "average_loss": float(losses.mean()) if len(losses) else 0.0,
+        "expectancy": float(pnls.mean()) if len(pnls) else 0.0,
+    }
@@ -0,0 +1,103 @@
+"""Columnar OHLCV container.
+
+Candles are held as int64 millisecond open times and one float64
+``(n, 5)`` array of open, high, low, close and volume. Column accessors are
+views and ``to_frame`` wraps the same memory, so candles pass between
+services without being copied; dicts are built only for JSON responses.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+@dataclass(frozen=True, slots=True)
+class SeriesKey:
+    """Identity of a candle series."""
+
+    exchange: str
+    symbol: str
+    timeframe: str
+
+
+@dataclass(slots=True, eq=False)
+class OHLCVFrame:
+    """OHLCV candles in chronological order."""
+
+    timestamps: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "OHLCVFrame":
+        return cls(np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=np.float64))
+
+    @classmethod
+    def from_rows(cls, rows: list[list[Any]]) -> "OHLCVFrame":
+        """Build a frame from exchange-style ``[ts, o, h, l, c, v]`` rows.
+
+        A missing volume is read as zero.
+        """
+        if not len(rows):
+            return cls.empty()
+        array = np.array(rows, dtype=np.float64)
+        values = np.ascontiguousarray(array[:, 1:6])
+        np.nan_to_num(values[:, 4], copy=False, nan=0.0)
+        return cls(array[:, 0].astype(np.int64), values)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.values[:, 0]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.values[:, 1]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.values[:, 2]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.values[:, 3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.values[:, 4]
+
+    def until(self, end_ms: int) -> "OHLCVFrame":
+        """Candles opening at or before ``end_ms``, as a view."""
+        stop = int(np.searchsorted(self.timestamps, end_ms, side="right"))
+        return OHLCVFrame(self.timestamps[:stop], self.values[:stop])
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame indexed by open time (UTC) sharing this frame's values."""
+        return pd.DataFrame(
+            self.values,
+            columns=OHLCV_COLUMNS,
+            index=pd.DatetimeIndex(pd.to_datetime(self.timestamps, unit="ms"), name="timestamp"),
+            copy=False,
+        )
+
+    def records(self) -> list[dict[str, Any]]:
+        """Candles as dicts for JSON responses."""
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(ts / 1000),
+                "open": o,
+                "high": h,
+                "low": low,
+                "close": c,
+                "volume": v,
+            }
+            for ts, (o, h, low, c, v) in zip(
+                self.timestamps.tolist(), self.values.tolist(), strict=True
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
@@ -0,0 +1,467 @@
+"""Incremental technical indicators for live evaluation.
+
+Each state object consumes one bar at a time through ``update`` at O(1)
+cost and produces the same values as the batch functions in
+``app.utils.indicators`` would for the last bar of the series. States can
+be serialized with ``dumps_states``/``loads_states`` so they survive
+between task runs (e.g. stored in Redis).
+"""
+
+import json
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterable, Mapping
+from typing import Any, ClassVar
+
+Bar = Mapping[str, float]
+
+NAN = float("nan")
+
+
+class IndicatorState(ABC):
+    """Abstract base class for incremental indicator states."""
+
+    kind: ClassVar[str] = ""
+    registry: ClassVar[dict[str, type["IndicatorState"]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.kind:
+            IndicatorState.registry[cls.kind] = cls
+
+    @abstractmethod
+    def update(self, bar: Bar) -> Any:
+        """Consume a closed bar and return the indicator value."""
+        ...
+
+    @property
+    @abstractmethod
+    def value(self) -> Any:
+        """Current indicator value."""
+        ...
+
+    def warm_up(self, bars: Iterable[Bar]) -> Any:
+        """Feed historical bars in order and return the latest value."""
+        result: Any = self.value
+        for bar in bars:
+            result = self.update(bar)
+        return result
+
+    @abstractmethod
+    def params(self) -> dict[str, Any]:
+        """Constructor arguments of this state."""
+        ...
+
+    @abstractmethod
+    def get_state(self) -> dict[str, Any]:
+        """JSON-compatible snapshot of the running state."""
+        ...
+
+    @abstractmethod
+    def set_state(self, state: dict[str, Any]) -> None:
+        """Restore the running state from a snapshot."""
+        ...
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the indicator to a JSON-compatible dictionary."""
+        return {"kind": self.kind, "params": self.params(), "state": self.get_state()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "IndicatorState":
+        """Rebuild an indicator state from ``to_dict`` output."""
+        state_cls = IndicatorState.registry.get(data["kind"])
+        if state_cls is None:
+            raise ValueError(f"Unknown indicator state: {data['kind']}")
+        instance = state_cls(**data["params"])
+        instance.set_state(data["state"])
+        return instance
+
+
+def _encode(value: float | None) -> float | None:
+    """Encode NaN as None for JSON."""
+    if value is None or math.isnan(value):
+        return None
+    return value
+
+
+def _decode(value: float | None) -> float:
+    """Decode None back to NaN."""
+    return NAN if value is None else float(value)
+
+
+class SMAState(IndicatorState):
+    """Simple moving average over a fixed window."""
+
+    kind = "sma"
+
+    def __init__(self, period: int = 20, source: str = "close") -> None:
+        self.period = period
+        self.source = source
+        self._window: deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+        self._nans = 0
+
+    def push(self, x: float) -> float:
+        """Add a raw value and return the moving average."""
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            if math.isnan(oldest):
+                self._nans -= 1
+            else:
+                self._sum -= oldest
+        self._window.append(x)
+        if math.isnan(x):
+            self._nans += 1
+        else:
+            self._sum += x
+        return self.value
+
+    def update(self, bar: Bar) -> float:
+        return self.push(float(bar[self.source]))
+
+    @property
+    def value(self) -> float:
+        if len(self._window) < self.period or self._nans:
+            return NAN
+        return self._sum / self.period
+
+    def params(self) -> dict[str, Any]:
+        return {"period": self.period, "source": self.source}
+
+    def get_state(self) -> dict[str, Any]:
+        return {"window": [_encode(x) for x in self._window]}
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self._window = deque((_decode(x) for x in state["window"]), maxlen=self.period)
+        self._nans = sum(1 for x in self._window if math.isnan(x))
+        self._sum = math.fsum(x for x in self._window if not math.isnan(x))
+
+
+class EMAState(IndicatorState):
+    """Exponential moving average seeded with the first value."""
+
+    kind = "ema"
+
+    def __init__(self, period: int = 20, source: str = "close") -> None:
+        self.period = period
+        self.source = source
+        self._alpha = 2.0 / (period + 1)
+        self._ema = NAN
+
+    def push(self, x: float) -> float:
+        """Add a raw value and return the moving average."""
+        if math.isnan(self._ema):
+            self._ema = x
+        else:
+            self._ema = self._ema + self._alpha * (x - self._ema)
+        return self._ema
+
+    def update(self, bar: Bar) -> float:
+        return self.push(float(bar[self.source]))
+
+    @property
+    def value(self) -> float:
+        return self._ema
+
+    def params(self) -> dict[str, Any]:
+        return {"period": self.period, "source": self.source}
+
+    def get_state(self) -> dict[str, Any]:
+        return {"ema": _encode(self._ema)}
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self._ema = _decode(state["ema"])
+
+
+class RSIState(IndicatorState):
+    """Relative Strength Index with Wilder smoothing."""
+
+    kind = "rsi"
+
+    def __init__(self, period: int = 14, source: str = "close") -> None:
+        self.period = period
+        self.source = source
+        self._prev = NAN
+        self._count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def push(self, x: float) -> float:
+        """Add a raw value and return the RSI."""
+        delta = x - self._prev if not math.isnan(self._prev) else 0.0
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self._prev = x
+        self._count += 1
+
+        if self._count <= self.period:
+            # Expanding mean until the first full window
+            self._avg_gain += (gain - self._avg_gain) / self._count
+            self._avg_loss += (loss - self._avg_loss) / self._count
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        return self.value
+
+    def update(self, bar: Bar) -> float:
+        return self.push(float(bar[self.source]))
+
+    @property
+    def value(self) -> float:
+        if self._count == 0 or (self._avg_gain == 0 and self._avg_loss == 0):
+            return 50.0
+        if self._avg_loss == 0:
+            return 100.0
+        rs = self._avg_gain / self._avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def params(self) -> dict[str, Any]:
+        return {"period": self.period, "source": self.source}
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "prev": _encode(self._prev),
+            "count": self._count,
+            "avg_gain": self._avg_gain,
+            "avg_loss": self._avg_loss,
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self._prev = _decode(state["prev"])
+        self._count = int(state["count"])
+        self._avg_gain = float(state["avg_gain"])
+        self._avg_loss = float(state["avg_loss"])
+
+
+class MACDState(IndicatorState):
+    """MACD line, signal line and histogram."""
+
+    kind = "macd"
+
+    def __init__(
+        self,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+        source: str = "close",
+    ) -> None:
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.source = source
+        self._fast = EMAState(fast_period)
+        self._slow = EMAState(slow_period)
+        self._signal = EMAState(signal_period)
+
+    def update(self, bar: Bar) -> dict[str, float]:
+        x = float(bar[self.source])
+        macd_line = self._fast.push(x) - self._slow.push(x)
+        self._signal.push(macd_line)
+        return self.value
+
+    @property
+    def value(self) -> dict[str, float]:
+        macd_line = self._fast.value - self._slow.value
+        signal_line = self._signal.value
+        return {
+            "macd": macd_line,
+            "signal": signal_line,
+            "histogram": macd_line - signal_line,
+        }
+
+    def params(self) -> dict[str, Any]:
+        return {
+            "fast_period": self.fast_period,
+            "slow_period": self.slow_period,
+            "signal_period": self.signal_period,
+            "source": self.source,
+        }
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "fast": self._fast.get_state(),
+            "slow": self._slow.get_state(),
+            "signal": self._signal.get_state(),
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self._fast.set_state(state["fast"])
+        self._slow.set_state(state["slow"])
+        self._signal.set_state(state["signal"])
+
+
+class BollingerBandsState(IndicatorState):
+    """Bollinger Bands using a sliding-window Welford variance."""
+
+    kind = "bollinger_bands"
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0, source: str = "close") -> None:
+        self.period = period
+        self.std_dev = std_dev
+        self.source = source
+        self._window: deque[float] = deque(maxlen=period)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, bar: Bar) -> dict[str, float]:
+        x = float(bar[self.source])
+        n = len(self._window)
+
+        if n < self.period:
+            # Growing window: standard Welford step
+            n += 1
+            delta = x - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (x - self._mean)
+        else:
+            # Full window: replace the oldest value
+            old = self._window[0]
+            old_mean = self._mean
+            self._mean += (x - old) / n
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+
+        self._window.append(x)
+        return self.value
+
+    @property
+    def value(self) -> dict[str, float]:
+        if len(self._window) < self.period:
+            return {"upper": NAN, "middle": NAN, "lower": NAN}
+
+        variance = max(self._m2, 0.0) / (self.period - 1) if self.period > 1 else NAN
+        std = math.sqrt(variance)
+        return {
+            "upper": self._mean + std * self.std_dev,
+            "middle": self._mean,
+            "lower": self._mean - std * self.std_dev,
+        }
+
+    def params(self) -> dict[str, Any]:
+        return {"period": self.period, "std_dev": self.std_dev, "source": self.source}
+
+    def get_state(self) -> dict[str, Any]:
+        return {"window": list(self._window)}
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self._window = deque(maxlen=self.period)
+        self._mean = 0.0
+        self._m2 = 0.0
+        for x in state["window"]:
+            self.update({self.source: x})
+
+
+class RollingExtremaState(IndicatorState):
+    """Rolling minimum and maximum using monotonic deques."""
+
+    kind = "rolling_extrema"
+
+    def __init__(
+        self, period: int = 14, low_source: str = "low", high_source: str = "high"
+    ) -> None:
+        self.period = period
+        self.low_source = low_source
+        self.high_source = high_source
+        self._index = 0
+        self._mins: deque[tuple[int, float]] = deque()
+        self._maxs: deque[tuple[int, float]] = deque()
+
+    def push(self, low: float, high: float) -> dict[str, float]:
+        """Add raw low/high values and return the window extrema."""
+        while self._mins and self._mins[-1][1] >= low:
+            self._mins.pop()
+        self._mins.append((self._index, low))
+
+        while self._maxs and self._maxs[-1][1] <= high:
+            self._maxs.pop()
+        self._maxs.append((self._index, high))
+
+        expired = self._index - self.period
+        while self._mins[0][0] <= expired:
+            self._mins.popleft()
+        while self._maxs[0][0] <= expired:
+            self._maxs.popleft()
+
+        self._index += 1
+        return self.value
+
+    def update(self, bar: Bar) -> dict[str, float]:
+        return self.push(float(bar[self.low_source]), float(bar[self.high_source]))
+
+    @property
+    def value(self) -> dict[str, float]:
+        if self._index < self.period:
+            return {"min": NAN, "max": NAN}
+        return {"min": self._mins[0][1], "max": self._maxs[0][1]}
+
+    def params(self) -> dict[str, Any]:
+        return {
+            "period": self.period,
+            "low_source": self.low_source,
+            "high_source": self.high_source,
+        }
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "index": self._index,
+            "mins": [list(item) for item in self._mins],
+            "maxs": [list(item) for item in self._maxs],
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self._index = int(state["index"])
+        self._mins = deque((int(i), float(v)) for i, v in state["mins"])
+        self._maxs = deque((int(i), float(v)) for i, v in state["maxs"])
+
+
+class StochasticState(IndicatorState):
+    """Stochastic oscillator %K and %D."""
+
+    kind = "stochastic"
+
+    def __init__(self, k_period: int = 14, d_period: int = 3) -> None:
+        self.k_period = k_period
+        self.d_period = d_period
+        self._extrema = RollingExtremaState(k_period)
+        self._d = SMAState(d_period)
+        self._k = NAN
+
+    def update(self, bar: Bar) -> dict[str, float]:
+        extrema = self._extrema.update(bar)
+        spread = extrema["max"] - extrema["min"]
+        if math.isnan(spread) or spread == 0:
+            self._k = NAN
+        else:
+            self._k = 100 * (float(bar["close"]) - extrema["min"]) / spread
+        self._d.push(self._k)
+        return self.value
+
+    @property
+    def value(self) -> dict[str, float]:
+        return {"k": self._k, "d": self._d.value}
+
+    def params(self) -> dict[str, Any]:
+        return {"k_period": self.k_period, "d_period": self.d_period}
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "k": _encode(self._k),
+            "extrema": self._extrema.get_state(),
+            "d": self._d.get_state(),
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self._k = _decode(state["k"])
+        self._extrema.set_state(state["extrema"])
+        self._d.set_state(state["d"])
+
+
+def dumps_states(states: Mapping[str, IndicatorState]) -> str:
+    """Serialize named indicator states to a JSON string."""
+    return json.dumps({name: state.to_dict() for name, state in states.items()})
+
+
+def loads_states(payload: str | bytes) -> dict[str, IndicatorState]:
+    """Deserialize named indicator states produced by ``dumps_states``."""
+    return {name: IndicatorState.from_dict(data) for name, data in json.loads(payload).items()}
@@ -5,9 +5,10 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 
-import pandas as pd
-
+from app.core.exchanges import exchange_pool
+from app.services.candle_store import CandleStore
 from app.services.market_data_service import MarketDataService
+from app.utils.ohlcv import OHLCVFrame
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,43 +26,39 @@ async def fetch_and_save_data(
     output_dir: str,
 ) -> None:
     """Fetch historical data and save to CSV."""
-    service = MarketDataService()
+    service = MarketDataService(candle_store=CandleStore())
 
     try:
         logger.info(f"Fetching data for {symbol} from {exchange}")
         logger.info(f"Period: {start_date} to {end_date}")
         logger.info(f"Timeframe: {timeframe}")
 
-        data = await service.get_ohlcv(
+        symbol_clean = symbol.replace("/", "_").replace(":", "_")
+        filename = f"{output_dir}/{symbol_clean}_{timeframe}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
+
+        # Pages are appended as they arrive so memory stays flat
+        count = 0
+        async for page in service.stream_ohlcv(
             symbol=symbol,
             exchange=exchange,
             timeframe=timeframe,
             start_date=start_date,
             end_date=end_date,
-            limit=10000,
-        )
+        ):
+            df = OHLCVFrame.from_rows(page).to_frame()
+            df.to_csv(filename, mode="w" if count == 0 else "a", header=count == 0)
+            count += len(df)
 
-        if not data:
+        if not count:
             logger.warning(f"No data returned for {symbol}")
             return
 
-        df = pd.DataFrame(data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-
-        symbol_clean = symbol.replace("/", "_").replace(":", "_")
-        filename = f"{output_dir}/{symbol_clean}_{timeframe}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
-
-        df.to_csv(filename)
-        logger.info(f"Saved {len(df)} records to {filename}")
+        logger.info(f"Saved {count} records to {filename}")
 
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {e}")
         raise
 
-    finally:
-        await service.close_all()
-
 
 async def fetch_multiple_symbols(
     symbols: list[str],
@@ -149,13 +146,16 @@ async def main() -> None:
     logger.info(f"Days: {args.days}")
     logger.info(f"Output: {args.output}")
 
-    await fetch_multiple_symbols(
-        symbols=args.symbols,
-        exchange=args.exchange,
-        timeframe=args.timeframe,
-        days=args.days,
-        output_dir=args.output,
-    )
+    try:
+        await fetch_multiple_symbols(
+            symbols=args.symbols,
+            exchange=args.exchange,
+            timeframe=args.timeframe,
+            days=args.days,
+            output_dir=args.output,
+        )
+    finally:
+        await exchange_pool.close_all()
 
     logger.info("Data fetch completed")
 
@@ -1,6 +1,7 @@
 """Pytest fixtures for testing."""
 
 import asyncio
+import time
 from collections.abc import AsyncGenerator, Generator
 from typing import Any
 from uuid import uuid4
@@ -13,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.redis import RedisClient
 from app.core.security import create_access_token, get_password_hash
 from app.main import app
 from app.models import Base
@@ -88,6 +90,43 @@ async def auth_headers(test_user: User) -> dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
+class FakeRedis:
+    """In-memory stand-in for the redis-py client."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[str, float | None]] = {}
+
+    async def get(self, key: str) -> str | None:
+        value = self.data.get(key)
+        if value is None:
+            return None
+        if value[1] is not None and value[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return value[0]
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and await self.get(key) is not None:
+            return None
+        ttl = px / 1000 if px else ex
+        self.data[key] = (value, time.monotonic() + ttl if ttl else None)
+        return True
+
+    async def delete(self, key: str) -> int:
+        return 1 if self.data.pop(key, None) else 0
+
+    async def exists(self, key: str) -> int:
+        return 1 if await self.get(key) is not None else 0
+
+
+@pytest.fixture
+def fake_redis() -> RedisClient:
+    """Create a Redis client backed by an in-memory fake."""
+    client = RedisClient()
+    client._client = FakeRedis()
+    return client
+
+
 @pytest.fixture(scope="function")
 def client() -> Generator[TestClient, None, None]:
     """Create test client."""
@@ -0,0 +1,339 @@
+"""Unit tests for the per-symbol backtest engine."""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services import backtest_engine
+from app.services.backtest_engine import (
+    SymbolData,
+    SymbolResult,
+    compute_signals,
+    evaluate_batch,
+    evaluate_shared_batch,
+    map_in_workers,
+    merge_equity,
+    rolling_windows,
+    run_symbol,
+    run_symbols,
+    run_walk_forward,
+    share_with_workers,
+    simulate,
+    summarize,
+)
+
+RULES = {
+    "conditions": [{"indicator": "rsi_14", "operator": "lt", "value": 45}],
+    "logic": "and",
+}
+EXIT_RULES = [{"conditions": [{"indicator": "rsi_14", "operator": "gt", "value": 60}]}]
+
+
+def make_frame(seed: int, bars: int = 300) -> pd.DataFrame:
+    """Create a random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    index = pd.date_range("2024-01-01", periods=bars, freq="h", name="timestamp")
+    return pd.DataFrame(
+        {
+            "open": close * 0.999,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.uniform(100, 200, bars),
+        },
+        index=index,
+    )
+
+
+def reference_simulation(closes, entry_signals, exit_signals, capital):
+    """Per-bar loop the engine replaced, for parity checks."""
+    equity, position, trades = [], None, 0
+    for i in range(20, len(closes)):
+        price = closes[i]
+        equity.append(capital + (position["quantity"] * price if position else 0))
+        if position is None:
+            if entry_signals[i]:
+                quantity = capital * 0.95 / price
+                position = {"entry_price": price, "quantity": quantity}
+                capital -= quantity * price
+        else:
+            pnl_percent = (price - position["entry_price"]) / position["entry_price"]
+            if exit_signals[i] or pnl_percent >= 0.05 or pnl_percent <= -0.02:
+                capital += position["quantity"] * price
+                position = None
+                trades += 1
+    if position:
+        capital += position["quantity"] * closes[-1]
+    return equity, capital, trades
+
+
+class TestSimulate:
+    """Test cases for the trading simulation."""
+
+    def test_matches_reference_loop(self):
+        """Test results equal the original per-bar loop."""
+        rng = np.random.default_rng(7)
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 500)))
+        entry = rng.random(500) < 0.1
+        exit_ = rng.random(500) < 0.05
+        timestamps = np.arange(500, dtype=np.int64)
+
+        result = simulate("BTC/USDT", timestamps, closes, entry, exit_, 10000.0)
+        equity, capital, trades = reference_simulation(closes, entry, exit_, 10000.0)
+
+        np.testing.assert_allclose(result.equity, equity)
+        assert result.final_capital == pytest.approx(capital)
+        assert len(result.trades) == trades
+        assert result.timestamps[0] == 20
+
+    def test_take_profit_trade(self):
+        """Test a take-profit exit records the trade."""
+        closes = np.array([100.0] * 21 + [106.0])
+        entry = np.zeros(22, dtype=bool)
+        entry[20] = True
+
+        result = simulate("ETH/USDT", np.arange(22), closes, entry, np.zeros(22, bool), 1000.0)
+
+        (trade,) = result.trades.records()
+        assert trade["entry_time"] == 20
+        assert trade["exit_time"] == 21
+        assert trade["pnl_percent"] == pytest.approx(6.0)
+        assert result.final_capital == pytest.approx(1000.0 + 950.0 * 0.06)
+
+    def test_invested_value(self):
+        """Test the held position value is tracked alongside equity."""
+        closes = np.array([100.0] * 21 + [101.0, 103.0, 106.0, 106.0])
+        entry = np.zeros(25, dtype=bool)
+        entry[20] = True
+
+        result = simulate("ETH/USDT", np.arange(25), closes, entry, np.zeros(25, bool), 1000.0)
+
+        quantity = 950.0 / 100.0
+        np.testing.assert_allclose(
+            result.invested, [0.0, 101 * quantity, 103 * quantity, 106 * quantity, 0.0]
+        )
+        np.testing.assert_allclose(
+            result.equity - result.invested, [1000.0, 50.0, 50.0, 50.0, 1057.0]
+        )
+
+    def test_short_series(self):
+        """Test series shorter than the warm-up produce no equity."""
+        result = simulate("X", np.arange(5), np.ones(5), np.ones(5, bool), np.ones(5, bool), 50.0)
+
+        assert len(result.equity) == 0
+        assert result.final_capital == 50.0
+
+
+class TestMergeEquity:
+    """Test cases for merging per-symbol equity."""
+
+    def test_aligns_and_carries_forward(self):
+        """Test symbols on different timestamps are summed with carry-forward."""
+        first = SymbolResult("A", np.array([1, 2, 3]), np.array([100.0, 110.0, 120.0]), 120.0)
+        second = SymbolResult("B", np.array([2, 4]), np.array([90.0, 80.0]), 80.0)
+
+        timeline, equity = merge_equity([first, second], allocation=100.0)
+
+        assert timeline.tolist() == [1, 2, 3, 4]
+        assert equity.tolist() == [200.0, 200.0, 210.0, 200.0]
+
+    def test_idle_sleeves(self):
+        """Test symbols without data are kept as cash."""
+        only = SymbolResult("A", np.array([1, 2]), np.array([100.0, 105.0]), 105.0)
+        empty = SymbolResult("B", np.empty(0, np.int64), np.empty(0), 100.0)
+
+        _, equity = merge_equity([only, empty], allocation=100.0, idle_sleeves=1)
+
+        assert equity.tolist() == [300.0, 305.0]
+
+
+class TestRunSymbols:
+    """Test cases for running symbols across workers."""
+
+    def test_symbol_data_round_trip(self):
+        """Test frames survive conversion to compact arrays."""
+        df = make_frame(1)
+        data = SymbolData.from_frame("BTC/USDT", df)
+
+        assert data.ohlcv.dtype == np.float64
+        assert data.timestamps[1] - data.timestamps[0] == 3600 * 10**9
+        pd.testing.assert_frame_equal(
+            data.to_frame(), df.set_axis(df.index.as_unit("ns")), check_freq=False
+        )
+
+    async def test_parallel_matches_sequential(self):
+        """Test pooled results equal running each symbol directly."""
+        datasets = [SymbolData.from_frame(f"S{i}/USDT", make_frame(i)) for i in range(3)]
+
+        results = await run_symbols(datasets, "1h", RULES, EXIT_RULES, 1000.0)
+
+        assert [r.symbol for r in results] == ["S0/USDT", "S1/USDT", "S2/USDT"]
+        for data, result in zip(datasets, results, strict=True):
+            expected = run_symbol(data, "1h", RULES, EXIT_RULES, 1000.0)
+            np.testing.assert_allclose(result.equity, expected.equity)
+            assert result.trades.records() == expected.trades.records()
+
+
+class TestWalkForward:
+    """Test cases for walk-forward windows."""
+
+    HOUR = 3600 * 10**9
+
+    def test_rolling_windows(self):
+        """Test windows step by the test period and clip the last one."""
+        assert rolling_windows(0, 99, train=40, test=25) == [
+            (0, 40, 65),
+            (25, 65, 90),
+            (50, 90, 100),
+        ]
+        assert rolling_windows(0, 99, train=40, test=30, anchored=True) == [
+            (0, 40, 70),
+            (0, 70, 100),
+        ]
+        assert rolling_windows(0, 30, train=40, test=10) == []
+
+    async def test_windows_trade_full_series_signals(self):
+        """Test each test period trades the full-series signals of its bars."""
+        datasets = [SymbolData.from_frame(f"S{i}/USDT", make_frame(i, bars=500)) for i in range(2)]
+        variants = [(RULES, EXIT_RULES)]
+
+        result = await run_walk_forward(
+            datasets, "1h", variants, 500.0, train=100 * self.HOUR, test=60 * self.HOUR
+        )
+
+        signals = [compute_signals(d, "1h", variants) for d in datasets]
+        assert len(result["windows"]) == 7
+        for window in result["windows"]:
+            _, test_start, test_end = window["window"]
+            expected = summarize(
+                [s.between(test_start, test_end).simulate(0, 500.0) for s in signals],
+                500.0,
+                timeframe="1h",
+            )
+            np.testing.assert_allclose(window["result"].equity, expected["equity"])
+            assert window["test"]["total_return"] == pytest.approx(expected["total_return"])
+
+    async def test_stitched_curve_compounds_windows(self):
+        """Test the out-of-sample curve chains each window's return."""
+        datasets = [SymbolData.from_frame("BTC/USDT", make_frame(3, bars=600))]
+
+        result = await run_walk_forward(
+            datasets,
+            "1h",
+            [(RULES, EXIT_RULES)],
+            1000.0,
+            train=150 * self.HOUR,
+            test=100 * self.HOUR,
+        )
+        stitched = result["result"]
+
+        growth = np.prod([1 + w["test"]["total_return"] / 100 for w in result["windows"]])
+        assert stitched.final_capital == pytest.approx(1000.0 * growth)
+        assert stitched.timestamps[0] == datasets[0].timestamps[170]
+        assert np.all(np.diff(stitched.timestamps) > 0)
+        assert len(stitched.trades) == sum(w["test"]["total_trades"] for w in result["windows"])
+
+    async def test_best_training_variant_is_traded(self):
+        """Test the variant with the best training score is used out of sample."""
+        datasets = [SymbolData.from_frame("BTC/USDT", make_frame(5, bars=400))]
+        never = {"conditions": [{"indicator": "rsi_14", "operator": "lt", "value": -1}]}
+        variants = [(never, EXIT_RULES), (RULES, EXIT_RULES)]
+
+        result = await run_walk_forward(
+            datasets,
+            "1h",
+            variants,
+            1000.0,
+            train=120 * self.HOUR,
+            test=80 * self.HOUR,
+            objective="total_return",
+        )
+
+        (signals,) = [compute_signals(d, "1h", variants) for d in datasets]
+        chosen = []
+        for window in result["windows"]:
+            train_start, test_start, _ = window["window"]
+            trained = signals.between(train_start, test_start).simulate(1, 1000.0)
+            expected = 1 if trained.final_capital > 1000.0 else 0
+            assert window["variant"] == expected
+            chosen.append(window["variant"])
+        assert set(chosen) == {0, 1}
+
+
+class TestPoolSize:
+    """Test cases for sizing the worker pool."""
+
+    def test_cores_split_between_pool_owners(self, monkeypatch: pytest.MonkeyPatch):
+        """Test each Celery child gets its share of the cores."""
+        monkeypatch.setattr(settings, "BACKTEST_WORKERS", 0)
+        monkeypatch.setattr(backtest_engine.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(backtest_engine, "_pool_owners", 1)
+        assert backtest_engine.pool_size() == 8
+
+        backtest_engine.set_pool_owners(4)
+        assert backtest_engine.pool_size() == 2
+
+        backtest_engine.set_pool_owners(16)
+        assert backtest_engine.pool_size() == 1
+
+    def test_explicit_setting_wins(self, monkeypatch: pytest.MonkeyPatch):
+        """Test BACKTEST_WORKERS overrides the default."""
+        monkeypatch.setattr(settings, "BACKTEST_WORKERS", 3)
+        monkeypatch.setattr(backtest_engine, "_pool_owners", 4)
+        assert backtest_engine.pool_size() == 3
+
+
+class CountedData:
+    """Payload counting how often it is pickled."""
+
+    pickles = 0
+
+    def __init__(self, values: list[int]) -> None:
+        self.values = values
+
+    def __reduce__(self):
+        CountedData.pickles += 1
+        return CountedData, (self.values,)
+
+
+def add_shared(item: int, key: str) -> int:
+    return item + sum(backtest_engine.shared(key).values)
+
+
+class TestShareWithWorkers:
+    """Test cases for sending data to workers once."""
+
+    async def test_data_sent_once_per_worker(self, monkeypatch: pytest.MonkeyPatch):
+        """Test jobs carry only the key, not the data."""
+        monkeypatch.setattr(settings, "BACKTEST_WORKERS", 2)
+        monkeypatch.setattr(CountedData, "pickles", 0)
+        items = list(range(12))
+
+        with share_with_workers(CountedData([1, 2, 3]), len(items)) as (key, executor):
+            assert executor is not None
+            results = await map_in_workers(partial(add_shared, key=key), items, None, executor)
+
+        assert results == [item + 6 for item in items]
+        # At most one copy per worker, however many batches ran
+        assert CountedData.pickles <= 2
+
+    async def test_thread_fallback_reads_local_copy(self, monkeypatch: pytest.MonkeyPatch):
+        """Test jobs run in-process when no pool can be started."""
+        monkeypatch.setattr(backtest_engine, "_executor", None)
+        monkeypatch.setattr(backtest_engine, "_executor_failed", True)
+        datasets = [SymbolData.from_frame("BTC/USDT", make_frame(1))]
+        variants = [(RULES, EXIT_RULES), ({**RULES, "logic": "or"}, [])]
+        arguments = {"datasets": datasets, "timeframe": "1h", "allocation": 1000.0}
+
+        with share_with_workers(arguments, 2) as (key, executor):
+            assert executor is None
+            results = await map_in_workers(
+                partial(evaluate_shared_batch, key=key), [variants[:1], variants[1:]]
+            )
+
+        assert [r for batch in results for r in batch] == evaluate_batch(variants, **arguments)
+        assert key not in backtest_engine._shared
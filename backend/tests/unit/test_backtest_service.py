@@ -0,0 +1,203 @@
+"""Unit tests for backtest persistence."""
+
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models.backtest import Backtest, BacktestTrade
+from app.models.strategy import Strategy
+from app.services.backtest_engine import TradeLog
+from app.services.backtest_service import (
+    TRADE_INSERT_CHUNK_SIZE,
+    BacktestService,
+    result_fingerprint,
+)
+
+HOUR = 3600 * 10**9
+
+
+def make_trades(count: int) -> TradeLog:
+    """Create a log of alternating winning and losing trades."""
+    entry_times = [i * 2 * HOUR for i in range(count)]
+    return TradeLog.from_columns(
+        "BTC/USDT",
+        entry_times,
+        [t + HOUR for t in entry_times],
+        [100.0] * count,
+        [105.0 if i % 2 else 98.0 for i in range(count)],
+        [1.5] * count,
+    )
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session with the trades table in in-memory SQLite."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(BacktestTrade.__table__.create)
+
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+    await engine.dispose()
+
+
+class TestSaveTrades:
+    """Test cases for bulk trade inserts."""
+
+    async def test_rows_match_trade_log(self, db: AsyncSession):
+        """Test every trade is written with its derived values."""
+        backtest_id = uuid.uuid4()
+        count = TRADE_INSERT_CHUNK_SIZE + 5
+
+        assert await BacktestService(db).save_trades(backtest_id, make_trades(count)) == count
+
+        rows = (
+            (await db.execute(select(BacktestTrade).order_by(BacktestTrade.entry_time)))
+            .scalars()
+            .all()
+        )
+        assert len(rows) == count
+        first, second = rows[0], rows[1]
+        assert first.backtest_id == backtest_id
+        assert first.side == "long"
+        assert float(first.pnl) == pytest.approx(-3.0)
+        assert float(first.pnl_percent) == pytest.approx(-2.0)
+        assert float(second.pnl) == pytest.approx(7.5)
+        assert first.entry_time.replace(tzinfo=UTC) == datetime(1970, 1, 1, tzinfo=UTC)
+        assert first.created_at is not None
+        assert len({row.id for row in rows}) == count
+
+    async def test_replaces_existing_trades(self, db: AsyncSession):
+        """Test saving again does not duplicate a backtest's trades."""
+        backtest_id, other_id = uuid.uuid4(), uuid.uuid4()
+        service = BacktestService(db)
+        await service.save_trades(other_id, make_trades(3))
+
+        await service.save_trades(backtest_id, make_trades(4))
+        await service.save_trades(backtest_id, make_trades(2))
+
+        counts = dict(
+            (
+                await db.execute(
+                    select(BacktestTrade.backtest_id, func.count()).group_by(
+                        BacktestTrade.backtest_id
+                    )
+                )
+            ).all()
+        )
+        assert counts == {backtest_id: 2, other_id: 3}
+
+    async def test_empty_log(self, db: AsyncSession):
+        """Test an empty log writes nothing."""
+        assert await BacktestService(db).save_trades(uuid.uuid4(), TradeLog.empty()) == 0
+
+
+def make_backtest(**overrides) -> Backtest:
+    """Create an unsaved backtest."""
+    fields = {
+        "id": uuid.uuid4(),
+        "strategy_id": uuid.uuid4(),
+        "start_date": date(2024, 1, 1),
+        "end_date": date(2024, 3, 31),
+        "symbols": ["BTC/USDT", "ETH/USDT"],
+        "timeframe": "1h",
+        "initial_capital": Decimal("10000"),
+        "walk_forward": None,
+    }
+    return Backtest(**{**fields, **overrides})
+
+
+RULES = {"conditions": [{"indicator": "rsi_14", "operator": "<", "value": 30}]}
+DATA = [{"count": 2160, "first": 0, "last": 1, "close_sum": 1.0}]
+
+
+class TestResultFingerprint:
+    """Test cases for backtest result fingerprints."""
+
+    def test_identical_runs_match(self):
+        """Test two backtests with the same inputs share a fingerprint."""
+        strategy = Strategy(rules=RULES, exit_rules=[])
+        first = result_fingerprint(make_backtest(), strategy, DATA)
+        second = result_fingerprint(
+            make_backtest(initial_capital=Decimal("10000.00000000")), strategy, DATA
+        )
+        assert first == second
+        assert len(first) == 64
+
+    def test_inputs_change_fingerprint(self):
+        """Test rules, settings and market data all affect the fingerprint."""
+        strategy = Strategy(rules=RULES, exit_rules=[])
+        base = result_fingerprint(make_backtest(), strategy, DATA)
+
+        edited = Strategy(
+            rules={"conditions": [{"indicator": "rsi_14", "operator": "<", "value": 25}]},
+            exit_rules=[],
+        )
+        new_data = [{**DATA[0], "count": 2161}]
+        assert result_fingerprint(make_backtest(), edited, DATA) != base
+        assert result_fingerprint(make_backtest(timeframe="4h"), strategy, DATA) != base
+        assert result_fingerprint(make_backtest(end_date=date(2024, 4, 1)), strategy, DATA) != base
+        assert result_fingerprint(make_backtest(), strategy, new_data) != base
+
+
+class TestCopyResults:
+    """Test cases for reusing the results of a completed backtest."""
+
+    async def test_copies_metrics_and_trades(self, db: AsyncSession):
+        """Test the copy gets the source's metrics and its own trade rows."""
+        service = BacktestService(db)
+        source = make_backtest(
+            status="completed",
+            fingerprint="f" * 64,
+            total_return=Decimal("12.5"),
+            total_trades=3,
+            equity_data=b"curve",
+        )
+        target = make_backtest(status="pending")
+        await service.save_trades(source.id, make_trades(3))
+
+        await service.copy_results(source, target)
+
+        assert target.status == "completed"
+        assert target.completed_at is not None
+        assert target.cached_from_id == source.id
+        assert target.fingerprint == source.fingerprint
+        assert target.total_return == Decimal("12.5")
+        assert target.equity_data == b"curve"
+
+        rows = (
+            (
+                await db.execute(
+                    select(BacktestTrade)
+                    .where(BacktestTrade.backtest_id == target.id)
+                    .order_by(BacktestTrade.exit_time)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        source_rows = (
+            (
+                await db.execute(
+                    select(BacktestTrade)
+                    .where(BacktestTrade.backtest_id == source.id)
+                    .order_by(BacktestTrade.exit_time)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert len(rows) == 3
+        assert [r.pnl for r in rows] == [r.pnl for r in source_rows]
+        assert not {r.id for r in rows} & {r.id for r in source_rows}
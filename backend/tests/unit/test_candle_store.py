@@ -0,0 +1,289 @@
+"""Unit tests for the OHLCV candle store."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.core.exchanges import ExchangePool
+from app.models.market_data import OHLCVCandle, OHLCVEmptyRange
+from app.services.candle_store import CandleStore, find_gaps, subtract_ranges
+from app.services.market_data_service import MarketDataService
+
+HOUR_MS = 3_600_000
+START_MS = 1_700_000_000_000 // HOUR_MS * HOUR_MS
+
+
+class FakeExchange:
+    """Minimal ccxt-like exchange serving a synthetic hourly series."""
+
+    def __init__(self, now_ms: int, max_rows: int = 1000, listed_ms: int = 0) -> None:
+        self.now_ms = now_ms
+        self.max_rows = max_rows
+        self.listed_ms = listed_ms
+        self.calls: list[tuple[int, int]] = []
+
+    @staticmethod
+    def parse_timeframe(timeframe: str) -> int:
+        return 3600
+
+    def milliseconds(self) -> int:
+        return self.now_ms
+
+    async def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=None):
+        self.calls.append((since, limit))
+        rows = []
+        ts = max(since, self.listed_ms)
+        while ts < self.now_ms and len(rows) < min(limit, self.max_rows):
+            price = float(ts // HOUR_MS % 1000)
+            rows.append([ts, price, price + 1, price - 1, price + 0.5, 10.0])
+            ts += HOUR_MS
+        return rows
+
+    async def close(self) -> None:
+        pass
+
+
+def make_service(exchange: FakeExchange, candle_store: CandleStore | None = None):
+    """Create a service whose pool serves the fake exchange."""
+    pool = ExchangePool()
+    pool._clients["binance"] = exchange
+    return MarketDataService(candle_store=candle_store, pool=pool)
+
+
+@pytest_asyncio.fixture
+async def candle_store():
+    """Create a candle store backed by in-memory SQLite."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(OHLCVCandle.__table__.create)
+        await conn.run_sync(OHLCVEmptyRange.__table__.create)
+
+    yield CandleStore(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+
+    await engine.dispose()
+
+
+class TestFindGaps:
+    """Test cases for gap detection."""
+
+    def test_empty_store(self):
+        """Test the whole range is missing when nothing is stored."""
+        assert find_gaps([], 0, 5 * HOUR_MS, HOUR_MS) == [(0, 5 * HOUR_MS)]
+
+    def test_head_middle_tail(self):
+        """Test gaps before, between and after stored candles."""
+        stored = [2 * HOUR_MS, 3 * HOUR_MS, 6 * HOUR_MS]
+        assert find_gaps(stored, 0, 8 * HOUR_MS, HOUR_MS) == [
+            (0, HOUR_MS),
+            (4 * HOUR_MS, 5 * HOUR_MS),
+            (7 * HOUR_MS, 8 * HOUR_MS),
+        ]
+
+    def test_complete_range(self):
+        """Test no gaps when every candle is stored."""
+        stored = [i * HOUR_MS for i in range(5)]
+        assert find_gaps(stored, 0, 4 * HOUR_MS, HOUR_MS) == []
+
+    def test_unaligned_bounds(self):
+        """Test range bounds are aligned to candle open times."""
+        assert find_gaps([], HOUR_MS // 2, 2 * HOUR_MS + 1, HOUR_MS) == [(HOUR_MS, 2 * HOUR_MS)]
+
+
+class TestSubtractRanges:
+    """Test cases for removing known-empty ranges from gaps."""
+
+    def test_cuts_inside_and_across(self):
+        """Test removed ranges split and trim the gaps they overlap."""
+        gaps = [(0, 9 * HOUR_MS), (20 * HOUR_MS, 29 * HOUR_MS)]
+        removed = [(3 * HOUR_MS, 4 * HOUR_MS), (8 * HOUR_MS, 22 * HOUR_MS)]
+
+        assert subtract_ranges(gaps, removed, HOUR_MS) == [
+            (0, 2 * HOUR_MS),
+            (5 * HOUR_MS, 7 * HOUR_MS),
+            (23 * HOUR_MS, 29 * HOUR_MS),
+        ]
+
+    def test_nothing_removed(self):
+        """Test gaps are unchanged without overlapping ranges."""
+        gaps = [(10 * HOUR_MS, 12 * HOUR_MS)]
+        assert subtract_ranges(gaps, [(0, 5 * HOUR_MS)], HOUR_MS) == gaps
+
+
+class TestCandleStore:
+    """Test cases for CandleStore."""
+
+    async def test_save_and_read(self, candle_store: CandleStore):
+        """Test candles round-trip and upsert replaces values."""
+        rows = [[START_MS + i * HOUR_MS, 1.0, 2.0, 0.5, 1.5, 100.0] for i in range(3)]
+        await candle_store.save_candles("BTC/USDT", "binance", "1h", rows)
+        await candle_store.save_candles(
+            "BTC/USDT", "binance", "1h", [[START_MS, 9.0, 9.0, 9.0, 9.0, 9.0]]
+        )
+
+        stored = await candle_store.get_candles(
+            "BTC/USDT", "binance", "1h", START_MS, START_MS + 10 * HOUR_MS
+        )
+
+        assert [row[0] for row in stored] == [START_MS + i * HOUR_MS for i in range(3)]
+        assert stored[0][4] == 9.0
+        assert await candle_store.get_candles("ETH/USDT", "binance", "1h", 0, 2**62) == []
+
+    async def test_range_stats_track_changes(self, candle_store: CandleStore):
+        """Test range stats change when candles are added or revised."""
+        end = START_MS + 10 * HOUR_MS
+        empty = await candle_store.get_range_stats("BTC/USDT", "binance", "1h", START_MS, end)
+        assert empty == {"count": 0, "first": None, "last": None, "close_sum": 0.0}
+
+        rows = [[START_MS + i * HOUR_MS, 1.0, 2.0, 0.5, 1.5, 100.0] for i in range(3)]
+        await candle_store.save_candles("BTC/USDT", "binance", "1h", rows)
+        stats = await candle_store.get_range_stats("BTC/USDT", "binance", "1h", START_MS, end)
+        assert stats == {
+            "count": 3,
+            "first": START_MS,
+            "last": START_MS + 2 * HOUR_MS,
+            "close_sum": 4.5,
+        }
+
+        await candle_store.save_candles(
+            "BTC/USDT", "binance", "1h", [[START_MS, 1.0, 2.0, 0.5, 1.0, 100.0]]
+        )
+        revised = await candle_store.get_range_stats("BTC/USDT", "binance", "1h", START_MS, end)
+        assert revised["close_sum"] == 4.0
+
+
+class TestStoreBackedOHLCV:
+    """Test MarketDataService serves candles from the store."""
+
+    async def test_only_missing_ranges_fetched(self, candle_store: CandleStore):
+        """Test a repeated request does not re-download stored history."""
+        exchange = FakeExchange(now_ms=START_MS + 48 * HOUR_MS + 1)
+        service = make_service(exchange, candle_store)
+        start = datetime.fromtimestamp(START_MS / 1000)
+        end = datetime.fromtimestamp((START_MS + 23 * HOUR_MS) / 1000)
+
+        first = await service.get_ohlcv("BTC/USDT", start_date=start, end_date=end, limit=1000)
+        assert len(first) == 24
+        assert len(exchange.calls) == 1
+
+        second = await service.get_ohlcv("BTC/USDT", start_date=start, end_date=end, limit=1000)
+        assert np.array_equal(second.timestamps, first.timestamps)
+        assert np.array_equal(second.values, first.values)
+        assert len(exchange.calls) == 1
+
+        later_end = datetime.fromtimestamp((START_MS + 35 * HOUR_MS) / 1000)
+        third = await service.get_ohlcv(
+            "BTC/USDT", start_date=start, end_date=later_end, limit=1000
+        )
+        assert len(third) == 36
+        assert exchange.calls[-1][0] == START_MS + 24 * HOUR_MS
+
+    async def test_forming_candle_not_persisted(self, candle_store: CandleStore):
+        """Test the still-open candle is returned but not stored."""
+        exchange = FakeExchange(now_ms=START_MS + 10 * HOUR_MS + 60_000)
+        service = make_service(exchange, candle_store)
+
+        data = await service.get_ohlcv("BTC/USDT", limit=5)
+        stored = await candle_store.get_candles("BTC/USDT", "binance", "1h", 0, 2**62)
+
+        assert len(data) == 5
+        assert len(stored) == 4
+        assert stored[-1][0] == START_MS + 9 * HOUR_MS
+
+    async def test_empty_ranges_not_refetched(self, candle_store: CandleStore):
+        """Test a range before listing is requested from the exchange once."""
+        listed_ms = START_MS + 20 * HOUR_MS
+        exchange = FakeExchange(now_ms=START_MS + 40 * HOUR_MS + 1, listed_ms=listed_ms)
+        service = make_service(exchange, candle_store)
+        start = datetime.fromtimestamp(START_MS / 1000)
+        end = datetime.fromtimestamp((START_MS + 29 * HOUR_MS) / 1000)
+
+        first = await service.get_ohlcv("BTC/USDT", start_date=start, end_date=end, limit=None)
+        calls = len(exchange.calls)
+        second = await service.get_ohlcv("BTC/USDT", start_date=start, end_date=end, limit=None)
+
+        assert len(exchange.calls) == calls
+        assert second.timestamps.tolist() == first.timestamps.tolist()
+        assert first.timestamps[0] == listed_ms
+        assert await candle_store.get_empty_ranges(
+            "BTC/USDT", "binance", "1h", START_MS, listed_ms
+        ) == [(START_MS, listed_ms - HOUR_MS)]
+
+
+class TestPaginatedHistory:
+    """Test long ranges are fetched across several exchange calls."""
+
+    @pytest.fixture(autouse=True)
+    def small_pages(self, monkeypatch: pytest.MonkeyPatch):
+        """Use small pages so tests cover many windows."""
+        monkeypatch.setattr(settings, "OHLCV_PAGE_LIMIT", 10)
+        monkeypatch.setattr(settings, "OHLCV_FETCH_CONCURRENCY", 3)
+
+    async def test_full_range_without_store(self):
+        """Test limit=None returns the whole range despite exchange caps."""
+        exchange = FakeExchange(now_ms=START_MS + 200 * HOUR_MS, max_rows=4)
+        service = make_service(exchange)
+        start = datetime.fromtimestamp(START_MS / 1000)
+        end = datetime.fromtimestamp((START_MS + 99 * HOUR_MS) / 1000)
+
+        data = await service.get_ohlcv("BTC/USDT", start_date=start, end_date=end, limit=None)
+
+        assert data.timestamps.tolist() == [START_MS + i * HOUR_MS for i in range(100)]
+        assert data.close[0] == START_MS // HOUR_MS % 1000 + 0.5
+        assert len(exchange.calls) > 10
+
+    async def test_stream_pages_in_order(self, candle_store: CandleStore):
+        """Test streamed pages are chronological and written to the store."""
+        exchange = FakeExchange(now_ms=START_MS + 45 * HOUR_MS + 1)
+        service = make_service(exchange, candle_store)
+        start = datetime.fromtimestamp(START_MS / 1000)
+
+        pages = [page async for page in service.stream_ohlcv("BTC/USDT", start_date=start)]
+
+        assert [len(page) for page in pages] == [10, 10, 10, 10, 6]
+        timestamps = [row[0] for page in pages for row in page]
+        assert timestamps == sorted(timestamps)
+        stored = await candle_store.get_candles("BTC/USDT", "binance", "1h", 0, 2**62)
+        assert len(stored) == 45
+
+    async def test_load_history_is_incremental(self, candle_store: CandleStore):
+        """Test loading the same range twice only fetches it once."""
+        exchange = FakeExchange(now_ms=START_MS + 80 * HOUR_MS + 1)
+        service = make_service(exchange, candle_store)
+        start = datetime.fromtimestamp(START_MS / 1000)
+        end = datetime.fromtimestamp((START_MS + 59 * HOUR_MS) / 1000)
+
+        assert await service.load_history("BTC/USDT", start_date=start, end_date=end) == 60
+        calls = len(exchange.calls)
+
+        assert await service.load_history("BTC/USDT", start_date=start, end_date=end) == 0
+        assert len(exchange.calls) == calls
+
+    async def test_stream_served_from_store(self, candle_store: CandleStore):
+        """Test streaming a stored range again does not refetch it."""
+        exchange = FakeExchange(now_ms=START_MS + 80 * HOUR_MS + 1)
+        service = make_service(exchange, candle_store)
+        start = datetime.fromtimestamp(START_MS / 1000)
+        end = datetime.fromtimestamp((START_MS + 59 * HOUR_MS) / 1000)
+
+        first = [
+            page async for page in service.stream_ohlcv("BTC/USDT", start_date=start, end_date=end)
+        ]
+        calls = len(exchange.calls)
+        second = [
+            page async for page in service.stream_ohlcv("BTC/USDT", start_date=start, end_date=end)
+        ]
+
+        assert len(exchange.calls) == calls
+        assert [len(page) for page in second] == [10] * 6
+        assert [row[0] for page in second for row in page] == [
+            row[0] for page in first for row in page
+        ]
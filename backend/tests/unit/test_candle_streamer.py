@@ -0,0 +1,312 @@
+"""Unit tests for live candle streaming."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.core.events import EventTypes, event_bus
+from app.core.push import PUBLIC_EVENT_TYPES
+from app.models.strategy import Strategy
+from app.services.candle_streamer import CandleBuffer, CandleStreamer, TickerStreamer
+from app.services.live_indicators import IndicatorStateStore, LiveIndicators
+from app.services.strategy_evaluator import LiveStrategyRunner
+from app.utils.ohlcv import OHLCVFrame, SeriesKey
+
+HOUR_MS = 3_600_000
+KEY = SeriesKey("binance", "BTC/USDT", "1h")
+
+
+def candle(i: int, close: float | None = None) -> list[float]:
+    price = close if close is not None else 100.0 + i
+    return [i * HOUR_MS, price, price + 1, price - 1, price, 10.0]
+
+
+class FakeTransport:
+    """Transport serving queued candle updates, optionally failing first."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.updates: asyncio.Queue[list[list[float]]] = asyncio.Queue()
+        self.tickers: asyncio.Queue[dict] = asyncio.Queue()
+        self.failures = failures
+        self.closed = False
+
+    async def watch_ohlcv(self, symbol: str, timeframe: str) -> list[list[float]]:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("socket closed")
+        return await self.updates.get()
+
+    async def watch_ticker(self, symbol: str) -> dict:
+        return await self.tickers.get()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def published(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    """Capture events instead of publishing them."""
+    events: list[tuple[str, dict]] = []
+
+    async def publish(event_type: str, data: dict) -> None:
+        events.append((event_type, data))
+
+    async def publish_many(batch: list[tuple[str, dict]]) -> None:
+        events.extend(batch)
+
+    monkeypatch.setattr(event_bus, "publish", publish)
+    monkeypatch.setattr(event_bus, "publish_many", publish_many)
+    monkeypatch.setattr(settings, "STREAM_RECONNECT_MAX_SECONDS", 0)
+    return events
+
+
+async def history(key: SeriesKey, bars: int) -> OHLCVFrame:
+    return OHLCVFrame.from_rows([candle(i) for i in range(5)])
+
+
+class FakeMarketData:
+    """Market data service serving the same history for every series."""
+
+    async def get_ohlcv(self, symbol, exchange="binance", timeframe="1h", limit=500, **kwargs):
+        return await history(SeriesKey(exchange, symbol, timeframe), limit)
+
+
+async def drain(transport: FakeTransport) -> None:
+    """Wait until the watch loop has consumed every queued update."""
+    while not transport.updates.empty():
+        await asyncio.sleep(0)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestCandleBuffer:
+    """Test cases for CandleBuffer."""
+
+    def test_candle_closes_when_next_opens(self):
+        """Test a candle is closed only once a later candle arrives."""
+        buffer = CandleBuffer(size=10)
+
+        assert buffer.update([candle(0)]) == []
+        assert buffer.update([candle(0, close=105.0)]) == []
+        closed = buffer.update([candle(1)])
+
+        assert closed == [candle(0, close=105.0)]
+        assert buffer.forming == candle(1)
+        assert buffer.frame().close.tolist() == [105.0]
+
+    def test_batch_and_stale_updates(self):
+        """Test several candles in one update close in order; older ones are ignored."""
+        buffer = CandleBuffer(size=10)
+        buffer.update([candle(0)])
+
+        closed = buffer.update([candle(2), candle(1)])
+        assert [c[0] for c in closed] == [0, HOUR_MS]
+        assert buffer.update([candle(1, close=1.0)]) == []
+        assert len(buffer.frame()) == 2
+
+    def test_rolling_window(self):
+        """Test only the latest closed candles are kept."""
+        buffer = CandleBuffer(size=3)
+        buffer.update([candle(i) for i in range(10)])
+
+        assert buffer.frame().timestamps.tolist() == [6 * HOUR_MS, 7 * HOUR_MS, 8 * HOUR_MS]
+
+
+class TestCandleStreamer:
+    """Test cases for CandleStreamer."""
+
+    async def test_closed_bars_published_and_handled(self, published: list):
+        """Test each closed bar is published and handed to the handler."""
+        transport = FakeTransport()
+        frames: list[OHLCVFrame] = []
+
+        async def on_close(key: SeriesKey, buffer: CandleBuffer, closed: list[float]) -> None:
+            assert closed == buffer.closed[-1]
+            frames.append(buffer.frame())
+
+        streamer = CandleStreamer(history, on_close, lambda exchange: transport)
+        await streamer.subscribe(KEY)
+        # History is seeded with its last candle still forming
+        assert len(streamer.frame(KEY)) == 4
+
+        transport.updates.put_nowait([candle(4, close=110.0)])
+        transport.updates.put_nowait([candle(5)])
+        await drain(transport)
+        await streamer.close()
+
+        assert [data["close"] for _, data in published] == [110.0]
+        assert published[0][0] == EventTypes.CANDLE_CLOSED
+        assert published[0][1]["symbol"] == "BTC/USDT"
+        assert published[0][1]["timestamp"] == 4 * HOUR_MS
+        assert len(frames) == 1
+        assert frames[0].close[-1] == 110.0
+        assert transport.closed
+
+    async def test_reconnects_after_errors(self, published: list):
+        """Test the watch loop keeps going after transport errors."""
+        transport = FakeTransport(failures=2)
+        streamer = CandleStreamer(history, transport_factory=lambda exchange: transport)
+        await streamer.subscribe(KEY)
+
+        transport.updates.put_nowait([candle(5)])
+        await drain(transport)
+        await streamer.close()
+
+        assert len(published) == 1
+        assert transport.failures == 0
+
+    async def test_sync_subscriptions(self, published: list):
+        """Test sync subscribes to new series and drops stale ones."""
+        other = SeriesKey("binance", "ETH/USDT", "1h")
+        streamer = CandleStreamer(history, transport_factory=lambda exchange: FakeTransport())
+
+        await streamer.sync({KEY, other})
+        assert streamer.subscriptions == {KEY, other}
+
+        await streamer.sync({other})
+        assert streamer.subscriptions == {other}
+        assert KEY not in streamer.buffers
+        await streamer.close()
+
+
+class TestTickerStreamer:
+    """Test cases for TickerStreamer."""
+
+    async def test_tickers_published_at_most_once_per_interval(self, published: list):
+        """Test ticker updates are published as public events, throttled."""
+        transport = FakeTransport()
+        streamer = TickerStreamer(lambda exchange: transport, interval=60)
+
+        await streamer.sync({("binance", "BTC/USDT")})
+        transport.tickers.put_nowait({"last": 100.0, "bid": 99.5, "baseVolume": 7.0})
+        transport.tickers.put_nowait({"last": 101.0})
+        while not transport.tickers.empty():
+            await asyncio.sleep(0)
+        await streamer.close()
+
+        assert published == [
+            (
+                EventTypes.TICKER_UPDATED,
+                {
+                    "exchange": "binance",
+                    "symbol": "BTC/USDT",
+                    "bid": 99.5,
+                    "ask": None,
+                    "last": 100.0,
+                    "high": None,
+                    "low": None,
+                    "volume": 7.0,
+                    "timestamp": None,
+                },
+            )
+        ]
+        assert EventTypes.TICKER_UPDATED in PUBLIC_EVENT_TYPES
+        assert transport.closed
+
+    async def test_runner_streams_configured_and_traded_symbols(
+        self, published: list, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test the runner streams tickers of its settings and strategies."""
+        monkeypatch.setattr(settings, "TICKER_STREAM_SYMBOLS", ["ETH/USDT"])
+        transport = FakeTransport()
+        runner = LiveStrategyRunner(FakeMarketData(), transport_factory=lambda exchange: transport)
+        strategy = Strategy(
+            id=uuid.uuid4(),
+            rules={"conditions": [{"indicator": "close", "operator": "gt", "value": 0}]},
+            symbols=["BTC/USDT"],
+            timeframe="1h",
+        )
+
+        await runner.set_strategies([strategy])
+        assert runner.tickers.subscriptions == {("binance", "ETH/USDT"), ("binance", "BTC/USDT")}
+        await runner.close()
+
+
+class TestLiveStrategyRunner:
+    """Test cases for evaluation on bar close."""
+
+    async def test_signals_on_bar_close(self, published: list):
+        """Test the strategies of a series are evaluated when its bar closes."""
+        transport = FakeTransport()
+        runner = LiveStrategyRunner(FakeMarketData(), transport_factory=lambda exchange: transport)
+        strategies = [
+            Strategy(
+                id=uuid.uuid4(),
+                rules={"conditions": [{"indicator": "close", "operator": "gt", "value": v}]},
+                symbols=["BTC/USDT"],
+                timeframe="1h",
+            )
+            for v in (50, 500)
+        ]
+
+        await runner.set_strategies(strategies)
+        transport.updates.put_nowait([candle(5)])
+        await drain(transport)
+        await runner.close()
+
+        signals = [data for event, data in published if event == EventTypes.STRATEGY_SIGNAL]
+        assert [s["strategy_id"] for s in signals] == [str(strategies[0].id)]
+        assert signals[0]["symbol"] == "BTC/USDT"
+
+    async def test_indicators_advance_one_candle_per_close(
+        self, published: list, fake_redis, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test each bar close feeds only the new candle and saves the states."""
+        transport = FakeTransport()
+        store = IndicatorStateStore(redis=fake_redis)
+        runner = LiveStrategyRunner(
+            FakeMarketData(), transport_factory=lambda exchange: transport, state_store=store
+        )
+        strategy = Strategy(
+            id=uuid.uuid4(),
+            rules={"conditions": [{"indicator": "sma_3", "operator": "gt", "value": 0}]},
+            symbols=["BTC/USDT"],
+            timeframe="1h",
+        )
+        fed: list[int] = []
+        update = LiveIndicators.update
+
+        def counting_update(self, candle):
+            fed.append(int(candle[0]))
+            update(self, candle)
+
+        monkeypatch.setattr(LiveIndicators, "update", counting_update)
+
+        await runner.set_strategies([strategy])
+        transport.updates.put_nowait([candle(5)])
+        await drain(transport)
+        fed.clear()
+        transport.updates.put_nowait([candle(6)])
+        transport.updates.put_nowait([candle(7)])
+        await drain(transport)
+        await runner.close()
+
+        assert fed == [5 * HOUR_MS, 6 * HOUR_MS]
+        saved = await store.load(KEY)
+        assert saved is not None
+        assert saved.timestamp == 6 * HOUR_MS
+        assert len([e for e, _ in published if e == EventTypes.STRATEGY_SIGNAL]) == 3
+
+    async def test_each_closed_bar_evaluated_once(self, published: list):
+        """Test an update closing several bars evaluates each of them."""
+        transport = FakeTransport()
+        runner = LiveStrategyRunner(FakeMarketData(), transport_factory=lambda exchange: transport)
+        strategy = Strategy(
+            id=uuid.uuid4(),
+            rules={"conditions": [{"indicator": "close", "operator": "gt", "value": 104.5}]},
+            symbols=["BTC/USDT"],
+            timeframe="1h",
+        )
+
+        await runner.set_strategies([strategy])
+        # Closes the bars at 4 (close 104), 5 (105) and 6 (106)
+        transport.updates.put_nowait([candle(5), candle(6), candle(7)])
+        await drain(transport)
+        await runner.close()
+
+        closes = [data["close"] for event, data in published if event == EventTypes.CANDLE_CLOSED]
+        signals = [data for event, data in published if event == EventTypes.STRATEGY_SIGNAL]
+        assert closes == [104.0, 105.0, 106.0]
+        assert [s["details"][0]["indicator_value"] for s in signals] == [105.0, 106.0]
@@ -0,0 +1,95 @@
+"""Unit tests for equity curve storage and downsampling."""
+
+import numpy as np
+import pytest
+
+from app.utils.equity_series import decode_series, downsample, encode_series, lttb, minmax
+
+HOUR = 3600 * 10**9
+
+
+def make_curve(bars: int = 10000, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Create an hourly random-walk equity curve."""
+    rng = np.random.default_rng(seed)
+    timestamps = 1_700_000_000 * 10**9 + np.arange(bars, dtype=np.int64) * HOUR
+    equity = 10000 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    return timestamps, equity
+
+
+class TestEncoding:
+    """Test cases for the compressed columnar format."""
+
+    def test_round_trip(self):
+        """Test curves decode to exactly the stored values."""
+        timestamps, equity = make_curve()
+        timestamps[5000:] += 7 * HOUR
+
+        decoded_timestamps, decoded_equity = decode_series(encode_series(timestamps, equity))
+
+        np.testing.assert_array_equal(decoded_timestamps, timestamps)
+        np.testing.assert_array_equal(decoded_equity, equity)
+
+    def test_compresses_regular_bars(self):
+        """Test regular timestamps and flat stretches compress well."""
+        timestamps, equity = make_curve()
+        equity[::2] = equity[1::2]
+
+        blob = encode_series(timestamps, equity)
+
+        assert len(blob) < (timestamps.nbytes + equity.nbytes) / 2
+
+    def test_empty(self):
+        """Test an empty curve round-trips."""
+        timestamps, equity = decode_series(encode_series(np.empty(0, np.int64), np.empty(0)))
+
+        assert len(timestamps) == len(equity) == 0
+
+    def test_length_mismatch(self):
+        """Test columns of different lengths are rejected."""
+        with pytest.raises(ValueError):
+            encode_series(np.arange(3), np.ones(2))
+
+
+class TestDownsample:
+    """Test cases for downsampling."""
+
+    def test_lttb_keeps_endpoints_and_spike(self):
+        """Test LTTB keeps the ends and an isolated extreme point."""
+        timestamps, equity = make_curve()
+        equity[4321] *= 2
+
+        indices = lttb(timestamps, equity, 200)
+
+        assert len(indices) == 200
+        assert indices[0] == 0
+        assert indices[-1] == len(equity) - 1
+        assert np.all(np.diff(indices) > 0)
+        assert 4321 in indices
+
+    def test_minmax_keeps_extremes(self):
+        """Test min/max buckets keep the global low and high."""
+        _, equity = make_curve()
+
+        indices = minmax(equity, 100)
+
+        assert len(indices) <= 100
+        assert equity.argmin() in indices
+        assert equity.argmax() in indices
+        assert {0, len(equity) - 1} <= set(indices.tolist())
+
+    @pytest.mark.parametrize("method", ["lttb", "minmax"])
+    @pytest.mark.parametrize("points", [2, 3, 50, 20000])
+    def test_point_budget(self, method: str, points: int):
+        """Test no more than the requested points are returned."""
+        timestamps, equity = make_curve()
+
+        sampled_timestamps, sampled_equity = downsample(timestamps, equity, points, method)
+
+        assert len(sampled_timestamps) == len(sampled_equity)
+        assert 2 <= len(sampled_timestamps) <= min(points, len(equity))
+        assert np.isin(sampled_timestamps, timestamps).all()
+
+    def test_unknown_method(self):
+        """Test unknown methods are rejected."""
+        with pytest.raises(ValueError):
+            downsample(*make_curve(10), 5, "average")
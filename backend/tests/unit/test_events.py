@@ -0,0 +1,533 @@
+"""Unit tests for the event bus."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.core.events import (
+    BatchPublisher,
+    EventBus,
+    EventPublishError,
+    load_serializer,
+    stream_group,
+)
+
+
+class FakePubSub:
+    """Pattern subscription yielding queued messages."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.messages: asyncio.Queue[dict] = asyncio.Queue()
+        self.fail = fail
+        self.closed = False
+
+    async def listen(self):
+        if self.fail:
+            raise ConnectionError("connection lost")
+        while True:
+            yield await self.messages.get()
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+    def push(self, event_type: str, **data) -> None:
+        message = json.dumps({"type": event_type, "data": data})
+        self.messages.put_nowait(
+            {"type": "pmessage", "channel": f"events:{event_type}", "data": message}
+        )
+
+
+class FakeRedisClient:
+    """RedisClient stand-in handing out fake pattern subscriptions."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.pubsubs: list[FakePubSub] = []
+        self.patterns: list[tuple[str, ...]] = []
+
+    async def psubscribe(self, *patterns: str) -> FakePubSub:
+        pubsub = FakePubSub(fail=len(self.pubsubs) < self.failures)
+        self.pubsubs.append(pubsub)
+        self.patterns.append(patterns)
+        return pubsub
+
+
+async def settle(rounds: int = 5) -> None:
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+class TestEventBusListener:
+    """Tests for EventBus routing of received events."""
+
+    @pytest.mark.asyncio
+    async def test_routes_by_type_and_pattern(self) -> None:
+        redis = FakeRedisClient()
+        bus = EventBus(redis=redis)
+        exact, pattern, other = [], [], []
+        bus.subscribe("backtest.progress", exact.append)
+        bus.subscribe("backtest.*", pattern.append)
+        bus.subscribe("trade.opened", other.append)
+
+        bus.start()
+        bus.start()
+        await settle()
+        redis.pubsubs[0].push("backtest.progress", percent=50.0)
+        redis.pubsubs[0].push("backtest.completed", total_trades=3)
+        await settle()
+        await bus.stop()
+
+        assert redis.patterns == [("events:*",)]
+        assert exact == [{"percent": 50.0}]
+        assert pattern == [{"percent": 50.0}, {"total_trades": 3}]
+        assert other == []
+
+    @pytest.mark.asyncio
+    async def test_raw_handlers_get_the_published_message(self) -> None:
+        redis = FakeRedisClient()
+        bus = EventBus(redis=redis)
+        received = []
+        bus.add_raw_handler(lambda *args: received.append(args))
+
+        bus.start()
+        await settle()
+        redis.pubsubs[0].push("strategy.signal", symbol="BTC/USDT")
+        await settle()
+        await bus.stop()
+
+        event_type, data, message = received[0]
+        assert event_type == "strategy.signal"
+        assert data == {"symbol": "BTC/USDT"}
+        assert json.loads(message) == {"type": event_type, "data": data}
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_does_not_stall_others(self) -> None:
+        redis = FakeRedisClient()
+        bus = EventBus(redis=redis)
+        release = asyncio.Event()
+        fast = []
+
+        async def slow(data: dict) -> None:
+            await release.wait()
+
+        bus.subscribe("strategy.signal", slow)
+        bus.subscribe("strategy.signal", fast.append)
+
+        bus.start()
+        await settle()
+        redis.pubsubs[0].push("strategy.signal", n=1)
+        redis.pubsubs[0].push("strategy.signal", n=2)
+        await settle()
+
+        assert fast == [{"n": 1}, {"n": 2}]
+        release.set()
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_failure(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        sleep = asyncio.sleep
+
+        async def no_wait(delay: float) -> None:
+            await sleep(0)
+
+        monkeypatch.setattr("app.core.events.asyncio.sleep", no_wait)
+        redis = FakeRedisClient(failures=1)
+        bus = EventBus(redis=redis)
+        received = []
+        bus.subscribe("trade.opened", received.append)
+
+        bus.start()
+        await settle()
+        redis.pubsubs[-1].push("trade.opened", trade_id="t-1")
+        await settle()
+        await bus.stop()
+
+        assert len(redis.pubsubs) == 2
+        assert redis.pubsubs[0].closed
+        assert received == [{"trade_id": "t-1"}]
+
+    @pytest.mark.asyncio
+    async def test_local_dispatch_uses_patterns(self) -> None:
+        bus = EventBus()
+        bus.set_local_mode()
+        received = []
+        bus.subscribe("position.*", received.append)
+
+        await bus.publish("position.opened", {"symbol": "ETH/USDT"})
+        bus.unsubscribe("position.*", received.append)
+        await bus.publish("position.closed", {"symbol": "ETH/USDT"})
+
+        assert received == [{"symbol": "ETH/USDT"}]
+
+
+class FakePipeline:
+    """Pipeline recording queued commands."""
+
+    def __init__(self, redis: "FakeStreamRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple] = []
+
+    def xadd(self, stream: str, fields: dict, maxlen=None, approximate=True) -> None:
+        self.commands.append(("xadd", stream, fields, maxlen))
+
+    def publish(self, channel: str, message: str) -> None:
+        self.commands.append(("publish", channel, message))
+
+    def xpending_range(self, stream: str, group: str, min: str, max: str, count: int) -> None:
+        self.commands.append(("xpending_range", group, min, max))
+
+    def xack(self, stream: str, group: str, *ids: str) -> None:
+        self.commands.append(("xack", group, *ids))
+
+    async def execute(self) -> list:
+        if self.redis.failures:
+            self.redis.failures -= 1
+            raise ConnectionError("connection lost")
+        self.redis.executed.append(self.commands)
+        results: list = []
+        for command in self.commands:
+            if command[0] == "xadd" and command[1] == "stream:events":
+                self.redis.entries.append((f"{len(self.redis.entries) + 1}-0", command[2]))
+            elif command[0] == "xadd":
+                self.redis.dead.append(command[2])
+            elif command[0] == "xpending_range":
+                group = self.redis.groups[command[1]]
+                results.append(
+                    [
+                        {"message_id": entry_id, "times_delivered": group.deliveries[entry_id]}
+                        for entry_id in group.pending
+                        if command[2] <= entry_id <= command[3]
+                    ]
+                )
+                continue
+            elif command[0] == "xack":
+                await self.redis.xack("stream:events", *command[1:])
+            results.append(None)
+        return results
+
+
+class FakeGroup:
+    """Read position and pending entries of one consumer group."""
+
+    def __init__(self) -> None:
+        self.delivered = 0
+        self.pending: set[str] = set()
+        self.deliveries: dict[str, int] = {}
+        self.acked: list[str] = []
+
+    def deliver(self, entries: list[tuple[str, dict]]) -> None:
+        for entry_id, _ in entries:
+            self.pending.add(entry_id)
+            self.deliveries[entry_id] = self.deliveries.get(entry_id, 0) + 1
+
+
+class FakeStreamRedis(FakeRedisClient):
+    """RedisClient stand-in with a single stream and its consumer groups.
+
+    The first ``failures`` pipelines fail to execute.
+    """
+
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__()
+        self.failures = failures
+        self.entries: list[tuple[str, dict]] = []
+        self.executed: list[list[tuple]] = []
+        self.groups: dict[str, FakeGroup] = {}
+        self.dead: list[dict] = []
+
+    def group(self, pattern: str) -> FakeGroup:
+        """State of the group reading events for ``pattern``."""
+        return self.groups.setdefault(stream_group(pattern), FakeGroup())
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def xgroup_create(self, stream: str, group: str, id: str = "0") -> bool:
+        return self.groups.setdefault(group, FakeGroup()) is not None
+
+    async def xautoclaim(self, stream, group, consumer, min_idle_time, count=None) -> list:
+        state = self.groups[group]
+        stale = [entry for entry in self.entries if entry[0] in state.pending]
+        state.deliver(stale)
+        return ["0-0", stale, []]
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None) -> list:
+        state = self.groups[group]
+        new = self.entries[state.delivered : state.delivered + count]
+        if not new:
+            await asyncio.sleep(0)
+            return []
+        state.delivered += len(new)
+        state.deliver(new)
+        return [["stream:events", new]]
+
+    async def xack(self, stream: str, group: str, *ids: str) -> int:
+        state = self.groups.setdefault(group, FakeGroup())
+        state.pending.difference_update(ids)
+        state.acked.extend(ids)
+        return len(ids)
+
+
+class TestEventBusStreams:
+    """Tests for durable events through Redis Streams."""
+
+    @pytest.mark.asyncio
+    async def test_durable_events_are_appended_and_published(self) -> None:
+        redis = FakeStreamRedis()
+        bus = EventBus(redis=redis, streams=True, stream_types=["trade.*"])
+
+        await bus.publish_many([("trade.opened", {"trade_id": "t-1"}), ("backtest.started", {})])
+
+        commands = redis.executed[0]
+        assert [c[0] for c in commands] == ["xadd", "publish", "publish"]
+        assert commands[0][1] == "stream:events"
+        assert json.loads(commands[0][2]["message"])["data"] == {"trade_id": "t-1"}
+        assert commands[2][1] == "events:backtest.started"
+
+    @pytest.mark.asyncio
+    async def test_consumer_acks_only_handled_events(self) -> None:
+        redis = FakeStreamRedis()
+        bus = EventBus(redis=redis, streams=True, stream_types=["strategy.signal"])
+        received = []
+
+        def handler(data: dict) -> None:
+            if data["n"] == 2:
+                raise RuntimeError("handler failed")
+            received.append(data)
+
+        bus.subscribe("strategy.signal", handler)
+        for n in (1, 2, 3):
+            await bus.publish("strategy.signal", {"n": n})
+
+        bus.start()
+        await settle(20)
+        await bus.stop()
+
+        group = redis.group("strategy.signal")
+        assert received == [{"n": 1}, {"n": 3}]
+        assert sorted(group.acked) == ["1-0", "3-0"]
+        assert group.pending == {"2-0"}
+
+    @pytest.mark.asyncio
+    async def test_durable_events_skip_pubsub_handlers(self) -> None:
+        redis = FakeStreamRedis()
+        bus = EventBus(redis=redis, streams=True, stream_types=["strategy.signal"])
+        received, raw = [], []
+        bus.subscribe("strategy.*", received.append)
+        bus.add_raw_handler(lambda *args: raw.append(args[0]))
+
+        await bus._route(json.dumps({"type": "strategy.signal", "data": {}}))
+        await bus._route(json.dumps({"type": "strategy.activated", "data": {}}))
+        await settle()
+
+        assert received == [{}]
+        assert raw == ["strategy.signal", "strategy.activated"]
+
+    @pytest.mark.asyncio
+    async def test_stale_events_are_retried(self) -> None:
+        redis = FakeStreamRedis()
+        redis.entries.append(("1-0", {"message": json.dumps({"type": "trade.opened", "data": {}})}))
+        redis.group("trade.opened").deliver(redis.entries)
+        redis.group("trade.opened").delivered = 1
+        bus = EventBus(redis=redis, streams=True, stream_types=["trade.*"])
+        received = []
+        bus.subscribe("trade.opened", received.append)
+
+        bus.start()
+        await settle(20)
+        await bus.stop()
+
+        assert received == [{}]
+        assert redis.group("trade.opened").pending == set()
+
+    @pytest.mark.asyncio
+    async def test_failing_events_are_dead_lettered(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "EVENT_STREAM_CLAIM_IDLE_MS", 0)
+        monkeypatch.setattr(settings, "EVENT_STREAM_MAX_DELIVERIES", 3)
+        redis = FakeStreamRedis()
+        bus = EventBus(redis=redis, streams=True, stream_types=["trade.*"])
+        attempts = []
+
+        def handler(data: dict) -> None:
+            attempts.append(data)
+            raise RuntimeError("handler failed")
+
+        bus.subscribe("trade.opened", handler)
+        await bus.publish("trade.opened", {"trade_id": "t-1"})
+
+        bus.start()
+        await settle(50)
+        await bus.stop()
+
+        group = redis.group("trade.opened")
+        assert len(attempts) == 3
+        assert group.pending == set()
+        assert group.acked == ["1-0"]
+        assert redis.dead[0]["id"] == "1-0"
+        assert json.loads(redis.dead[0]["message"])["data"] == {"trade_id": "t-1"}
+
+    @pytest.mark.asyncio
+    async def test_each_pattern_gets_every_event(self) -> None:
+        redis = FakeStreamRedis()
+        signals = EventBus(redis=redis, streams=True, stream_types=["strategy.signal", "trade.*"])
+        trades = EventBus(redis=redis, streams=True, stream_types=["strategy.signal", "trade.*"])
+        received_signals, received_trades = [], []
+        signals.subscribe("strategy.signal", received_signals.append)
+        trades.subscribe("trade.*", received_trades.append)
+        await signals.publish("trade.opened", {"trade_id": "t-1"})
+        await signals.publish("strategy.signal", {"n": 1})
+
+        signals.start()
+        trades.start()
+        await settle(20)
+        await signals.stop()
+        await trades.stop()
+
+        assert received_signals == [{"n": 1}]
+        assert received_trades == [{"trade_id": "t-1"}]
+        assert redis.group("strategy.signal").pending == set()
+        assert redis.group("trade.*").pending == set()
+
+    @pytest.mark.asyncio
+    async def test_matching_events_wait_for_a_handler(self) -> None:
+        redis = FakeStreamRedis()
+        bus = EventBus(redis=redis, streams=True, stream_types=["trade.*"])
+
+        await bus._handle_entries("trade.*", [("1-0", {"message": '{"type": "trade.opened"}'})])
+
+        assert redis.group("trade.*").acked == []
+
+    @pytest.mark.asyncio
+    async def test_unsent_durable_events_raise(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "EVENT_PUBLISH_RETRIES", 2)
+        monkeypatch.setattr("app.core.events.asyncio.sleep", no_wait)
+        redis = FakeStreamRedis(failures=3)
+        bus = EventBus(redis=redis, streams=True, stream_types=["trade.*"])
+        trades, progress = [], []
+        bus.subscribe("trade.opened", trades.append)
+        bus.subscribe("backtest.progress", progress.append)
+
+        with pytest.raises(EventPublishError) as error:
+            await bus.publish_many(
+                [("trade.opened", {"trade_id": "t-1"}), ("backtest.progress", {"percent": 5})]
+            )
+
+        assert error.value.events == [("trade.opened", {"trade_id": "t-1"})]
+        # Only events without other consumers fall back to local handlers
+        assert trades == []
+        assert progress == [{"percent": 5}]
+        assert redis.entries == []
+
+    @pytest.mark.asyncio
+    async def test_durable_publish_retries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("app.core.events.asyncio.sleep", no_wait)
+        redis = FakeStreamRedis(failures=2)
+        bus = EventBus(redis=redis, streams=True, stream_types=["trade.*"])
+
+        await bus.publish("trade.opened", {"trade_id": "t-1"})
+
+        assert len(redis.entries) == 1
+
+
+_sleep = asyncio.sleep
+
+
+async def no_wait(delay: float) -> None:
+    await _sleep(0)
+
+
+class RecordingBus:
+    """EventBus stand-in recording published batches.
+
+    The first ``failures`` batches fail with their ``trade.*`` events.
+    """
+
+    def __init__(self, failures: int = 0) -> None:
+        self.batches: list[list[tuple[str, dict]]] = []
+        self.failures = failures
+
+    async def publish_many(self, events: list[tuple[str, dict]]) -> None:
+        if self.failures:
+            self.failures -= 1
+            durable = [event for event in events if event[0].startswith("trade.")]
+            raise EventPublishError(durable, ConnectionError("connection lost"))
+        self.batches.append(list(events))
+
+
+class TestBatchPublisher:
+    """Tests for BatchPublisher."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_full(self) -> None:
+        bus = RecordingBus()
+        publisher = BatchPublisher(bus, max_events=2, max_delay=60)
+
+        for n in range(5):
+            await publisher.publish("strategy.signal", {"n": n})
+
+        assert [[e[1]["n"] for e in batch] for batch in bus.batches] == [[0, 1], [2, 3]]
+        await publisher.close()
+        assert bus.batches[-1] == [("strategy.signal", {"n": 4})]
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_delay(self) -> None:
+        bus = RecordingBus()
+        publisher = BatchPublisher(bus, max_events=100, max_delay=0.01)
+
+        await publisher.publish("strategy.signal", {"n": 1})
+        await publisher.publish("strategy.signal", {"n": 2})
+        assert bus.batches == []
+
+        await asyncio.sleep(0.05)
+        assert len(bus.batches) == 1
+        assert len(bus.batches[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_unsent_durable_events_are_kept(self) -> None:
+        bus = RecordingBus(failures=1)
+        publisher = BatchPublisher(bus, max_events=2, max_delay=60)
+
+        await publisher.publish("trade.opened", {"n": 1})
+        await publisher.publish("backtest.progress", {"n": 2})
+        assert bus.batches == []
+
+        await publisher.publish("trade.opened", {"n": 3})
+        await publisher.close()
+        assert bus.batches == [[("trade.opened", {"n": 1}), ("trade.opened", {"n": 3})]]
+
+    @pytest.mark.asyncio
+    async def test_close_with_nothing_buffered(self) -> None:
+        bus = RecordingBus()
+        publisher = BatchPublisher(bus)
+
+        await publisher.close()
+
+        assert bus.batches == []
+
+
+class TestSerializer:
+    """Tests for event message encoding."""
+
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    def test_round_trip(self, name: str) -> None:
+        dumps, loads = load_serializer(name)
+        event = {"type": "strategy.signal", "data": {"symbol": "BTC/USDT", "n": 1.5}}
+
+        message = dumps(event)
+
+        assert isinstance(message, str)
+        assert json.loads(message) == event
+        assert loads(message) == event
+
+    @pytest.mark.asyncio
+    async def test_bus_publishes_with_configured_serializer(self) -> None:
+        redis = FakeStreamRedis()
+        bus = EventBus(redis=redis, serializer="orjson")
+
+        await bus.publish_many([("trade.opened", {"trade_id": "t-1"})])
+
+        _, channel, message = redis.executed[0][0]
+        assert channel == "events:trade.opened"
+        assert message == '{"type":"trade.opened","data":{"trade_id":"t-1"}}'
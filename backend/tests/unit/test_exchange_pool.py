@@ -0,0 +1,72 @@
+"""Unit tests for the exchange client pool."""
+
+import asyncio
+
+import pytest
+
+from app.core.exchanges import ExchangePool
+
+
+class TestExchangePool:
+    """Test cases for ExchangePool."""
+
+    async def test_reuses_clients(self):
+        """Test the same client is returned for repeated lookups."""
+        pool = ExchangePool()
+        client = pool.get("binance")
+
+        assert pool.get("binance") is client
+        assert pool.get("kraken") is not client
+        assert len(pool) == 2
+        await pool.close_all()
+
+    async def test_unknown_exchange(self):
+        """Test unknown exchange names are rejected."""
+        pool = ExchangePool()
+        with pytest.raises(ValueError):
+            pool.get("not_an_exchange")
+
+    async def test_close_all(self):
+        """Test closing removes clients so new ones are created."""
+        pool = ExchangePool()
+        client = pool.get("binance")
+
+        await pool.close_all()
+
+        assert len(pool) == 0
+        assert pool.get("binance") is not client
+        await pool.close_all()
+
+    def test_new_event_loop_recreates_clients(self):
+        """Test clients are not reused across event loops."""
+        pool = ExchangePool()
+
+        async def lookup():
+            return pool.get("binance")
+
+        first = asyncio.run(lookup())
+        second = asyncio.run(lookup())
+
+        assert first is not second
+        assert len(pool) == 1
+
+    def test_new_event_loop_closes_stale_clients(self):
+        """Test clients left on a previous loop are closed, not just dropped."""
+        pool = ExchangePool()
+        closed = []
+
+        async def lookup():
+            client = pool.get("binance")
+
+            async def close():
+                closed.append(client)
+
+            client.close = close
+            # Let the close scheduled for the previous loop's clients run
+            await asyncio.sleep(0)
+            return client
+
+        first = asyncio.run(lookup())
+        asyncio.run(lookup())
+
+        assert closed == [first]
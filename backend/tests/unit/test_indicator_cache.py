@@ -0,0 +1,111 @@
+"""Unit tests for the shared indicator cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.indicator_cache import IndicatorCache, frame_fingerprint
+from app.services.rule_engine import RuleEngine
+
+
+@pytest.fixture
+def sample_df() -> pd.DataFrame:
+    """Create sample OHLCV DataFrame."""
+    np.random.seed(1)
+    close = 100 + np.cumsum(np.random.randn(200))
+    index = pd.date_range("2024-01-01", periods=200, freq="h")
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0},
+        index=index,
+    )
+
+
+class TestIndicatorCache:
+    """Test cases for IndicatorCache."""
+
+    def test_lru_eviction_by_entries(self):
+        """Test least recently used entries are evicted first."""
+        cache = IndicatorCache(max_entries=2)
+        cache.set("a", np.zeros(1))
+        cache.set("b", np.zeros(1))
+        cache.get("a")
+        cache.set("c", np.zeros(1))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_eviction_by_memory(self):
+        """Test the byte limit is enforced."""
+        cache = IndicatorCache(max_bytes=8 * 100)
+        cache.set("a", np.zeros(60))
+        cache.set("b", np.zeros(60))
+
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] == 8 * 60
+
+    def test_oversized_value_not_stored(self):
+        """Test values larger than the whole cache are skipped."""
+        cache = IndicatorCache(max_bytes=8)
+        cache.set("a", np.zeros(2))
+
+        assert len(cache) == 0
+
+    def test_cached_arrays_are_read_only(self):
+        """Test shared arrays cannot be mutated by consumers."""
+        cache = IndicatorCache()
+        cache.set("a", np.zeros(3))
+
+        with pytest.raises(ValueError):
+            cache.get("a")[0] = 1.0
+
+
+class TestFingerprint:
+    """Test cases for frame_fingerprint."""
+
+    def test_same_data_same_fingerprint(self, sample_df: pd.DataFrame):
+        """Test identical data produces the same fingerprint."""
+        assert frame_fingerprint(sample_df) == frame_fingerprint(sample_df.copy())
+
+    def test_new_bar_changes_fingerprint(self, sample_df: pd.DataFrame):
+        """Test appending or changing data changes the fingerprint."""
+        changed = sample_df.copy()
+        changed.iloc[-1, changed.columns.get_loc("close")] += 1
+
+        assert frame_fingerprint(sample_df) != frame_fingerprint(sample_df.iloc[:-1])
+        assert frame_fingerprint(sample_df) != frame_fingerprint(changed)
+
+
+class TestRuleEngineSharing:
+    """Test rule engines share indicators through the cache."""
+
+    def test_engines_reuse_results(self, sample_df: pd.DataFrame):
+        """Test a second engine reuses indicators computed by the first."""
+        cache = IndicatorCache()
+        rules = {"conditions": [{"indicator": "macd_signal", "operator": "gt", "value": 0}]}
+
+        first = RuleEngine(cache)
+        first.bind(sample_df, symbol="BTC/USDT", timeframe="1h")
+        expected = first.evaluate_signals(rules, sample_df)
+        misses = cache.misses
+
+        same_data = sample_df.copy()
+        second = RuleEngine(cache)
+        second.bind(same_data, symbol="BTC/USDT", timeframe="1h")
+        result = second.evaluate_signals(rules, same_data)
+
+        assert cache.misses == misses
+        assert cache.hits >= 1
+        assert (result == expected).all()
+
+    def test_different_data_not_shared(self, sample_df: pd.DataFrame):
+        """Test changed data is recomputed rather than served stale."""
+        cache = IndicatorCache()
+        rules = {"conditions": [{"indicator": "sma_5", "operator": "gt", "value": 0}]}
+        engine = RuleEngine(cache)
+
+        engine.evaluate_rules(rules, sample_df)
+        shifted = sample_df + 1000
+        result = engine.evaluate_rules(rules, shifted)
+
+        assert result["details"][0]["indicator_value"] > 1000
@@ -19,6 +19,26 @@ from app.utils.indicators import (
 )
 
 
+def _reference_rsi(data: pd.Series, period: int = 14) -> pd.Series:
+    """Per-bar Wilder RSI used as the parity baseline for calculate_rsi."""
+    delta = data.diff()
+
+    gain = delta.where(delta > 0, 0.0)
+    loss = (-delta).where(delta < 0, 0.0)
+
+    avg_gain = gain.rolling(window=period, min_periods=1).mean()
+    avg_loss = loss.rolling(window=period, min_periods=1).mean()
+
+    for i in range(period, len(data)):
+        avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (period - 1) + gain.iloc[i]) / period
+        avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (period - 1) + loss.iloc[i]) / period
+
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+
+    return rsi.replace([np.inf, -np.inf], np.nan).fillna(50)
+
+
 @pytest.fixture
 def sample_prices() -> pd.Series:
     """Create sample price series."""
@@ -126,6 +146,48 @@ class TestRSI:
 
         assert rsi.iloc[-1] < 50
 
+    @pytest.mark.parametrize("period", [2, 5, 14, 30])
+    def test_rsi_matches_reference(self, sample_prices: pd.Series, period: int):
+        """Test vectorized RSI matches the per-bar Wilder recurrence."""
+        expected = _reference_rsi(sample_prices, period)
+        rsi = calculate_rsi(sample_prices, period=period)
+
+        pd.testing.assert_series_equal(rsi, expected, rtol=1e-10, atol=1e-10)
+
+    def test_rsi_matches_reference_long_series(self):
+        """Test parity holds without drift over a long series."""
+        np.random.seed(7)
+        prices = pd.Series(1000 + np.cumsum(np.random.randn(5000)))
+
+        expected = _reference_rsi(prices, 14)
+        rsi = calculate_rsi(prices, period=14)
+
+        pd.testing.assert_series_equal(rsi, expected, rtol=1e-10, atol=1e-10)
+
+    def test_rsi_short_series(self):
+        """Test RSI on a series shorter than the period."""
+        prices = pd.Series([10.0, 11.0, 10.5, 12.0])
+
+        expected = _reference_rsi(prices, 14)
+        rsi = calculate_rsi(prices, period=14)
+
+        pd.testing.assert_series_equal(rsi, expected)
+
+    def test_rsi_flat_prices(self):
+        """Test RSI is neutral when prices never move."""
+        prices = pd.Series([100.0] * 30)
+        rsi = calculate_rsi(prices, period=14)
+
+        assert (rsi == 50).all()
+
+    def test_rsi_preserves_index(self):
+        """Test RSI keeps the input's datetime index."""
+        index = pd.date_range("2024-01-01", periods=40, freq="h")
+        prices = pd.Series(np.linspace(100, 120, 40), index=index)
+        rsi = calculate_rsi(prices, period=14)
+
+        assert rsi.index.equals(index)
+
 
 class TestMACD:
     """Test cases for MACD."""
@@ -0,0 +1,163 @@
+"""Unit tests for job progress reporting and cancellation."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.events import event_bus
+from app.core.redis import RedisClient
+from app.services import backtest_engine
+from app.services.job_control import JobCancelled, JobProgress, get_progress, request_cancel
+
+
+@pytest.fixture
+def published(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    """Capture events instead of publishing them."""
+    events: list[tuple[str, dict]] = []
+
+    async def publish(event_type: str, data: dict) -> None:
+        events.append((event_type, data))
+
+    monkeypatch.setattr(event_bus, "publish", publish)
+    return events
+
+
+def make_progress(redis: RedisClient, interval: float = 60.0) -> JobProgress:
+    return JobProgress("backtest", "bt-1", "backtest.progress", redis=redis, interval=interval)
+
+
+class TestJobProgress:
+    """Tests for JobProgress."""
+
+    @pytest.mark.asyncio
+    async def test_reports_are_throttled(self, fake_redis: RedisClient, published: list) -> None:
+        progress = make_progress(fake_redis)
+        await progress.start_stage("simulating", total=300)
+        await progress.advance(100, current="BTC/USDT")
+        await progress.advance(100, current="ETH/USDT")
+
+        # Only the stage start is reported within the interval
+        assert len(published) == 1
+        assert published[0][1]["stage"] == "simulating"
+        assert published[0][1]["processed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_every_advance_reports_without_interval(
+        self, fake_redis: RedisClient, published: list
+    ) -> None:
+        progress = make_progress(fake_redis, interval=0.0)
+        await progress.start_stage("simulating", total=200)
+        await progress.advance(50, current="BTC/USDT")
+        await progress.advance(150, current="ETH/USDT")
+
+        assert [data["processed"] for _, data in published] == [0, 50, 200]
+        assert published[-1][1]["percent"] == 100.0
+
+        stored = await get_progress("backtest", "bt-1", fake_redis)
+        assert stored["backtest_id"] == "bt-1"
+        assert stored["current"] == "ETH/USDT"
+        assert stored["processed"] == 200
+
+    @pytest.mark.asyncio
+    async def test_cancellation_raises_on_report(
+        self, fake_redis: RedisClient, published: list
+    ) -> None:
+        progress = make_progress(fake_redis, interval=0.0)
+        await progress.start_stage("simulating", total=10)
+        await request_cancel("backtest", "bt-1", fake_redis)
+
+        with pytest.raises(JobCancelled):
+            await progress.advance(5)
+
+    @pytest.mark.asyncio
+    async def test_clear_removes_state(self, fake_redis: RedisClient, published: list) -> None:
+        progress = make_progress(fake_redis)
+        await progress.start_stage("loading", total=2)
+        await request_cancel("backtest", "bt-1", fake_redis)
+        await progress.clear()
+
+        assert await get_progress("backtest", "bt-1", fake_redis) is None
+        await progress.check_cancelled()
+
+    def test_snapshot_eta(self, fake_redis: RedisClient) -> None:
+        progress = make_progress(fake_redis)
+        progress.total = 100
+        progress.processed = 25
+        snapshot = progress.snapshot(progress._started + 10.0)
+
+        assert snapshot["percent"] == 25.0
+        assert snapshot["elapsed_seconds"] == 10.0
+        assert snapshot["eta_seconds"] == 30.0
+
+    def test_snapshot_without_total(self, fake_redis: RedisClient) -> None:
+        snapshot = make_progress(fake_redis).snapshot()
+
+        assert snapshot["percent"] == 0.0
+        assert snapshot["eta_seconds"] is None
+
+
+def slow_square(x: int) -> int:
+    time.sleep(0.02)
+    return x * x
+
+
+class TestMapInWorkers:
+    """Tests for completion callbacks in map_in_workers."""
+
+    @pytest.fixture
+    def pool(self, monkeypatch: pytest.MonkeyPatch):
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(backtest_engine, "get_executor", lambda: executor)
+        yield executor
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    @pytest.mark.asyncio
+    async def test_on_done_sees_every_result(self, pool: ThreadPoolExecutor) -> None:
+        seen: dict[int, int] = {}
+
+        async def on_done(i: int, result: int) -> None:
+            seen[i] = result
+
+        results = await backtest_engine.map_in_workers(slow_square, [1, 2, 3, 4], on_done)
+
+        assert results == [1, 4, 9, 16]
+        assert seen == {0: 1, 1: 4, 2: 9, 3: 16}
+
+    @pytest.mark.asyncio
+    async def test_cancelling_stops_pending_items(self, pool: ThreadPoolExecutor) -> None:
+        calls: list[int] = []
+
+        def job(x: int) -> int:
+            calls.append(x)
+            return slow_square(x)
+
+        async def on_done(i: int, result: int) -> None:
+            raise JobCancelled("cancelled")
+
+        with pytest.raises(JobCancelled):
+            await backtest_engine.map_in_workers(job, list(range(20)), on_done)
+
+        # Let the loop forward the cancellations to the pool
+        await asyncio.sleep(0)
+        pool.shutdown(wait=True)
+        assert len(calls) < 20
+
+    @pytest.mark.asyncio
+    async def test_cancelling_in_thread_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(backtest_engine, "get_executor", lambda: None)
+        calls: list[int] = []
+
+        def job(x: int) -> int:
+            calls.append(x)
+            return x
+
+        async def on_done(i: int, result: int) -> None:
+            if i == 1:
+                raise JobCancelled("cancelled")
+
+        with pytest.raises(JobCancelled):
+            await backtest_engine.map_in_workers(job, [1, 2, 3, 4], on_done)
+
+        assert calls == [1, 2]
@@ -0,0 +1,161 @@
+"""Unit tests for incrementally maintained live indicators."""
+
+import numpy as np
+import pytest
+
+from app.core.redis import RedisClient
+from app.services.live_indicators import (
+    IndicatorStateStore,
+    LiveIndicators,
+    advance_indicators,
+)
+from app.services.rule_engine import RuleEngine, parse_indicator
+from app.utils.ohlcv import OHLCVFrame, SeriesKey
+
+HOUR_MS = 3_600_000
+INDICATORS = ["close", "sma_20", "ema_10", "rsi_14", "macd_line", "macd_signal", "bb_upper"]
+RULES = [
+    {"conditions": [{"indicator": "rsi_14", "operator": "lt", "value": 50}]},
+    {"conditions": [{"indicator": "close", "operator": "gt", "value": "$sma_20"}]},
+    {"conditions": [{"indicator": "ema_10", "operator": "crosses_above", "value": "$sma_20"}]},
+    {"conditions": [{"indicator": "close", "operator": "crosses_below", "value": "$bb_middle"}]},
+    {
+        "conditions": [
+            {"indicator": "macd_line", "operator": "gt", "value": "$macd_signal"},
+            {"indicator": "rsi", "operator": "gt", "value": 30},
+        ],
+        "logic": "or",
+    },
+]
+
+
+@pytest.fixture
+def candles() -> list[list[float]]:
+    """Random-walk candles."""
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 2, 300))
+    return [[i * HOUR_MS, c, c + 1, c - 1, c, 10.0] for i, c in enumerate(close.tolist())]
+
+
+def specs(names: list[str]) -> set:
+    return {parse_indicator(name) for name in names}
+
+
+class TestLiveIndicators:
+    """Tests for LiveIndicators."""
+
+    def test_values_match_rule_engine(self, candles: list):
+        """Test streamed values equal the batch indicators on the last bar."""
+        indicators = LiveIndicators(specs(INDICATORS))
+        indicators.advance(candles)
+
+        engine = RuleEngine()
+        df = OHLCVFrame.from_rows(candles).to_frame()
+        engine.bind(df)
+        for spec in indicators.specs:
+            values = engine.get_indicator_values(spec, df)
+            np.testing.assert_allclose(indicators.current[spec.key], values[-1])
+            np.testing.assert_allclose(indicators.previous[spec.key], values[-2])
+
+    def test_evaluate_latest_matches_evaluate_rules(self, candles: list):
+        """Test rules on streamed values agree with a full recompute."""
+        engine = RuleEngine()
+        plans = [engine.compile(rule) for rule in RULES]
+        indicators = LiveIndicators({spec for plan in plans for spec in plan.specs})
+
+        for end in range(30, len(candles), 7):
+            indicators.advance(candles[:end])
+            df = OHLCVFrame.from_rows(candles[:end]).to_frame()
+            for plan in plans:
+                expected = RuleEngine().evaluate_rules(plan, df, -1)["passed"]
+                latest = engine.evaluate_latest(plan, indicators.current, indicators.previous)
+                assert latest["passed"] == expected
+
+    def test_advance_consumes_only_new_candles(self, candles: list):
+        """Test a rolling buffer feeds each candle once."""
+        indicators = LiveIndicators(specs(["sma_20"]))
+        seen = []
+        update = indicators.update
+        indicators.update = lambda candle: (seen.append(candle[0]), update(candle))
+
+        for end in range(100, 110):
+            assert indicators.advance(candles[end - 50 : end])
+
+        assert seen == [c[0] for c in candles[50:109]]
+
+    def test_gap_rebuilds(self, candles: list):
+        """Test missing candles rebuild the states from the buffer."""
+        indicators = advance_indicators(None, specs(["sma_20"]), candles[:100])
+
+        assert not indicators.advance(candles[150:200])
+        rebuilt = advance_indicators(indicators, specs(["sma_20"]), candles[150:200])
+
+        assert rebuilt is not indicators
+        assert rebuilt.timestamp == candles[199][0]
+        np.testing.assert_allclose(
+            rebuilt.current["sma_20"], np.mean([c[4] for c in candles[180:200]])
+        )
+
+    def test_hole_in_buffer_rebuilds(self, candles: list):
+        """Test a hole between new candles rebuilds from the candles after it."""
+        indicators = advance_indicators(None, specs(["sma_20"]), candles[:100], HOUR_MS)
+        buffer = candles[60:100] + candles[105:140]
+
+        assert not indicators.advance(buffer)
+        assert indicators.timestamp == candles[99][0]
+        rebuilt = advance_indicators(indicators, specs(["sma_20"]), buffer, HOUR_MS)
+
+        assert rebuilt is not indicators
+        reference = advance_indicators(None, specs(["sma_20"]), candles[105:140], HOUR_MS)
+        assert rebuilt.timestamp == candles[139][0]
+        np.testing.assert_allclose(rebuilt.current["sma_20"], reference.current["sma_20"])
+
+    def test_contiguous_candles_advance_with_step(self, candles: list):
+        """Test candles one step apart are consumed in place."""
+        indicators = advance_indicators(None, specs(["sma_20"]), candles[:100], HOUR_MS)
+
+        assert advance_indicators(indicators, specs(["sma_20"]), candles[:120], HOUR_MS) is (
+            indicators
+        )
+        assert indicators.timestamp == candles[119][0]
+
+    def test_new_indicator_rebuilds(self, candles: list):
+        """Test a spec the states lack rebuilds them."""
+        indicators = advance_indicators(None, specs(["sma_20"]), candles[:100])
+        rebuilt = advance_indicators(indicators, specs(["sma_20", "rsi_14"]), candles[:101])
+
+        assert rebuilt is not indicators
+        assert {"sma_20", "rsi_14"} <= set(rebuilt.current)
+
+    def test_roundtrip_resumes(self, candles: list):
+        """Test restored indicators continue like uninterrupted ones."""
+        names = ["sma_20", "rsi_14", "macd_histogram", "bb_lower", "high"]
+        reference = advance_indicators(None, specs(names), candles)
+
+        partial = advance_indicators(None, specs(names), candles[:200], HOUR_MS)
+        restored = LiveIndicators.loads(partial.dumps())
+        assert restored.step == HOUR_MS
+        assert restored.advance(candles)
+
+        assert restored.timestamp == reference.timestamp
+        for key, value in reference.current.items():
+            np.testing.assert_allclose(restored.current[key], value)
+            np.testing.assert_allclose(restored.previous[key], reference.previous[key])
+
+
+class TestIndicatorStateStore:
+    """Tests for IndicatorStateStore."""
+
+    async def test_save_and_load(self, fake_redis: RedisClient, candles: list):
+        """Test indicators are saved to and loaded from Redis."""
+        store = IndicatorStateStore(redis=fake_redis)
+        key = SeriesKey("binance", "BTC/USDT", "1h")
+        indicators = advance_indicators(None, specs(["ema_10"]), candles[:50])
+
+        assert await store.load(key) is None
+        await store.save(key, indicators)
+        loaded = await store.load(key)
+
+        assert loaded is not None
+        assert loaded.timestamp == indicators.timestamp
+        assert loaded.current == indicators.current
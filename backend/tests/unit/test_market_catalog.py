@@ -0,0 +1,139 @@
+"""Unit tests for the market catalog and symbol index."""
+
+import json
+import time
+
+import pytest
+
+from app.core.redis import RedisClient
+from app.services.market_catalog import MarketCatalog, SymbolIndex
+
+BASES = ["BTC", "ETH", "SOL", "BNB", "XRP", "ADA", "DOGE", "DOT", "ETC", "BTCDOM", "SHIB", "TRX"]
+QUOTES = ["USDT", "BTC", "ETH", "EUR", "USDC"]
+
+
+def make_markets() -> list[dict]:
+    """Build a list of markets across bases and quotes."""
+    return [
+        {
+            "symbol": f"{base}/{quote}",
+            "base": base,
+            "quote": quote,
+            "exchange": "binance",
+            "active": True,
+        }
+        for base in BASES
+        for quote in QUOTES
+        if base != quote
+    ]
+
+
+class FakePool:
+    """Exchange pool returning a fixed market map and counting loads."""
+
+    def __init__(self) -> None:
+        self.loads = 0
+
+    async def get_markets(self, exchange: str, reload: bool = False) -> dict:
+        self.loads += 1
+        return {m["symbol"]: m for m in make_markets()}
+
+
+class TestSymbolIndex:
+    """Test cases for SymbolIndex."""
+
+    @pytest.fixture
+    def index(self) -> SymbolIndex:
+        return SymbolIndex(make_markets())
+
+    @pytest.mark.parametrize("search", ["b", "BT", "btc", "C/U", "TC/US", "DOGE/USDT", "zzz"])
+    @pytest.mark.parametrize("quote", [None, "USDT", "ETH"])
+    def test_matches_linear_scan(self, index: SymbolIndex, search: str, quote: str | None):
+        """Test index results equal a plain substring scan."""
+        expected = {
+            m["symbol"]
+            for m in make_markets()
+            if search.upper() in m["symbol"].upper() and (quote is None or m["quote"] == quote)
+        }
+
+        results = index.search(quote_currency=quote, search=search, limit=1000)
+
+        assert [r["symbol"] for r in results] == sorted(
+            {r["symbol"] for r in results}, key=lambda s: (not s.startswith(search.upper()), s)
+        )
+        assert {r["symbol"] for r in results} == expected
+
+    def test_prefix_first(self, index: SymbolIndex):
+        """Test symbols starting with the query are listed first."""
+        results = index.search(search="ETH", limit=1000)
+        symbols = [r["symbol"] for r in results]
+
+        assert symbols[0].startswith("ETH/")
+        assert "BTC/ETH" in symbols
+        assert symbols.index("BTC/ETH") > symbols.index("ETH/USDT")
+
+    def test_quote_filter_and_limit(self, index: SymbolIndex):
+        """Test quote filtering without a search and the result limit."""
+        results = index.search(quote_currency="EUR", limit=5)
+
+        assert len(results) == 5
+        assert all(r["quote"] == "EUR" for r in results)
+
+    def test_results_are_copies(self, index: SymbolIndex):
+        """Test callers cannot modify the index through results."""
+        index.search(search="BTC", limit=1)[0]["symbol"] = "changed"
+
+        assert index.search(search="BTC", limit=1)[0]["symbol"] != "changed"
+
+
+class TestMarketCatalog:
+    """Test cases for MarketCatalog."""
+
+    async def test_loads_once(self, fake_redis: RedisClient):
+        """Test markets are loaded from the exchange once and reused."""
+        pool = FakePool()
+        catalog = MarketCatalog(pool=pool, redis=fake_redis, refresh_seconds=3600)
+
+        first = await catalog.get_index("binance")
+        second = await catalog.get_index("binance")
+
+        assert first is second
+        assert pool.loads == 1
+        assert await fake_redis.exists("markets:binance")
+
+    async def test_shared_through_redis(self, fake_redis: RedisClient):
+        """Test another process loads the list from Redis."""
+        await MarketCatalog(pool=FakePool(), redis=fake_redis).get_index("binance")
+        pool = FakePool()
+
+        index = await MarketCatalog(pool=pool, redis=fake_redis).get_index("binance")
+
+        assert pool.loads == 0
+        assert len(index) == len(make_markets())
+
+    async def test_stale_redis_entry_reloaded(self, fake_redis: RedisClient):
+        """Test an outdated list in Redis is replaced from the exchange."""
+        payload = {"fetched_at": time.time() - 7200, "markets": make_markets()[:3]}
+        await fake_redis.set("markets:binance", json.dumps(payload))
+        pool = FakePool()
+
+        index = await MarketCatalog(pool=pool, redis=fake_redis, refresh_seconds=3600).get_index(
+            "binance"
+        )
+
+        assert pool.loads == 1
+        assert len(index) == len(make_markets())
+
+    async def test_stale_index_served_while_refreshing(self, fake_redis: RedisClient):
+        """Test a stale index is returned immediately and refreshed in the background."""
+        pool = FakePool()
+        catalog = MarketCatalog(pool=pool, redis=fake_redis, refresh_seconds=3600)
+        stale = await catalog.get_index("binance")
+        stale.fetched_at -= 7200
+        await fake_redis.delete("markets:binance")
+
+        assert await catalog.get_index("binance") is stale
+        await catalog._refreshing["binance"]
+
+        assert pool.loads == 2
+        assert await catalog.get_index("binance") is not stale
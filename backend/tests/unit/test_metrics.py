@@ -0,0 +1,163 @@
+"""Unit tests for performance metrics."""
+
+import numpy as np
+import pytest
+
+from app.utils.metrics import (
+    RATIO_LIMIT,
+    drawdown,
+    performance_metrics,
+    periods_per_year,
+    rolling_metrics,
+    timeframe_seconds,
+    trade_statistics,
+)
+
+
+def make_equity(bars: int = 2000, seed: int = 0) -> np.ndarray:
+    """Create a random-walk equity curve."""
+    rng = np.random.default_rng(seed)
+    return 10000 * np.exp(np.cumsum(rng.normal(0.0002, 0.005, bars)))
+
+
+class TestAnnualization:
+    """Test cases for timeframe handling."""
+
+    @pytest.mark.parametrize(
+        ("timeframe", "periods"),
+        [("1m", 525600), ("15m", 35040), ("1h", 8760), ("4h", 2190), ("1d", 365), ("1w", 365 / 7)],
+    )
+    def test_periods_per_year(self, timeframe: str, periods: float):
+        """Test bars per year for common timeframes."""
+        assert periods_per_year(timeframe) == pytest.approx(periods)
+
+    @pytest.mark.parametrize("timeframe", ["", "h", "1x", "1.5h"])
+    def test_unknown_timeframe(self, timeframe: str):
+        """Test unknown timeframes are rejected."""
+        with pytest.raises(ValueError):
+            timeframe_seconds(timeframe)
+
+
+class TestPerformanceMetrics:
+    """Test cases for equity curve metrics."""
+
+    def test_matches_reference_formulas(self):
+        """Test metrics equal straightforward per-bar calculations."""
+        equity = make_equity()
+        returns = [equity[i] / equity[i - 1] - 1 for i in range(1, len(equity))]
+        periods = 8760
+
+        peak, max_dd = equity[0], 0.0
+        for value in equity:
+            peak = max(peak, value)
+            max_dd = max(max_dd, (peak - value) / peak * 100)
+        downside = np.sqrt(np.mean([min(r, 0) ** 2 for r in returns]))
+        annualized = (equity[-1] / equity[0]) ** (periods / len(returns)) - 1
+
+        metrics = performance_metrics(equity, "1h")
+
+        assert metrics["max_drawdown"] == pytest.approx(max_dd)
+        assert metrics["sharpe_ratio"] == pytest.approx(
+            (np.mean(returns) * periods - 0.02) / (np.std(returns) * np.sqrt(periods))
+        )
+        assert metrics["sortino_ratio"] == pytest.approx(
+            (np.mean(returns) * periods - 0.02) / (downside * np.sqrt(periods))
+        )
+        assert metrics["annualized_return"] == pytest.approx(annualized * 100)
+        assert metrics["calmar_ratio"] == pytest.approx(annualized / (max_dd / 100))
+
+    def test_annualization_follows_timeframe(self):
+        """Test the same curve annualizes differently per timeframe."""
+        equity = make_equity()
+
+        hourly = performance_metrics(equity, "1h")
+        daily = performance_metrics(equity, "1d")
+
+        assert hourly["volatility"] == pytest.approx(daily["volatility"] * np.sqrt(24))
+
+    def test_exposure_and_turnover(self):
+        """Test exposure averages the invested share and turnover uses mean equity."""
+        equity = np.array([100.0, 100.0, 200.0, 200.0])
+        invested = np.array([0.0, 50.0, 200.0, 0.0])
+
+        metrics = performance_metrics(equity, "1d", invested=invested, traded_notional=300.0)
+
+        assert metrics["exposure"] == pytest.approx((0 + 50 + 100 + 0) / 4)
+        assert metrics["turnover"] == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("equity", [[], [100.0], [100.0, 100.0, 100.0]])
+    def test_degenerate_curves(self, equity: list[float]):
+        """Test empty and flat curves give zeros rather than errors."""
+        metrics = performance_metrics(np.array(equity), "1h")
+
+        assert all(value == 0.0 for value in metrics.values())
+
+    def test_short_steady_run_fits_result_columns(self):
+        """Test a day of rising 1m bars does not annualize to overflowing ratios."""
+        equity = 10000 * np.exp(np.linspace(0, np.log(1.05), 1440))
+        equity[700:710] *= 0.99
+
+        metrics = performance_metrics(equity, "1m")
+
+        assert metrics["max_drawdown"] == pytest.approx(1.0, rel=0.05)
+        assert metrics["calmar_ratio"] == RATIO_LIMIT
+        for name in ("sharpe_ratio", "sortino_ratio", "calmar_ratio"):
+            assert 0 < metrics[name] <= RATIO_LIMIT
+            # Numeric(10, 4) holds at most six integer digits
+            assert len(f"{metrics[name]:.4f}") <= 11
+
+    def test_drawdown_series(self):
+        """Test the drawdown at every bar."""
+        np.testing.assert_allclose(drawdown([100, 120, 90, 130, 117]), [0, 0, 25, 0, 10])
+
+
+class TestRollingMetrics:
+    """Test cases for rolling metrics."""
+
+    def test_matches_windowed_calculation(self):
+        """Test rolling values equal metrics computed on each window."""
+        equity = make_equity(500, seed=3)
+        window = 48
+
+        rolling = rolling_metrics(equity, window, "1h")
+
+        assert np.isnan(rolling["sharpe_ratio"][:window]).all()
+        for end in (window, 200, 499):
+            expected = performance_metrics(equity[end - window : end + 1], "1h")
+            assert rolling["sharpe_ratio"][end] == pytest.approx(expected["sharpe_ratio"])
+            assert rolling["volatility"][end] == pytest.approx(expected["volatility"])
+            assert rolling["return"][end] == pytest.approx(
+                (equity[end] / equity[end - window] - 1) * 100
+            )
+
+    def test_short_series(self):
+        """Test a series shorter than the window is all NaN."""
+        rolling = rolling_metrics(make_equity(10), 20, "1h")
+
+        assert np.isnan(rolling["return"]).all()
+        assert len(rolling["drawdown"]) == 10
+
+
+class TestTradeStatistics:
+    """Test cases for trade statistics."""
+
+    def test_statistics(self):
+        """Test counts, totals and ratios of closed trades."""
+        stats = trade_statistics(np.array([10.0, -5.0, 20.0, 0.0, -15.0]))
+
+        assert stats["total_trades"] == 5
+        assert stats["winning_trades"] == 2
+        assert stats["losing_trades"] == 2
+        assert stats["win_rate"] == pytest.approx(40.0)
+        assert stats["net_pnl"] == pytest.approx(10.0)
+        assert stats["profit_factor"] == pytest.approx(1.5)
+        assert stats["average_win"] == pytest.approx(15.0)
+        assert stats["average_loss"] == pytest.approx(-10.0)
+        assert stats["expectancy"] == pytest.approx(2.0)
+
+    def test_no_trades(self):
+        """Test an empty list gives zeros."""
+        stats = trade_statistics(np.array([]))
+
+        assert stats["total_trades"] == 0
+        assert stats["profit_factor"] == 0.0
@@ -0,0 +1,86 @@
+"""Unit tests for the columnar OHLCV frame."""
+
+from datetime import datetime
+
+import numpy as np
+
+from app.services.backtest_engine import SymbolData
+from app.utils.ohlcv import OHLCVFrame
+
+HOUR_MS = 3_600_000
+START_MS = 1_700_000_000_000 // HOUR_MS * HOUR_MS
+
+
+def make_rows(count: int) -> list[list[float]]:
+    return [
+        [START_MS + i * HOUR_MS, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0]
+        for i in range(count)
+    ]
+
+
+class TestOHLCVFrame:
+    """Test cases for OHLCVFrame."""
+
+    def test_from_rows(self):
+        """Test rows are split into timestamps and value columns."""
+        frame = OHLCVFrame.from_rows(make_rows(3))
+
+        assert len(frame) == 3
+        assert frame.timestamps.dtype == np.int64
+        assert frame.timestamps.tolist() == [START_MS, START_MS + HOUR_MS, START_MS + 2 * HOUR_MS]
+        assert frame.close.tolist() == [100.5, 101.5, 102.5]
+        assert frame.values.flags.c_contiguous
+
+    def test_missing_volume_is_zero(self):
+        """Test a candle without volume reads as zero volume."""
+        rows = make_rows(2)
+        rows[1][5] = None
+
+        assert OHLCVFrame.from_rows(rows).volume.tolist() == [10.0, 0.0]
+
+    def test_empty(self):
+        """Test an empty row list gives an empty frame."""
+        frame = OHLCVFrame.from_rows([])
+
+        assert len(frame) == 0
+        assert frame.values.shape == (0, 5)
+        assert frame.to_frame().empty
+
+    def test_until(self):
+        """Test candles after the end are dropped, inclusive of the end."""
+        frame = OHLCVFrame.from_rows(make_rows(5))
+
+        assert len(frame.until(START_MS + 2 * HOUR_MS)) == 3
+        assert len(frame.until(START_MS - 1)) == 0
+        assert np.shares_memory(frame.until(START_MS + HOUR_MS).values, frame.values)
+
+    def test_to_frame_shares_memory(self):
+        """Test the DataFrame wraps the frame's values without copying."""
+        frame = OHLCVFrame.from_rows(make_rows(4))
+        df = frame.to_frame()
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert df.index[0].value == START_MS * 1_000_000
+        assert np.shares_memory(df["close"].to_numpy(), frame.values)
+
+    def test_records(self):
+        """Test records are plain dicts with datetimes."""
+        record = OHLCVFrame.from_rows(make_rows(1)).records()[0]
+
+        assert record == {
+            "timestamp": datetime.fromtimestamp(START_MS / 1000),
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": 100.5,
+            "volume": 10.0,
+        }
+
+    def test_symbol_data_wraps_values(self):
+        """Test backtest data reuses the frame's arrays."""
+        frame = OHLCVFrame.from_rows(make_rows(3))
+        data = SymbolData.from_ohlcv("BTC/USDT", frame)
+
+        assert data.ohlcv is frame.values
+        assert data.timestamps[0] == START_MS * 1_000_000
+        assert data.to_frame().index.equals(frame.to_frame().index)
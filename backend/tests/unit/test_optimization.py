@@ -0,0 +1,122 @@
+"""Unit tests for parameter sweep optimization."""
+
+import numpy as np
+import pytest
+
+from app.services.backtest_engine import SymbolData, evaluate_batch, run_symbol, summarize
+from app.services.optimization_service import (
+    apply_parameters,
+    count_combinations,
+    iter_combinations,
+    parameter_values,
+    rank_results,
+)
+from tests.unit.test_backtest_engine import EXIT_RULES, RULES, make_frame
+
+PARAMETERS = [
+    {"path": "rules.conditions.0.value", "min": 30, "max": 50, "step": 10},
+    {"path": "rules.conditions.0.indicator", "values": [7, 14]},
+]
+
+
+class TestCombinations:
+    """Test cases for building the search space."""
+
+    def test_parameter_values(self):
+        """Test explicit values and inclusive ranges."""
+        assert parameter_values({"values": [1, "a"]}) == [1, "a"]
+        assert parameter_values({"min": 10, "max": 30, "step": 10}) == [10, 20, 30]
+        assert parameter_values({"min": 0.1, "max": 0.3, "step": 0.1}) == [0.1, 0.2, 0.3]
+
+    def test_grid(self):
+        """Test the grid is the full cartesian product."""
+        combinations = list(iter_combinations(PARAMETERS))
+
+        assert count_combinations(PARAMETERS) == 6
+        assert len(combinations) == 6
+        assert combinations[0] == {
+            "rules.conditions.0.value": 30,
+            "rules.conditions.0.indicator": 7,
+        }
+
+    def test_random_distinct_and_seeded(self):
+        """Test random search draws distinct, reproducible sets."""
+        first = list(iter_combinations(PARAMETERS, "random", samples=4, seed=1))
+        second = list(iter_combinations(PARAMETERS, "random", samples=4, seed=1))
+
+        assert first == second
+        assert len({tuple(c.values()) for c in first}) == 4
+        assert count_combinations(PARAMETERS, "random", samples=100) == 6
+
+
+class TestApplyParameters:
+    """Test cases for substituting parameters into rules."""
+
+    def test_values_and_periods(self):
+        """Test plain values are set and indicator periods replaced."""
+        exit_rules = [
+            {"conditions": [{"indicator": "close", "operator": "lt", "value": "$sma_20"}]}
+        ]
+
+        rules, exits = apply_parameters(
+            RULES,
+            exit_rules,
+            {
+                "rules.conditions.0.value": 35,
+                "rules.conditions.0.indicator": 21,
+                "exit_rules.0.conditions.0.value": 50,
+            },
+        )
+
+        assert rules["conditions"][0] == {"indicator": "rsi_21", "operator": "lt", "value": 35}
+        assert exits[0]["conditions"][0]["value"] == "$sma_50"
+        assert RULES["conditions"][0]["value"] == 45
+        assert exit_rules[0]["conditions"][0]["value"] == "$sma_20"
+
+    @pytest.mark.parametrize(
+        "path", ["conditions.0.value", "rules.conditions.5.value", "rules.missing", "rules"]
+    )
+    def test_invalid_path(self, path: str):
+        """Test unknown paths are rejected."""
+        with pytest.raises(ValueError, match="Invalid parameter path"):
+            apply_parameters(RULES, EXIT_RULES, {path: 1})
+
+
+class TestRanking:
+    """Test cases for ranking and evaluating variants."""
+
+    def test_rank_results(self):
+        """Test rows are ordered best first for each objective."""
+        combinations = [{"a": 1}, {"a": 2}, {"a": 3}]
+        summaries = [
+            {"total_return": 5.0, "max_drawdown": 3.0},
+            {"total_return": 9.0, "max_drawdown": 8.0},
+            {"total_return": 1.0, "max_drawdown": 1.0},
+        ]
+
+        by_return = rank_results(combinations, summaries, "total_return")
+        by_drawdown = rank_results(combinations, summaries, "max_drawdown")
+
+        assert [r["parameters"]["a"] for r in by_return] == [2, 1, 3]
+        assert [r["rank"] for r in by_return] == [1, 2, 3]
+        assert [r["parameters"]["a"] for r in by_drawdown] == [3, 1, 2]
+
+    def test_evaluate_batch_matches_single_runs(self):
+        """Test batched evaluation equals backtesting each variant alone."""
+        datasets = [SymbolData.from_frame(f"S{i}/USDT", make_frame(i)) for i in range(2)]
+        variants = [
+            apply_parameters(RULES, EXIT_RULES, {"rules.conditions.0.value": value})
+            for value in (40, 50)
+        ]
+
+        summaries = evaluate_batch(variants, datasets, "1h", allocation=500.0, idle_sleeves=1)
+
+        for (rules, exit_rules), summary in zip(variants, summaries, strict=True):
+            results = [run_symbol(d, "1h", rules, exit_rules, 500.0) for d in datasets]
+            expected = summarize(results, 500.0, idle_sleeves=1, timeframe="1h")
+            assert "equity" not in summary
+            for key, value in summary.items():
+                assert value == pytest.approx(expected[key])
+        assert summaries[0]["total_trades"] != summaries[1]["total_trades"] or not np.isclose(
+            summaries[0]["final_capital"], summaries[1]["final_capital"]
+        )
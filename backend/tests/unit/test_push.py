@@ -0,0 +1,103 @@
+"""Unit tests for pushing bus events to WebSocket clients."""
+
+import json
+
+import pytest
+
+from app.core.push import PushHub, Subscriber
+
+
+def event(event_type: str, **data) -> tuple[str, dict, str]:
+    return event_type, data, json.dumps({"type": event_type, "data": data})
+
+
+class FakeBus:
+    """EventBus stand-in recording raw handlers."""
+
+    def __init__(self) -> None:
+        self.raw_handlers: list = []
+        self.started = 0
+
+    def add_raw_handler(self, handler) -> None:
+        self.raw_handlers.append(handler)
+
+    def remove_raw_handler(self, handler) -> None:
+        self.raw_handlers.remove(handler)
+
+    def start(self) -> None:
+        self.started += 1
+
+
+class TestSubscriber:
+    """Tests for Subscriber."""
+
+    def test_topics_are_globs(self) -> None:
+        subscriber = Subscriber("u1", queue_size=4)
+        subscriber.topics = {"backtest.*", "strategy.signal"}
+
+        assert subscriber.matches("backtest.progress")
+        assert subscriber.matches("strategy.signal")
+        assert not subscriber.matches("strategy.activated")
+
+    def test_full_queue_drops_oldest(self) -> None:
+        subscriber = Subscriber("u1", queue_size=2)
+        for message in ("a", "b", "c"):
+            subscriber.offer(message)
+
+        assert subscriber.dropped == 1
+        assert subscriber.queue.get_nowait() == "b"
+        assert subscriber.queue.get_nowait() == "c"
+
+
+class TestPushHub:
+    """Tests for PushHub."""
+
+    @pytest.mark.asyncio
+    async def test_user_events_go_only_to_their_owner(self) -> None:
+        hub = PushHub(bus=FakeBus(), queue_size=8)
+        alice = hub.connect("alice")
+        bob = hub.connect("bob")
+        alice.topics.add("*")
+        bob.topics.add("*")
+
+        message = event("backtest.progress", backtest_id="bt-1", user_id="alice")
+        hub.dispatch(*message)
+        assert alice.queue.get_nowait() == message[2]
+        assert bob.queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_public_events_go_to_everyone(self) -> None:
+        hub = PushHub(bus=FakeBus(), queue_size=8)
+        alice = hub.connect("alice")
+        bob = hub.connect("bob")
+        alice.topics.add("market_data.*")
+        bob.topics.add("backtest.*")
+
+        hub.dispatch(*event("market_data.candle_closed", symbol="BTC/USDT"))
+        assert alice.queue.qsize() == 1
+        assert bob.queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_private_events_without_owner_are_dropped(self) -> None:
+        hub = PushHub(bus=FakeBus(), queue_size=8)
+        alice = hub.connect("alice")
+        alice.topics.add("*")
+
+        hub.dispatch(*event("trade.opened", trade_id="t-1"))
+        assert alice.queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_registers_with_bus_while_connected(self) -> None:
+        bus = FakeBus()
+        hub = PushHub(bus=bus, queue_size=8)
+        first = hub.connect("alice")
+        second = hub.connect("alice")
+
+        assert bus.raw_handlers == [hub.dispatch]
+        assert bus.started == 1
+
+        await hub.disconnect(first)
+        assert bus.raw_handlers == [hub.dispatch]
+        await hub.disconnect(second)
+        assert bus.raw_handlers == []
+        assert hub.connections == 0
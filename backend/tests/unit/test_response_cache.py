@@ -0,0 +1,115 @@
+"""Unit tests for the read-through response cache."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.cache import ReadThroughCache
+from app.core.redis import RedisClient
+
+
+class Fetcher:
+    """Slow fetch function counting its calls."""
+
+    def __init__(self, value=None, delay: float = 0.05) -> None:
+        self.value = {"last": 100.0} if value is None else value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+class TestReadThroughCache:
+    """Test cases for ReadThroughCache."""
+
+    async def test_miss_then_hit(self, fake_redis: RedisClient):
+        """Test the second lookup is served from Redis."""
+        cache = ReadThroughCache(fake_redis)
+        fetch = Fetcher(delay=0)
+
+        assert await cache.get_or_fetch("ticker:BTC", 1000, fetch) == ({"last": 100.0}, False)
+        assert await cache.get_or_fetch("ticker:BTC", 1000, fetch) == ({"last": 100.0}, True)
+        assert fetch.calls == 1
+
+    async def test_expiry(self, fake_redis: RedisClient):
+        """Test values are fetched again after the TTL."""
+        cache = ReadThroughCache(fake_redis)
+        fetch = Fetcher(delay=0)
+
+        await cache.get_or_fetch("ticker:BTC", 10, fetch)
+        await asyncio.sleep(0.02)
+        _, hit = await cache.get_or_fetch("ticker:BTC", 10, fetch)
+
+        assert hit is False
+        assert fetch.calls == 2
+
+    @pytest.mark.parametrize("connected", [True, False], ids=["redis", "no-redis"])
+    async def test_single_flight(self, fake_redis: RedisClient, connected: bool):
+        """Test concurrent misses trigger one fetch."""
+        cache = ReadThroughCache(fake_redis if connected else RedisClient())
+        fetch = Fetcher()
+
+        results = await asyncio.gather(
+            *(cache.get_or_fetch("orderbook:BTC", 500, fetch) for _ in range(10))
+        )
+
+        assert fetch.calls == 1
+        assert [hit for _, hit in results].count(False) == 1
+        assert all(value == {"last": 100.0} for value, _ in results)
+
+    async def test_waits_for_other_process(self, fake_redis: RedisClient):
+        """Test a held lock makes callers wait for the other fetch."""
+        leader = ReadThroughCache(fake_redis)
+        follower = ReadThroughCache(fake_redis)
+        slow, fast = Fetcher(delay=0.1), Fetcher(delay=0)
+
+        leader_task = asyncio.create_task(leader.get_or_fetch("ticker:ETH", 1000, slow))
+        await asyncio.sleep(0.01)
+        value, hit = await follower.get_or_fetch("ticker:ETH", 1000, fast)
+
+        assert (value, hit) == ({"last": 100.0}, True)
+        assert fast.calls == 0
+        assert await leader_task == ({"last": 100.0}, False)
+
+    async def test_errors_propagate_to_waiters(self, fake_redis: RedisClient):
+        """Test a failed fetch raises for every coalesced caller and is not cached."""
+        cache = ReadThroughCache(fake_redis)
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("exchange down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_fetch("ticker:BTC", 1000, failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        fetch = Fetcher(delay=0)
+        assert (await cache.get_or_fetch("ticker:BTC", 1000, fetch))[1] is False
+
+    async def test_empty_not_cached(self, fake_redis: RedisClient):
+        """Test empty results are fetched again."""
+        cache = ReadThroughCache(fake_redis)
+        fetch = Fetcher(value=[], delay=0)
+
+        await cache.get_or_fetch("symbols:binance", 1000, fetch)
+        await cache.get_or_fetch("symbols:binance", 1000, fetch)
+
+        assert fetch.calls == 2
+
+    async def test_datetimes_encoded(self, fake_redis: RedisClient):
+        """Test datetimes are stored in ISO format."""
+        cache = ReadThroughCache(fake_redis)
+        stamp = datetime(2024, 1, 1, 12, 30)
+        fetch = Fetcher(value={"timestamp": stamp}, delay=0)
+
+        await cache.get_or_fetch("ticker:BTC", 1000, fetch)
+        value, hit = await cache.get_or_fetch("ticker:BTC", 1000, fetch)
+
+        assert hit is True
+        assert value == {"timestamp": stamp.isoformat()}
@@ -216,3 +216,130 @@ class TestRuleEngine:
         ]
         result = rule_engine.evaluate_exit_rules(exit_rules, sample_df)
         assert "signal" in result
+
+
+class TestCompiledRules:
+    """Test cases for compiled rule plans."""
+
+    def test_compile_resolves_specs(self, rule_engine: RuleEngine):
+        """Test indicator names and references are resolved at compile time."""
+        plan = rule_engine.compile(
+            {
+                "conditions": [
+                    {"indicator": "SMA_10", "operator": "gt", "value": "$ema_30"},
+                    {"indicator": "macd", "operator": "lt", "value": "0"},
+                ],
+                "logic": "or",
+            }
+        )
+
+        assert plan.logic == "or"
+        first, second = plan.conditions
+        assert first.left.key == "sma_10"
+        assert first.right.key == "ema_30"
+        assert second.left.key == "macd_line"
+        assert second.threshold == 0.0
+        assert {spec.key for spec in plan.specs} == {"sma_10", "ema_30", "macd_line"}
+
+    def test_compile_invalid_condition(self, rule_engine: RuleEngine, sample_df: pd.DataFrame):
+        """Test invalid conditions compile to a failing step with an error."""
+        plan = rule_engine.compile(
+            {"conditions": [{"indicator": "rsi_14", "operator": "between", "value": 1}]}
+        )
+
+        assert plan.conditions[0].error is not None
+        result = rule_engine.evaluate_rules(plan, sample_df)
+        assert result["passed"] is False
+        assert "error" in result["details"][0]
+
+    def test_compiled_matches_dict_rules(self, rule_engine: RuleEngine, sample_df: pd.DataFrame):
+        """Test compiled and raw rules give identical results at every bar."""
+        rules = {
+            "conditions": [
+                {"indicator": "rsi_14", "operator": "lt", "value": 60},
+                {"indicator": "close", "operator": "gt", "value": "$bb_lower"},
+            ],
+            "logic": "and",
+        }
+        plan = rule_engine.compile(rules)
+
+        for i in range(30, len(sample_df)):
+            expected = RuleEngine().evaluate_rules(rules, sample_df.iloc[: i + 1], -1)
+            result = rule_engine.evaluate_rules(plan, sample_df, i)
+            assert result["passed"] == expected["passed"]
+
+    def test_crosses_above_reference(self, rule_engine: RuleEngine):
+        """Test crossing between two indicators."""
+        df = pd.DataFrame(
+            {
+                "open": [1.0] * 4,
+                "high": [1.0] * 4,
+                "low": [1.0] * 4,
+                "close": [5.0, 4.0, 6.0, 7.0],
+                "volume": [1.0] * 4,
+            }
+        )
+        rules = {
+            "conditions": [
+                {"indicator": "close", "operator": "crosses_above", "value": "$sma_2"},
+            ],
+        }
+
+        results = [rule_engine.evaluate_rules(rules, df, i)["passed"] for i in range(4)]
+        assert results == [False, False, True, False]
+
+    def test_crosses_at_first_bar(self, rule_engine: RuleEngine, sample_df: pd.DataFrame):
+        """Test crossing conditions never pass without a previous bar."""
+        rules = {"conditions": [{"indicator": "close", "operator": "crosses_below", "value": 1e9}]}
+        result = rule_engine.evaluate_rules(rules, sample_df, 0)
+        assert result["passed"] is False
+
+
+class TestVectorizedSignals:
+    """Test cases for whole-series signal evaluation."""
+
+    @pytest.mark.parametrize(
+        "rules",
+        [
+            {"conditions": [{"indicator": "rsi_14", "operator": "lt", "value": 45}]},
+            {
+                "conditions": [
+                    {"indicator": "close", "operator": "gt", "value": "$sma_20"},
+                    {"indicator": "macd_histogram", "operator": "gte", "value": 0},
+                ],
+                "logic": "and",
+            },
+            {
+                "conditions": [
+                    {"indicator": "ema_5", "operator": "crosses_above", "value": "$ema_20"},
+                    {"indicator": "rsi_14", "operator": "crosses_below", "value": 50},
+                ],
+                "logic": "or",
+            },
+            {"conditions": [{"indicator": "bogus", "operator": "gt", "value": 1}]},
+            {},
+        ],
+    )
+    def test_matches_per_bar(self, rule_engine: RuleEngine, sample_df: pd.DataFrame, rules):
+        """Test vectorized signals equal per-bar evaluation."""
+        signals = rule_engine.evaluate_signals(rules, sample_df)
+
+        assert signals.dtype == bool
+        assert len(signals) == len(sample_df)
+        expected = [
+            bool(RuleEngine().evaluate_rules(rules, sample_df, i).get("passed"))
+            for i in range(len(sample_df))
+        ]
+        assert signals.tolist() == expected
+
+    def test_any_signals(self, rule_engine: RuleEngine, sample_df: pd.DataFrame):
+        """Test rule lists combine with OR."""
+        exit_rules = [
+            {"conditions": [{"indicator": "rsi_14", "operator": "gt", "value": 60}]},
+            {"conditions": [{"indicator": "rsi_14", "operator": "lt", "value": 40}]},
+        ]
+        signals = rule_engine.evaluate_any_signals(exit_rules, sample_df)
+
+        high = rule_engine.evaluate_signals(exit_rules[0], sample_df)
+        low = rule_engine.evaluate_signals(exit_rules[1], sample_df)
+        assert (signals == (high | low)).all()
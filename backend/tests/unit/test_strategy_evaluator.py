@@ -0,0 +1,130 @@
+"""Unit tests for batched strategy evaluation."""
+
+import uuid
+
+import pytest
+
+from app.models.strategy import Strategy
+from app.services.indicator_cache import IndicatorCache
+from app.services.rule_engine import RuleEngine
+from app.services.strategy_evaluator import (
+    SeriesKey,
+    StrategyEvaluator,
+    evaluate_series,
+    group_by_series,
+)
+from app.utils.ohlcv import OHLCVFrame
+
+HOUR_MS = 3_600_000
+
+
+def make_frame(count: int = 100, slope: float = 1.0) -> OHLCVFrame:
+    rows = []
+    for i in range(count):
+        price = 100.0 + slope * i
+        rows.append([i * HOUR_MS, price, price + 1, price - 1, price, 10.0])
+    return OHLCVFrame.from_rows(rows)
+
+
+def make_strategy(symbols: list[str], threshold: float, timeframe: str = "1h") -> Strategy:
+    return Strategy(
+        id=uuid.uuid4(),
+        rules={
+            "conditions": [{"indicator": "sma_20", "operator": "gt", "value": threshold}],
+            "logic": "and",
+        },
+        symbols=symbols,
+        timeframe=timeframe,
+    )
+
+
+class FakeMarketData:
+    """Market data service returning a fixed frame and counting requests."""
+
+    def __init__(self, failing: set[str] | None = None) -> None:
+        self.calls: list[tuple[str, str, str]] = []
+        self.failing = failing or set()
+
+    async def get_ohlcv(self, symbol, exchange="binance", timeframe="1h", limit=500, **kwargs):
+        self.calls.append((exchange, symbol, timeframe))
+        if symbol in self.failing:
+            raise ConnectionError("exchange unavailable")
+        return make_frame()
+
+
+class TestGroupBySeries:
+    """Test cases for grouping strategies by series."""
+
+    def test_groups_share_series(self):
+        """Test strategies trading the same series land in one group."""
+        first = make_strategy(["BTC/USDT", "ETH/USDT"], 0)
+        second = make_strategy(["BTC/USDT"], 0)
+        third = make_strategy(["BTC/USDT"], 0, timeframe="4h")
+
+        groups = group_by_series([first, second, third])
+
+        assert groups[SeriesKey("binance", "BTC/USDT", "1h")] == [first, second]
+        assert groups[SeriesKey("binance", "ETH/USDT", "1h")] == [first]
+        assert groups[SeriesKey("binance", "BTC/USDT", "4h")] == [third]
+
+    def test_duplicate_symbols_counted_once(self):
+        """Test a strategy listing a symbol twice is evaluated once on it."""
+        strategy = make_strategy(["BTC/USDT", "BTC/USDT"], 0)
+
+        assert group_by_series([strategy]) == {SeriesKey("binance", "BTC/USDT", "1h"): [strategy]}
+
+
+class TestEvaluateSeries:
+    """Test cases for evaluating strategies on one series."""
+
+    def test_indicator_computed_once(self, monkeypatch: pytest.MonkeyPatch):
+        """Test a shared indicator is computed once for all strategies."""
+        engine = RuleEngine(cache=IndicatorCache())
+        calls = []
+        calculate = engine._calculate
+
+        def counting(spec, df):
+            calls.append(spec.key)
+            return calculate(spec, df)
+
+        monkeypatch.setattr(engine, "_calculate", counting)
+        strategies = [make_strategy(["BTC/USDT"], threshold) for threshold in (0, 150, 1000)]
+        plans = [(s, engine.compile(s.rules)) for s in strategies]
+
+        signals = evaluate_series(
+            SeriesKey("binance", "BTC/USDT", "1h"), make_frame(), plans, engine
+        )
+
+        assert calls == ["sma_20"]
+        assert [s["strategy_id"] for s in signals] == [str(s.id) for s in strategies[:2]]
+        assert signals[0]["symbol"] == "BTC/USDT"
+        assert signals[0]["signal"] == "entry"
+
+
+class TestStrategyEvaluator:
+    """Test cases for the batched evaluator."""
+
+    async def test_each_series_fetched_once(self):
+        """Test many strategies on one series cause a single fetch."""
+        market_data = FakeMarketData()
+        strategies = [make_strategy(["BTC/USDT"], 0) for _ in range(50)]
+        strategies.append(make_strategy(["ETH/USDT", "BTC/USDT"], 0))
+
+        evaluation = await StrategyEvaluator(market_data).evaluate(strategies)
+
+        assert sorted(market_data.calls) == [
+            ("binance", "BTC/USDT", "1h"),
+            ("binance", "ETH/USDT", "1h"),
+        ]
+        assert evaluation["series"] == 2
+        assert len(evaluation["signals"]) == 52
+
+    async def test_failed_series_skipped(self):
+        """Test a series that cannot be fetched does not stop the others."""
+        market_data = FakeMarketData(failing={"ETH/USDT"})
+        strategies = [make_strategy(["BTC/USDT"], 0), make_strategy(["ETH/USDT"], 0)]
+
+        evaluation = await StrategyEvaluator(market_data).evaluate(strategies)
+
+        assert evaluation["series"] == 1
+        assert [s["strategy_id"] for s in evaluation["signals"]] == [str(strategies[0].id)]
@@ -0,0 +1,159 @@
+"""Unit tests for incremental indicator states."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.indicators import (
+    calculate_bollinger_bands,
+    calculate_ema,
+    calculate_macd,
+    calculate_rsi,
+    calculate_sma,
+    calculate_stochastic,
+)
+from app.utils.streaming_indicators import (
+    BollingerBandsState,
+    EMAState,
+    IndicatorState,
+    MACDState,
+    RollingExtremaState,
+    RSIState,
+    SMAState,
+    StochasticState,
+    dumps_states,
+    loads_states,
+)
+
+
+@pytest.fixture
+def sample_ohlcv() -> pd.DataFrame:
+    """Create sample OHLCV DataFrame."""
+    np.random.seed(42)
+    n = 300
+
+    close = 100 + np.cumsum(np.random.randn(n) * 2)
+    high = close + np.abs(np.random.randn(n))
+    low = close - np.abs(np.random.randn(n))
+
+    return pd.DataFrame({"high": high, "low": low, "close": close})
+
+
+def _stream(state, df: pd.DataFrame) -> list:
+    """Feed every row of a DataFrame into a state and collect outputs."""
+    return [state.update(bar) for bar in df.to_dict("records")]
+
+
+class TestStreamingParity:
+    """Streaming states must match the batch indicator functions."""
+
+    def test_sma(self, sample_ohlcv: pd.DataFrame):
+        """Test SMA state matches calculate_sma."""
+        values = _stream(SMAState(20), sample_ohlcv)
+        expected = calculate_sma(sample_ohlcv["close"], 20)
+
+        np.testing.assert_allclose(values, expected, rtol=1e-9, equal_nan=True)
+
+    def test_ema(self, sample_ohlcv: pd.DataFrame):
+        """Test EMA state matches calculate_ema."""
+        values = _stream(EMAState(20), sample_ohlcv)
+        expected = calculate_ema(sample_ohlcv["close"], 20)
+
+        np.testing.assert_allclose(values, expected, rtol=1e-9)
+
+    def test_rsi(self, sample_ohlcv: pd.DataFrame):
+        """Test RSI state matches calculate_rsi."""
+        values = _stream(RSIState(14), sample_ohlcv)
+        expected = calculate_rsi(sample_ohlcv["close"], 14)
+
+        np.testing.assert_allclose(values, expected, rtol=1e-9)
+
+    def test_macd(self, sample_ohlcv: pd.DataFrame):
+        """Test MACD state matches calculate_macd."""
+        values = _stream(MACDState(), sample_ohlcv)
+        expected = calculate_macd(sample_ohlcv["close"])
+
+        for key in ("macd", "signal", "histogram"):
+            np.testing.assert_allclose([v[key] for v in values], expected[key], atol=1e-9)
+
+    def test_bollinger_bands(self, sample_ohlcv: pd.DataFrame):
+        """Test Bollinger state matches calculate_bollinger_bands."""
+        values = _stream(BollingerBandsState(20, 2.0), sample_ohlcv)
+        expected = calculate_bollinger_bands(sample_ohlcv["close"], 20, 2.0)
+
+        for key in ("upper", "middle", "lower"):
+            np.testing.assert_allclose(
+                [v[key] for v in values], expected[key], rtol=1e-9, equal_nan=True
+            )
+
+    def test_rolling_extrema(self, sample_ohlcv: pd.DataFrame):
+        """Test rolling min/max state matches pandas rolling windows."""
+        values = _stream(RollingExtremaState(14), sample_ohlcv)
+
+        np.testing.assert_array_equal(
+            [v["min"] for v in values], sample_ohlcv["low"].rolling(14).min()
+        )
+        np.testing.assert_array_equal(
+            [v["max"] for v in values], sample_ohlcv["high"].rolling(14).max()
+        )
+
+    def test_stochastic(self, sample_ohlcv: pd.DataFrame):
+        """Test stochastic state matches calculate_stochastic."""
+        values = _stream(StochasticState(14, 3), sample_ohlcv)
+        expected = calculate_stochastic(
+            sample_ohlcv["high"], sample_ohlcv["low"], sample_ohlcv["close"], 14, 3
+        )
+
+        for key in ("k", "d"):
+            np.testing.assert_allclose(
+                [v[key] for v in values], expected[key], rtol=1e-9, equal_nan=True
+            )
+
+
+class TestSerialization:
+    """Test state round-trips through JSON."""
+
+    def test_roundtrip_resumes_stream(self, sample_ohlcv: pd.DataFrame):
+        """Test a restored state continues exactly where it stopped."""
+        bars = sample_ohlcv.to_dict("records")
+        states = {
+            "sma_20": SMAState(20),
+            "ema_20": EMAState(20),
+            "rsi_14": RSIState(14),
+            "macd": MACDState(),
+            "bb": BollingerBandsState(),
+            "stoch": StochasticState(),
+        }
+        reference = {
+            "sma_20": SMAState(20),
+            "ema_20": EMAState(20),
+            "rsi_14": RSIState(14),
+            "macd": MACDState(),
+            "bb": BollingerBandsState(),
+            "stoch": StochasticState(),
+        }
+
+        for state in [*states.values(), *reference.values()]:
+            state.warm_up(bars[:150])
+
+        restored = loads_states(dumps_states(states))
+
+        for bar in bars[150:]:
+            for name, state in restored.items():
+                result = state.update(bar)
+                expected = reference[name].update(bar)
+                if isinstance(expected, dict):
+                    for key in expected:
+                        np.testing.assert_allclose(result[key], expected[key], equal_nan=True)
+                else:
+                    np.testing.assert_allclose(result, expected, equal_nan=True)
+
+    def test_unknown_kind(self):
+        """Test deserializing an unknown state type fails."""
+        with pytest.raises(ValueError):
+            loads_states('{"x": {"kind": "nope", "params": {}, "state": {}}}')
+
+    def test_base_class_is_abstract(self):
+        """Test the base state cannot be instantiated."""
+        with pytest.raises(TypeError):
+            IndicatorState()